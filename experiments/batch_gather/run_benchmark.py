@@ -0,0 +1,52 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from neuralforecast.tsdataset import TimeSeriesDataset, TimeSeriesLoader
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def make_panel(n_series, min_size, max_size, n_exog):
+    sizes = np.random.randint(min_size, max_size + 1, size=n_series)
+    uids = np.repeat(np.arange(n_series), sizes)
+    ds = np.concatenate([np.arange(size) for size in sizes])
+    df = pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': np.random.rand(uids.size).astype(np.float32)})
+    for i in range(n_exog):
+        df[f'exog_{i}'] = np.random.rand(uids.size).astype(np.float32)
+    return df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, nargs='+', default=[1_000, 5_000, 20_000])
+    parser.add_argument('--min_size', type=int, default=100)
+    parser.add_argument('--max_size', type=int, default=500)
+    parser.add_argument('--n_exog', type=int, default=2)
+    parser.add_argument('--batch_size', type=int, default=256)
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = []
+    for n_series in args.n_series:
+        dataset, *_ = TimeSeriesDataset.from_df(make_panel(n_series, args.min_size, args.max_size, args.n_exog))
+        loader = TimeSeriesLoader(dataset, batch_size=args.batch_size)
+        idxs = np.random.choice(n_series, size=args.batch_size, replace=False)
+        # items padded one by one and stacked by the collate function, as before `__getitems__`
+        per_item = timeit(lambda: loader._collate_fn([dataset[int(i)] for i in idxs]), args.repeats)
+        gather = timeit(lambda: dataset.__getitems__(idxs), args.repeats)
+        row = {'n_series': n_series, 'per item ms': 1000 * per_item, '__getitems__ ms': 1000 * gather}
+        rows.append(row)
+        print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.2f}'.format))
+    print()
+    print('Milliseconds per batch of {} series (best of {} runs):'.format(args.batch_size, args.repeats))
+    print(pd.DataFrame(rows).set_index('n_series').to_string(float_format='{:.2f}'.format))
@@ -0,0 +1,108 @@
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# name: (format, lazy)
+LOADS = {
+    'pickle': ('pickle', False),
+    'columnar eager': ('columnar', False),
+    'columnar lazy': ('columnar', True),
+}
+
+
+def make_panel(n_series, size):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(pd.date_range('2000-01-01', periods=size, freq='D'), n_series)
+    y = np.sin(np.arange(uids.size) / 7) + np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+def rss_mb():
+    # high water mark of the resident memory, unlike ru_maxrss it isn't inherited from the parent process
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+
+
+def run(path, lazy, n_ids, results):
+    # every load runs in a fresh process, so that its memory can be measured
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    from neuralforecast import NeuralForecast
+
+    baseline_mb = rss_mb()
+    start = time.perf_counter()
+    nf = NeuralForecast.load(path, lazy=lazy)
+    load_time = time.perf_counter() - start
+    load_mb = rss_mb() - baseline_mb
+    start = time.perf_counter()
+    nf.predict(ids=nf.uids[:n_ids])
+    ids_time = time.perf_counter() - start
+    ids_mb = rss_mb() - baseline_mb
+    start = time.perf_counter()
+    nf.predict()
+    predict_time = time.perf_counter() - start
+    predict_mb = rss_mb() - baseline_mb
+    results.put((load_time, load_mb, ids_time, ids_mb, predict_time, predict_mb))
+
+
+if __name__ == '__main__':
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, default=200_000)
+    parser.add_argument('--size', type=int, default=60)
+    parser.add_argument('--h', type=int, default=12)
+    parser.add_argument('--n_ids', type=int, default=300, help='Series forecasted right after the load')
+    args = parser.parse_args()
+
+    from neuralforecast import NeuralForecast
+    from neuralforecast.models import NHITS
+
+    model = NHITS(
+        h=args.h,
+        input_size=2 * args.h,
+        max_steps=1,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        logger=False,
+    )
+    nf = NeuralForecast(models=[model], freq='D')
+    nf.fit(make_panel(args.n_series, args.size))
+
+    ctx = mp.get_context('spawn')
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for fmt in ('pickle', 'columnar'):
+            start = time.perf_counter()
+            nf.save(os.path.join(tmpdir, fmt), format=fmt)
+            print(f'save {fmt}: {time.perf_counter() - start:.2f}s')
+        del nf
+        for name, (fmt, lazy) in LOADS.items():
+            results = ctx.Queue()
+            proc = ctx.Process(target=run, args=(os.path.join(tmpdir, fmt), lazy, args.n_ids, results))
+            proc.start()
+            proc.join()
+            load_time, load_mb, ids_time, ids_mb, predict_time, predict_mb = results.get()
+            row = {
+                'load': name,
+                'load seconds': load_time,
+                'load MB': load_mb,
+                f'predict {args.n_ids} ids seconds': ids_time,
+                f'predict {args.n_ids} ids MB': ids_mb,
+                'full predict seconds': predict_time,
+                'full predict MB': predict_mb,
+            }
+            rows.append(row)
+            print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.2f}'.format))
+    print()
+    print('MB are the peak resident memory above the one after importing neuralforecast.')
+    print(pd.DataFrame(rows).set_index('load').to_string(float_format='{:.2f}'.format))
@@ -0,0 +1,71 @@
+import argparse
+import logging
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from neuralforecast import NeuralForecast
+from neuralforecast.core import ForecastCache
+from neuralforecast.losses.pytorch import MQLoss
+from neuralforecast.models import NHITS
+
+
+def make_panel(n_series, size):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(pd.date_range('2000-01-01', periods=size, freq='D'), n_series)
+    y = np.sin(np.arange(uids.size) / 7) + np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+def timeit(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, default=200_000)
+    parser.add_argument('--size', type=int, default=100)
+    parser.add_argument('--h', type=int, default=28)
+    parser.add_argument('--changed', type=float, default=0.01, help='Fraction of series changed in the new df')
+    args = parser.parse_args()
+
+    df = make_panel(args.n_series, args.size)
+    model = NHITS(
+        h=args.h,
+        input_size=2 * args.h,
+        loss=MQLoss(),
+        max_steps=1,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        logger=False,
+    )
+    nf = NeuralForecast(models=[model], freq='D')
+    nf.fit(df)
+    # warm up, the first call pays one-off allocations
+    nf.predict()
+
+    # the new df updates the last observation of a fraction of the series
+    new_df = df.copy()
+    changed = np.random.choice(args.n_series, size=int(args.changed * args.n_series), replace=False)
+    last_rows = (changed + 1) * args.size - 1
+    new_df.loc[last_rows, 'y'] += 1.0
+
+    cache = ForecastCache(max_entries=args.n_series)
+    df_cache = ForecastCache(max_entries=args.n_series)
+    rows = [
+        ('predict without cache', timeit(lambda: nf.predict())),
+        ('predict with empty cache', timeit(lambda: nf.predict(cache=cache))),
+        ('predict, all series cached', timeit(lambda: nf.predict(cache=cache))),
+        ('predict(df) without cache', timeit(lambda: nf.predict(df=new_df))),
+    ]
+    nf.predict(df=df, cache=df_cache)
+    rows.append(
+        (f'predict(df), {args.changed:.0%} of series changed', timeit(lambda: nf.predict(df=new_df, cache=df_cache)))
+    )
+    print(pd.DataFrame(rows, columns=['call', 'seconds']).set_index('call').to_string(float_format='{:.2f}'.format))
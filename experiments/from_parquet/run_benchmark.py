@@ -0,0 +1,77 @@
+import argparse
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+METHODS = ['from_parquet', 'read_parquet + from_df']
+
+
+def write_panel(path, n_rows, n_series, n_values, row_group_size):
+    # sorted string ids, as written by most pipelines
+    size = n_rows // n_series
+    uids = np.repeat([f'id_{i:06d}' for i in range(n_series)], size)
+    ds = np.tile(pd.date_range('2000-01-01', periods=size, freq='D'), n_series)
+    df = pd.DataFrame({'unique_id': uids, 'ds': ds})
+    df['y'] = np.random.rand(len(df)).astype(np.float32)
+    for i in range(n_values - 1):
+        df[f'exog_{i}'] = np.random.rand(len(df)).astype(np.float32)
+    df.to_parquet(path, row_group_size=row_group_size, index=False)
+
+
+def peak_mb():
+    # high water mark of the resident memory, unlike ru_maxrss it isn't inherited from the parent process
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+
+
+def run(method, path, results):
+    # every method runs in a fresh process, so that its peak memory can be measured
+    from neuralforecast.tsdataset import TimeSeriesDataset
+
+    baseline_mb = peak_mb()
+    start = time.perf_counter()
+    if method == 'from_parquet':
+        TimeSeriesDataset.from_parquet(path)
+    else:
+        TimeSeriesDataset.from_df(pd.read_parquet(path))
+    elapsed = time.perf_counter() - start
+    results.put((elapsed, baseline_mb, peak_mb()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--n_series', type=int, default=10_000)
+    parser.add_argument('--n_values', type=int, default=3, help='Target plus exogenous columns')
+    parser.add_argument('--row_group_size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    ctx = mp.get_context('spawn')
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_rows in args.n_rows:
+            path = os.path.join(tmpdir, f'{n_rows}.parquet')
+            write_panel(path, n_rows, args.n_series, args.n_values, args.row_group_size)
+            for method in METHODS:
+                results = ctx.Queue()
+                proc = ctx.Process(target=run, args=(method, path, results))
+                proc.start()
+                proc.join()
+                elapsed, baseline_mb, method_peak_mb = results.get()
+                row = {
+                    'n_rows': n_rows,
+                    'method': method,
+                    'seconds': elapsed,
+                    'import MB': baseline_mb,
+                    'peak MB': method_peak_mb,
+                }
+                rows.append(row)
+                print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.1f}'.format))
+    print()
+    print(pd.DataFrame(rows).set_index(['n_rows', 'method']).to_string(float_format='{:.1f}'.format))
@@ -0,0 +1,53 @@
+import argparse
+import logging
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import neuralforecast.models
+from neuralforecast import NeuralForecast
+from neuralforecast.utils import AirPassengersPanel
+
+MODELS = ['NHITS', 'LSTM', 'TSMixer']
+ENGINES = ['lightning', 'torch']
+
+
+def median_latency(nf, n_calls, **predict_kwargs):
+    times = []
+    for _ in range(n_calls):
+        start = time.perf_counter()
+        nf.predict(**predict_kwargs)
+        times.append(time.perf_counter() - start)
+    return np.median(times)
+
+
+if __name__ == '__main__':
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--models', nargs='+', default=MODELS, choices=MODELS)
+    parser.add_argument('--h', type=int, default=12)
+    parser.add_argument('--input_size', type=int, default=24)
+    parser.add_argument('--n_calls', type=int, default=50)
+    args = parser.parse_args()
+
+    df = AirPassengersPanel[['unique_id', 'ds', 'y']]
+    rows = []
+    for model_name in args.models:
+        kwargs = dict(h=args.h, input_size=args.input_size, max_steps=5, enable_progress_bar=False, enable_model_summary=False, logger=False)
+        if model_name == 'TSMixer':
+            kwargs['n_series'] = df['unique_id'].nunique()
+        nf = NeuralForecast(models=[getattr(neuralforecast.models, model_name)(**kwargs)], freq='M')
+        nf.fit(df)
+        row = {'model': model_name}
+        for engine in ENGINES:
+            # warm up, the first call builds the loaders
+            nf.predict(inference_engine=engine)
+            row[f'{engine} ms'] = 1000 * median_latency(nf, args.n_calls, inference_engine=engine)
+        rows.append(row)
+        print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.1f}'.format))
+    print()
+    print('Median NeuralForecast.predict latency over {} calls:'.format(args.n_calls))
+    print(pd.DataFrame(rows).set_index('model').to_string(float_format='{:.1f}'.format))
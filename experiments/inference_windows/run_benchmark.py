@@ -0,0 +1,93 @@
+import argparse
+import logging
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import torch
+
+from neuralforecast.models import MLP
+from neuralforecast.tsdataset import TimeSeriesDataset
+
+
+def previous_predict_windows(model, batch, w_idxs=None):
+    # `_create_windows(batch, step='predict')` before the batch was unfolded once per step:
+    # every call copies all the windows of the batch and then indexes the requested ones
+    window_size = model.input_size + model.h
+    temporal = batch['temporal'][:, :, -model.input_size - model.test_size :]
+    windows = temporal.unfold(dimension=-1, size=window_size, step=model.predict_step_size)
+    windows_per_serie = windows.shape[2]
+    windows = windows.permute(0, 2, 3, 1).contiguous()
+    windows = windows.reshape(-1, window_size, len(batch['temporal_cols']))
+    static = batch.get('static', None)
+    if static is not None:
+        static = torch.repeat_interleave(static, repeats=windows_per_serie, dim=0)
+    if w_idxs is not None:
+        windows = windows[w_idxs]
+        if static is not None:
+            static = static[w_idxs]
+    return dict(temporal=windows, temporal_cols=batch['temporal_cols'], static=static, static_cols=batch.get('static_cols', None))
+
+
+def previous_chunks(model, batch):
+    # `predict_step` created the windows once to count them, then again for every chunk
+    n_windows = len(previous_predict_windows(model, batch)['temporal'])
+    for start in range(0, n_windows, model.inference_windows_batch_size):
+        w_idxs = np.arange(start, min(start + model.inference_windows_batch_size, n_windows))
+        previous_predict_windows(model, batch, w_idxs)
+
+
+def chunks(model, batch):
+    for _ in model._inference_windows(batch, step='predict'):
+        pass
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def make_panel(n_series, size):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(np.arange(size), n_series)
+    y = np.sin(ds / 24) + np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+if __name__ == '__main__':
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, default=8)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 3_000, 6_000])
+    parser.add_argument('--input_size', type=int, default=200)
+    parser.add_argument('--h', type=int, default=12)
+    parser.add_argument('--inference_windows_batch_size', type=int, default=256)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    model = MLP(h=args.h, input_size=args.input_size, inference_windows_batch_size=args.inference_windows_batch_size)
+    model.predict_step_size = 1
+    rows = []
+    for size in args.sizes:
+        dataset, *_ = TimeSeriesDataset.from_df(make_panel(args.n_series, size))
+        batch = dataset.__getitems__(np.arange(args.n_series))
+        # rolling forecasts over the whole history, as in cross_validation
+        model.test_size = size - args.input_size
+        n_windows = args.n_series * (model.test_size - args.h + 1)
+        row = {
+            'size': size,
+            'windows': n_windows,
+            '_inference_windows': timeit(lambda: chunks(model, batch), args.repeats),
+            'previous': timeit(lambda: previous_chunks(model, batch), args.repeats),
+        }
+        rows.append(row)
+        print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.3f}'.format))
+    print()
+    print('Seconds to create the predict windows of {} series (best of {} runs):'.format(args.n_series, args.repeats))
+    print(pd.DataFrame(rows).set_index('size').to_string(float_format='{:.3f}'.format))
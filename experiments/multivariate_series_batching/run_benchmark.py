@@ -0,0 +1,89 @@
+import argparse
+import logging
+import multiprocessing as mp
+import resource
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+MODELS = ['iTransformer', 'TSMixer', 'MLPMultivariate']
+
+
+def make_panel(n_series, size):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(pd.date_range('2000-01-01', periods=size, freq='D'), n_series)
+    y = np.sin(np.arange(uids.size) / 7) + np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+def run(model_name, n_series, series_batch_size, args, results):
+    # every configuration runs in a fresh process, so that its peak memory can be measured
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    import neuralforecast.models
+    from neuralforecast import NeuralForecast
+
+    df = make_panel(n_series, args.size)
+    model = getattr(neuralforecast.models, model_name)(
+        h=args.h,
+        input_size=args.input_size,
+        n_series=n_series,
+        batch_size=args.batch_size,
+        max_steps=args.max_steps,
+        series_batch_size=series_batch_size,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        logger=False,
+    )
+    nf = NeuralForecast(models=[model], freq='D')
+    start = time.perf_counter()
+    nf.fit(df)
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    nf.predict()
+    predict_time = time.perf_counter() - start
+    # kilobytes on linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((fit_time, predict_time, peak_mb))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--models', nargs='+', default=MODELS, choices=MODELS)
+    parser.add_argument('--n_series', type=int, nargs='+', default=[1_000, 4_000, 16_000])
+    parser.add_argument('--series_batch_size', type=int, default=512)
+    parser.add_argument('--size', type=int, default=300)
+    parser.add_argument('--h', type=int, default=12)
+    parser.add_argument('--input_size', type=int, default=48)
+    parser.add_argument('--batch_size', type=int, default=8)
+    parser.add_argument('--max_steps', type=int, default=50)
+    args = parser.parse_args()
+
+    ctx = mp.get_context('spawn')
+    rows = []
+    for model_name in args.models:
+        for n_series in args.n_series:
+            for series_batch_size in (None, args.series_batch_size):
+                results = ctx.Queue()
+                proc = ctx.Process(target=run, args=(model_name, n_series, series_batch_size, args, results))
+                proc.start()
+                proc.join()
+                if proc.exitcode != 0:
+                    # usually killed when running out of memory
+                    fit_time = predict_time = peak_mb = np.nan
+                else:
+                    fit_time, predict_time, peak_mb = results.get()
+                row = {
+                    'model': model_name,
+                    'n_series': n_series,
+                    'series_batch_size': series_batch_size or '-',
+                    'fit_seconds': fit_time,
+                    'predict_seconds': predict_time,
+                    'peak_mb': peak_mb,
+                }
+                rows.append(row)
+                print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.1f}'.format))
+    print()
+    print(pd.DataFrame(rows).set_index(['model', 'n_series', 'series_batch_size']).to_string(float_format='{:.1f}'.format))
@@ -0,0 +1,97 @@
+import argparse
+import logging
+import multiprocessing as mp
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import torch
+
+METHODS = ['_create_windows', 'previous']
+
+
+def previous_train_windows(model, batch):
+    # `BaseMultivariate._create_windows(batch, step='train')` before the prefix sums of the mask:
+    # the mask is summed over every unfolded window and all the valid windows are copied
+    window_size = model.input_size + model.h
+    temporal_cols = batch['temporal_cols']
+    temporal = model.padder(batch['temporal'])
+    windows = temporal.unfold(dimension=-1, size=window_size, step=model.step_size)
+    available_idx = temporal_cols.get_loc('available_mask')
+    sample_condition = torch.sum(torch.sum(windows[:, available_idx, :, -model.h :], axis=2), axis=0)
+    available_condition = torch.sum(torch.sum(windows[:, available_idx, :, : -model.h], axis=2), axis=0)
+    final_condition = (sample_condition > 0) & (available_condition > 0)
+    windows = windows[:, :, final_condition, :]
+    w_idxs = np.random.choice(windows.shape[2], size=model.batch_size, replace=(windows.shape[2] < model.batch_size))
+    windows = windows[:, :, w_idxs, :].permute(2, 1, 3, 0)
+    return dict(temporal=windows, temporal_cols=temporal_cols, static=batch.get('static', None), static_cols=batch.get('static_cols', None))
+
+
+def make_panel(n_series, size):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(np.arange(size), n_series)
+    y = np.sin(ds / 24) + np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+def peak_mb():
+    # high water mark of the resident memory, unlike ru_maxrss it isn't inherited from the parent process
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+
+
+def run(method, size, args, results):
+    # every configuration runs in a fresh process, so that its peak memory can be measured
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    from neuralforecast.models import TSMixer
+    from neuralforecast.tsdataset import TimeSeriesDataset
+
+    dataset, *_ = TimeSeriesDataset.from_df(make_panel(args.n_series, size))
+    batch = dataset.__getitems__(np.arange(args.n_series))
+    model = TSMixer(h=args.h, input_size=args.input_size, n_series=args.n_series, batch_size=args.batch_size)
+    model.val_size = model.test_size = 0
+    if method == '_create_windows':
+        fn = lambda: model._create_windows(batch, step='train')
+    else:
+        fn = lambda: previous_train_windows(model, batch)
+    times = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    results.put((min(times), peak_mb()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, default=20)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2_000, 8_760])
+    parser.add_argument('--input_size', type=int, default=1_000)
+    parser.add_argument('--h', type=int, default=24)
+    parser.add_argument('--batch_size', type=int, default=32)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    ctx = mp.get_context('spawn')
+    rows = []
+    for size in args.sizes:
+        for method in METHODS:
+            results = ctx.Queue()
+            proc = ctx.Process(target=run, args=(method, size, args, results))
+            proc.start()
+            proc.join()
+            if proc.exitcode != 0:
+                # usually killed when running out of memory
+                elapsed = run_peak_mb = np.nan
+            else:
+                elapsed, run_peak_mb = results.get()
+            row = {'size': size, 'method': method, 'ms': 1000 * elapsed, 'peak MB': run_peak_mb}
+            rows.append(row)
+            print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.1f}'.format))
+    print()
+    print('Training windows of {} series (best of {} runs):'.format(args.n_series, args.repeats))
+    print(pd.DataFrame(rows).set_index(['size', 'method']).to_string(float_format='{:.1f}'.format))
@@ -0,0 +1,70 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from neuralforecast.tsdataset import TimeSeriesDataModule, TimeSeriesDataset
+
+
+def make_panel(n_series, size, n_exog):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(np.arange(size), n_series)
+    df = pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': np.random.rand(uids.size).astype(np.float32)})
+    for i in range(n_exog):
+        df[f'exog_{i}'] = np.random.rand(uids.size).astype(np.float32)
+    return df
+
+
+class CopiedDataModule(TimeSeriesDataModule):
+    # every worker receives a pickled copy of the dataset, as before `share_memory`
+    def _workers_kwargs(self, persistent_workers=False):
+        return {'num_workers': self.num_workers, 'persistent_workers': persistent_workers, **self.dataloaders_kwargs}
+
+
+def time_passes(datamodule, n_passes):
+    # the validation loader is requested once by the trainer and iterated at every check
+    loader = datamodule.val_dataloader()
+    times = []
+    for _ in range(n_passes):
+        start = time.perf_counter()
+        for _ in loader:
+            pass
+        times.append(time.perf_counter() - start)
+    return times
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, default=1_000)
+    parser.add_argument('--size', type=int, default=200)
+    parser.add_argument('--n_exog', type=int, default=2)
+    parser.add_argument('--num_workers', type=int, default=4)
+    parser.add_argument('--batch_size', type=int, default=32)
+    parser.add_argument('--n_passes', type=int, default=5)
+    args = parser.parse_args()
+
+    dataset, *_ = TimeSeriesDataset.from_df(make_panel(args.n_series, args.size, args.n_exog))
+    rows = []
+    # the copied dataset runs first, `share_memory` moves the tensors of the dataset in place
+    for share_memory, persistent_workers in [(False, False), (True, False), (True, True)]:
+        datamodule_cls = TimeSeriesDataModule if share_memory else CopiedDataModule
+        datamodule = datamodule_cls(
+            dataset,
+            valid_batch_size=args.batch_size,
+            num_workers=args.num_workers,
+            multiprocessing_context='spawn',
+            persistent_workers=persistent_workers,
+        )
+        times = time_passes(datamodule, args.n_passes)
+        row = {
+            'share_memory': share_memory,
+            'persistent_workers': persistent_workers,
+            'first pass seconds': times[0],
+            'later passes seconds': np.mean(times[1:]),
+            'total seconds': np.sum(times),
+        }
+        rows.append(row)
+        print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.2f}'.format))
+    print()
+    print(pd.DataFrame(rows).set_index(['share_memory', 'persistent_workers']).to_string(float_format='{:.2f}'.format))
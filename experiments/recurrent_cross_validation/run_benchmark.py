@@ -0,0 +1,76 @@
+import argparse
+import logging
+import multiprocessing as mp
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+def make_panel(n_series, size):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(pd.date_range('2000-01-01', periods=size, freq='D'), n_series)
+    y = np.sin(np.arange(uids.size) / 7) + np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+def peak_mb():
+    # high water mark of the resident memory, unlike ru_maxrss it isn't inherited from the parent process
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+
+
+def run(step_size, args, results):
+    # every configuration runs in a fresh process, so that its peak memory can be measured
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    from neuralforecast import NeuralForecast
+    from neuralforecast.models import LSTM
+
+    model = LSTM(
+        h=args.h,
+        input_size=args.input_size,
+        max_steps=args.max_steps,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        logger=False,
+    )
+    nf = NeuralForecast(models=[model], freq='D')
+    df = make_panel(args.n_series, args.size)
+    start = time.perf_counter()
+    nf.cross_validation(df, n_windows=args.n_windows, step_size=step_size, refit=False)
+    elapsed = time.perf_counter() - start
+    results.put((elapsed, peak_mb()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, default=50)
+    parser.add_argument('--size', type=int, default=3_000)
+    parser.add_argument('--input_size', type=int, default=48)
+    parser.add_argument('--h', type=int, default=24)
+    parser.add_argument('--n_windows', type=int, default=20)
+    parser.add_argument('--step_sizes', type=int, nargs='+', default=[1, 24])
+    parser.add_argument('--max_steps', type=int, default=10)
+    args = parser.parse_args()
+
+    ctx = mp.get_context('spawn')
+    rows = []
+    for step_size in args.step_sizes:
+        results = ctx.Queue()
+        proc = ctx.Process(target=run, args=(step_size, args, results))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            # killed when running out of memory, or a step_size that predict doesn't support
+            elapsed = run_peak_mb = np.nan
+        else:
+            elapsed, run_peak_mb = results.get()
+        row = {'step_size': step_size, 'seconds': elapsed, 'peak MB': run_peak_mb}
+        rows.append(row)
+        print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.1f}'.format))
+    print()
+    print(pd.DataFrame(rows).set_index('step_size').to_string(float_format='{:.1f}'.format))
@@ -0,0 +1,75 @@
+import argparse
+import logging
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from neuralforecast import NeuralForecast
+from neuralforecast.models import LSTM
+
+
+def make_panel(n_series, size, start=0):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(np.arange(start, start + size), n_series)
+    y = np.sin(ds / 7) + np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+def run(n_series, size, args):
+    model = LSTM(
+        h=args.h,
+        input_size=args.input_size,
+        max_steps=args.max_steps,
+        scaler_type='identity',
+        stateful_inference=True,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        logger=False,
+    )
+    nf = NeuralForecast(models=[model], freq=1)
+    nf.fit(make_panel(n_series, size))
+    # the first predict stores the states over the whole history
+    start = time.perf_counter()
+    nf.predict()
+    first_time = time.perf_counter() - start
+    update_times = []
+    predict_times = []
+    for i in range(args.n_updates):
+        new_df = make_panel(n_series, 1, start=size + i)
+        start = time.perf_counter()
+        nf.update(new_df)
+        update_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        nf.predict()
+        predict_times.append(time.perf_counter() - start)
+    return first_time, np.median(update_times), np.median(predict_times)
+
+
+if __name__ == '__main__':
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, default=20)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument('--h', type=int, default=12)
+    parser.add_argument('--input_size', type=int, default=48)
+    parser.add_argument('--max_steps', type=int, default=5)
+    parser.add_argument('--n_updates', type=int, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        first_time, update_time, predict_time = run(args.n_series, size, args)
+        rows.append(
+            {
+                'history': size,
+                'first predict ms': 1000 * first_time,
+                'update ms': 1000 * update_time,
+                'predict after update ms': 1000 * predict_time,
+            }
+        )
+        print(pd.DataFrame(rows[-1:]).to_string(index=False, header=len(rows) == 1, float_format='{:.1f}'.format))
+    print()
+    print(pd.DataFrame(rows).set_index('history').to_string(float_format='{:.1f}'.format))
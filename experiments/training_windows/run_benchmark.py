@@ -0,0 +1,112 @@
+import argparse
+import logging
+import multiprocessing as mp
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+
+METHODS = ['_create_windows', 'previous']
+
+
+def previous_train_windows(model, batch):
+    # `_create_windows(batch, step='train')` before it sampled from the index of the valid windows:
+    # every unfolded window is copied and its available_mask summed to filter them
+    window_size = model.input_size + model.h
+    temporal_cols = batch['temporal_cols']
+    temporal = model.padder_train(batch['temporal'])
+    if temporal.shape[-1] < window_size:
+        temporal = nn.ConstantPad1d(padding=(window_size - temporal.shape[-1], 0), value=0)(temporal)
+    windows = temporal.unfold(dimension=-1, size=window_size, step=model.step_size)
+    windows_per_serie = windows.shape[2]
+    windows = windows.permute(0, 2, 3, 1).contiguous()
+    windows = windows.reshape(-1, window_size, len(temporal_cols))
+
+    available_idx = temporal_cols.get_loc('available_mask')
+    available_condition = torch.sum(windows[:, : model.input_size, available_idx], axis=1)
+    sample_condition = torch.sum(windows[:, model.input_size :, available_idx], axis=1)
+    final_condition = (sample_condition > 0) & (available_condition > 0)
+    windows = windows[final_condition]
+
+    static = batch.get('static', None)
+    if static is not None:
+        static = torch.repeat_interleave(static, repeats=windows_per_serie, dim=0)
+        static = static[final_condition]
+
+    w_idxs = np.random.choice(len(windows), size=model.windows_batch_size, replace=(len(windows) < model.windows_batch_size))
+    windows = windows[w_idxs]
+    if static is not None:
+        static = static[w_idxs]
+    return dict(temporal=windows, temporal_cols=temporal_cols, static=static, static_cols=batch.get('static_cols', None))
+
+
+def make_panel(n_series, size):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(np.arange(size), n_series)
+    y = np.sin(ds / 24) + np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+def peak_mb():
+    # high water mark of the resident memory, unlike ru_maxrss it isn't inherited from the parent process
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+
+
+def run(method, size, args, results):
+    # every configuration runs in a fresh process, so that its peak memory can be measured
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    from neuralforecast.models import MLP
+    from neuralforecast.tsdataset import TimeSeriesDataset
+
+    dataset, *_ = TimeSeriesDataset.from_df(make_panel(args.n_series, size))
+    batch = dataset.__getitems__(np.arange(args.n_series))
+    model = MLP(h=args.h, input_size=args.input_size, windows_batch_size=args.windows_batch_size)
+    model.val_size = model.test_size = 0
+    if method == '_create_windows':
+        fn = lambda: model._create_windows(batch, step='train')
+    else:
+        fn = lambda: previous_train_windows(model, batch)
+    times = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    results.put((min(times), peak_mb()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, default=32)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2_000, 4_000, 10_000])
+    parser.add_argument('--input_size', type=int, default=1_000)
+    parser.add_argument('--h', type=int, default=24)
+    parser.add_argument('--windows_batch_size', type=int, default=1_024)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    ctx = mp.get_context('spawn')
+    rows = []
+    for size in args.sizes:
+        for method in METHODS:
+            results = ctx.Queue()
+            proc = ctx.Process(target=run, args=(method, size, args, results))
+            proc.start()
+            proc.join()
+            if proc.exitcode != 0:
+                # usually killed when running out of memory
+                elapsed = run_peak_mb = np.nan
+            else:
+                elapsed, run_peak_mb = results.get()
+            row = {'size': size, 'method': method, 'ms': 1000 * elapsed, 'peak MB': run_peak_mb}
+            rows.append(row)
+            print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.1f}'.format))
+    print()
+    print('Training windows of {} series (best of {} runs):'.format(args.n_series, args.repeats))
+    print(pd.DataFrame(rows).set_index(['size', 'method']).to_string(float_format='{:.1f}'.format))
@@ -0,0 +1,85 @@
+import argparse
+import logging
+import multiprocessing as mp
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# name: (input_size, truncated_bptt), None is replaced by --input_size
+CONFIGS = {
+    'full history': (-1, False),
+    'random slice': (None, False),
+    'truncated BPTT': (None, True),
+}
+
+
+def make_panel(n_series, size):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(pd.date_range('2000-01-01', periods=size, freq='D'), n_series)
+    y = np.sin(np.arange(uids.size) / 7) + np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+def peak_mb():
+    # high water mark of the resident memory, unlike ru_maxrss it isn't inherited from the parent process
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+
+
+def run(config, args, results):
+    # every configuration runs in a fresh process, so that its peak memory can be measured
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    from neuralforecast import NeuralForecast
+    from neuralforecast.models import LSTM
+
+    input_size, truncated_bptt = CONFIGS[config]
+    model = LSTM(
+        h=args.h,
+        input_size=args.input_size if input_size is None else input_size,
+        truncated_bptt=truncated_bptt,
+        batch_size=args.n_series,
+        max_steps=args.max_steps,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        logger=False,
+    )
+    nf = NeuralForecast(models=[model], freq='D')
+    df = make_panel(args.n_series, args.size)
+    start = time.perf_counter()
+    nf.fit(df)
+    step_ms = 1000 * (time.perf_counter() - start) / args.max_steps
+    results.put((step_ms, peak_mb()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--configs', nargs='+', default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument('--n_series', type=int, default=32)
+    parser.add_argument('--size', type=int, default=5_000)
+    parser.add_argument('--input_size', type=int, default=256)
+    parser.add_argument('--h', type=int, default=24)
+    parser.add_argument('--max_steps', type=int, default=10)
+    args = parser.parse_args()
+
+    ctx = mp.get_context('spawn')
+    rows = []
+    for config in args.configs:
+        results = ctx.Queue()
+        proc = ctx.Process(target=run, args=(config, args, results))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            # usually killed when running out of memory
+            step_ms = run_peak_mb = np.nan
+        else:
+            step_ms, run_peak_mb = results.get()
+        row = {'config': config, 'ms per step': step_ms, 'peak MB': run_peak_mb}
+        rows.append(row)
+        print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.0f}'.format))
+    print()
+    print(pd.DataFrame(rows).set_index('config').to_string(float_format='{:.0f}'.format))
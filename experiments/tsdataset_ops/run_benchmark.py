@@ -0,0 +1,79 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from neuralforecast.tsdataset import TimeSeriesDataset
+
+
+def loop_append(dataset, futr_dataset):
+    # per serie copies, as done before the vectorized implementation
+    new_sizes = np.diff(dataset.indptr) + np.diff(futr_dataset.indptr)
+    new_indptr = np.append(0, new_sizes.cumsum())
+    new_temporal = dataset.temporal.new_empty((new_indptr[-1], dataset.temporal.shape[1]))
+    for i in range(dataset.n_groups):
+        curr_size = dataset.indptr[i + 1] - dataset.indptr[i]
+        new_temporal[new_indptr[i] : new_indptr[i] + curr_size] = dataset.temporal[dataset.indptr[i] : dataset.indptr[i + 1]]
+        new_temporal[new_indptr[i] + curr_size : new_indptr[i + 1]] = futr_dataset.temporal[futr_dataset.indptr[i] : futr_dataset.indptr[i + 1]]
+    return new_temporal
+
+
+def loop_trim(dataset, left_trim, right_trim):
+    new_sizes = np.diff(dataset.indptr) - left_trim - right_trim
+    new_indptr = np.append(0, new_sizes.cumsum())
+    new_temporal = dataset.temporal.new_empty((new_indptr[-1], dataset.temporal.shape[1]))
+    for i in range(dataset.n_groups):
+        new_temporal[new_indptr[i] : new_indptr[i + 1]] = dataset.temporal[dataset.indptr[i] + left_trim : dataset.indptr[i + 1] - right_trim]
+    return new_temporal
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def make_panel(n_groups, size, h, n_exog):
+    uids = np.repeat(np.arange(n_groups), size + h)
+    ds = np.tile(np.arange(size + h), n_groups)
+    df = pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': np.random.rand(uids.size).astype(np.float32)})
+    for i in range(n_exog):
+        df[f'exog_{i}'] = np.random.rand(uids.size).astype(np.float32)
+    is_futr = df['ds'] >= size
+    futr_df = df.loc[is_futr].drop(columns='y')
+    return df.loc[~is_futr], futr_df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_groups', type=int, nargs='+', default=[1_000, 10_000, 100_000, 500_000])
+    parser.add_argument('--size', type=int, default=48)
+    parser.add_argument('--h', type=int, default=12)
+    parser.add_argument('--n_exog', type=int, default=2)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--skip_loop', action='store_true', help='Only time the vectorized operations')
+    args = parser.parse_args()
+
+    rows = []
+    for n_groups in args.n_groups:
+        df, futr_df = make_panel(n_groups, args.size, args.h, args.n_exog)
+        dataset, *_ = TimeSeriesDataset.from_df(df)
+        futr_dataset = dataset.align(futr_df, id_col='unique_id', time_col='ds', target_col='y')
+        row = {
+            'n_groups': n_groups,
+            'align': timeit(lambda: dataset.align(futr_df, id_col='unique_id', time_col='ds', target_col='y'), args.repeats),
+            'append': timeit(lambda: dataset.append(futr_dataset), args.repeats),
+            'trim_dataset': timeit(lambda: TimeSeriesDataset.trim_dataset(dataset, left_trim=args.h, right_trim=args.h), args.repeats),
+        }
+        if not args.skip_loop:
+            row['append_loop'] = timeit(lambda: loop_append(dataset, futr_dataset), args.repeats)
+            row['trim_dataset_loop'] = timeit(lambda: loop_trim(dataset, args.h, args.h), args.repeats)
+        rows.append(row)
+        print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.4f}'.format))
+    print()
+    print('Seconds (best of {} runs):'.format(args.repeats))
+    print(pd.DataFrame(rows).set_index('n_groups').to_string(float_format='{:.4f}'.format))
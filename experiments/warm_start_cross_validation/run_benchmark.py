@@ -0,0 +1,59 @@
+import argparse
+import logging
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from neuralforecast import NeuralForecast
+from neuralforecast.models import NHITS
+
+
+def make_panel(n_series, size):
+    uids = np.repeat(np.arange(n_series), size)
+    ds = np.tile(pd.date_range('2000-01-01', periods=size, freq='D'), n_series)
+    level = np.repeat(np.random.rand(n_series), size)
+    y = level + np.sin(np.arange(uids.size) * 2 * np.pi / 7) + 0.1 * np.random.rand(uids.size)
+    return pd.DataFrame({'unique_id': uids, 'ds': ds, 'y': y.astype(np.float32)})
+
+
+if __name__ == '__main__':
+    logging.getLogger('pytorch_lightning').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore')
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_series', type=int, default=20)
+    parser.add_argument('--size', type=int, default=300)
+    parser.add_argument('--h', type=int, default=7)
+    parser.add_argument('--max_steps', type=int, default=100)
+    parser.add_argument('--n_windows', type=int, default=10)
+    parser.add_argument('--warm_start_steps', type=int, nargs='+', default=[10, 25])
+    args = parser.parse_args()
+
+    df = make_panel(args.n_series, args.size)
+    rows = []
+    for warm_start_steps in [None, *args.warm_start_steps]:
+        model = NHITS(
+            h=args.h,
+            input_size=2 * args.h,
+            max_steps=args.max_steps,
+            random_seed=0,
+            enable_progress_bar=False,
+            enable_model_summary=False,
+            logger=False,
+        )
+        nf = NeuralForecast(models=[model], freq='D')
+        start = time.perf_counter()
+        cv_df = nf.cross_validation(
+            df, n_windows=args.n_windows, step_size=args.h, refit=True, warm_start_steps=warm_start_steps
+        )
+        elapsed = time.perf_counter() - start
+        row = {
+            'refits': 'full' if warm_start_steps is None else f'warm_start_steps={warm_start_steps}',
+            'seconds': elapsed,
+            'MAE': (cv_df['NHITS'] - cv_df['y']).abs().mean(),
+        }
+        rows.append(row)
+        print(pd.DataFrame([row]).to_string(index=False, header=len(rows) == 1, float_format='{:.3f}'.format))
+    print()
+    print(pd.DataFrame(rows).set_index('refits').to_string(float_format='{:.3f}'.format))
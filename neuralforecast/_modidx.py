@@ -131,27 +131,68 @@ d = { 'settings': { 'branch': 'main',
                                      'neuralforecast.auto.AutoiTransformer.get_default_config': ( 'models.html#autoitransformer.get_default_config',
                                                                                                   'neuralforecast/auto.py')},
             'neuralforecast.compat': {},
-            'neuralforecast.core': { 'neuralforecast.core.NeuralForecast': ('core.html#neuralforecast', 'neuralforecast/core.py'),
+            'neuralforecast.core': { 'neuralforecast.core.ForecastCache': ('core.html#forecastcache', 'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache.__init__': ( 'core.html#forecastcache.__init__',
+                                                                                     'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache.__len__': ( 'core.html#forecastcache.__len__',
+                                                                                    'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache._evict': ( 'core.html#forecastcache._evict',
+                                                                                   'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache._path': ('core.html#forecastcache._path', 'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache._remove': ( 'core.html#forecastcache._remove',
+                                                                                    'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache.clear': ('core.html#forecastcache.clear', 'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache.get': ('core.html#forecastcache.get', 'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache.model_id': ( 'core.html#forecastcache.model_id',
+                                                                                     'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache.put': ('core.html#forecastcache.put', 'neuralforecast/core.py'),
+                                     'neuralforecast.core.ForecastCache.series_keys': ( 'core.html#forecastcache.series_keys',
+                                                                                        'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast': ('core.html#neuralforecast', 'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.__init__': ( 'core.html#neuralforecast.__init__',
                                                                                       'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._cached_model_predict': ( 'core.html#neuralforecast._cached_model_predict',
+                                                                                                   'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._check_futr_exog': ( 'core.html#neuralforecast._check_futr_exog',
+                                                                                              'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._check_nan': ( 'core.html#neuralforecast._check_nan',
                                                                                         'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._get_model_names': ( 'core.html#neuralforecast._get_model_names',
                                                                                               'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._get_needed_futr_exog': ( 'core.html#neuralforecast._get_needed_futr_exog',
                                                                                                    'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._get_predict_dataset': ( 'core.html#neuralforecast._get_predict_dataset',
+                                                                                                  'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._has_multivariate_models': ( 'core.html#neuralforecast._has_multivariate_models',
+                                                                                                      'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._load_columnar': ( 'core.html#neuralforecast._load_columnar',
+                                                                                            'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._no_refit_cross_validation': ( 'core.html#neuralforecast._no_refit_cross_validation',
                                                                                                         'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._predict_dataset': ( 'core.html#neuralforecast._predict_dataset',
+                                                                                              'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._prepare_fit': ( 'core.html#neuralforecast._prepare_fit',
                                                                                           'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._prepare_fit_memmap': ( 'core.html#neuralforecast._prepare_fit_memmap',
+                                                                                                 'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._process_df': ( 'core.html#neuralforecast._process_df',
+                                                                                         'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._process_df_cached': ( 'core.html#neuralforecast._process_df_cached',
+                                                                                                'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._reset_models': ( 'core.html#neuralforecast._reset_models',
                                                                                            'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._save_columnar': ( 'core.html#neuralforecast._save_columnar',
+                                                                                            'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._scalers_fit_transform': ( 'core.html#neuralforecast._scalers_fit_transform',
                                                                                                     'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._scalers_target_inverse_transform': ( 'core.html#neuralforecast._scalers_target_inverse_transform',
                                                                                                                'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._scalers_transform': ( 'core.html#neuralforecast._scalers_transform',
                                                                                                 'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._stored_test_target': ( 'core.html#neuralforecast._stored_test_target',
+                                                                                                 'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._uids_positions': ( 'core.html#neuralforecast._uids_positions',
+                                                                                             'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.cross_validation': ( 'core.html#neuralforecast.cross_validation',
                                                                                               'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.fit': ('core.html#neuralforecast.fit', 'neuralforecast/core.py'),
@@ -164,9 +205,25 @@ d = { 'settings': { 'branch': 'main',
                                                                                      'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.predict_insample': ( 'core.html#neuralforecast.predict_insample',
                                                                                               'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast.predict_to_parquet': ( 'core.html#neuralforecast.predict_to_parquet',
+                                                                                                'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.save': ('core.html#neuralforecast.save', 'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast.update': ( 'core.html#neuralforecast.update',
+                                                                                    'neuralforecast/core.py'),
+                                     'neuralforecast.core._DatasetCache': ('core.html#_datasetcache', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._DatasetCache.__init__': ( 'core.html#_datasetcache.__init__',
+                                                                                     'neuralforecast/core.py'),
+                                     'neuralforecast.core._DatasetCache._evict': ( 'core.html#_datasetcache._evict',
+                                                                                   'neuralforecast/core.py'),
+                                     'neuralforecast.core._DatasetCache.get': ('core.html#_datasetcache.get', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._DatasetCache.key': ('core.html#_datasetcache.key', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._DatasetCache.put': ('core.html#_datasetcache.put', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._hash_frame': ('core.html#_hash_frame', 'neuralforecast/core.py'),
                                      'neuralforecast.core._id_as_idx': ('core.html#_id_as_idx', 'neuralforecast/core.py'),
                                      'neuralforecast.core._insample_times': ('core.html#_insample_times', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._load_safetensors': ('core.html#_load_safetensors', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._save_safetensors': ('core.html#_save_safetensors', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._take_scaler': ('core.html#_take_scaler', 'neuralforecast/core.py'),
                                      'neuralforecast.core._warn_id_as_idx': ('core.html#_warn_id_as_idx', 'neuralforecast/core.py')},
             'neuralforecast.losses.numpy': { 'neuralforecast.losses.numpy._divide_no_nan': ( 'losses.numpy.html#_divide_no_nan',
                                                                                              'neuralforecast/losses/numpy.py'),
@@ -658,6 +715,10 @@ d = { 'settings': { 'branch': 'main',
                                                                                           'neuralforecast/models/hint.py'),
                                             'neuralforecast.models.hint.HINT.fit': ( 'models.hint.html#hint.fit',
                                                                                      'neuralforecast/models/hint.py'),
+                                            'neuralforecast.models.hint.HINT.get_predict_input_size': ( 'models.hint.html#hint.get_predict_input_size',
+                                                                                                        'neuralforecast/models/hint.py'),
+                                            'neuralforecast.models.hint.HINT.get_predict_tail_size': ( 'models.hint.html#hint.get_predict_tail_size',
+                                                                                                       'neuralforecast/models/hint.py'),
                                             'neuralforecast.models.hint.HINT.get_test_size': ( 'models.hint.html#hint.get_test_size',
                                                                                                'neuralforecast/models/hint.py'),
                                             'neuralforecast.models.hint.HINT.predict': ( 'models.hint.html#hint.predict',
@@ -744,6 +805,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                   'neuralforecast/models/mlpmultivariate.py'),
                                                        'neuralforecast.models.mlpmultivariate.MLPMultivariate.__init__': ( 'models.mlpmultivariate.html#mlpmultivariate.__init__',
                                                                                                                            'neuralforecast/models/mlpmultivariate.py'),
+                                                       'neuralforecast.models.mlpmultivariate.MLPMultivariate._series_weights': ( 'models.mlpmultivariate.html#mlpmultivariate._series_weights',
+                                                                                                                                  'neuralforecast/models/mlpmultivariate.py'),
                                                        'neuralforecast.models.mlpmultivariate.MLPMultivariate.forward': ( 'models.mlpmultivariate.html#mlpmultivariate.forward',
                                                                                                                           'neuralforecast/models/mlpmultivariate.py')},
             'neuralforecast.models.nbeats': { 'neuralforecast.models.nbeats.IdentityBasis': ( 'models.nbeats.html#identitybasis',
@@ -1115,6 +1178,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                                            'neuralforecast/models/tsmixer.py'),
                                                'neuralforecast.models.tsmixer.ReversibleInstanceNorm1d.__init__': ( 'models.tsmixer.html#reversibleinstancenorm1d.__init__',
                                                                                                                     'neuralforecast/models/tsmixer.py'),
+                                               'neuralforecast.models.tsmixer.ReversibleInstanceNorm1d._affine': ( 'models.tsmixer.html#reversibleinstancenorm1d._affine',
+                                                                                                                   'neuralforecast/models/tsmixer.py'),
                                                'neuralforecast.models.tsmixer.ReversibleInstanceNorm1d.forward': ( 'models.tsmixer.html#reversibleinstancenorm1d.forward',
                                                                                                                    'neuralforecast/models/tsmixer.py'),
                                                'neuralforecast.models.tsmixer.ReversibleInstanceNorm1d.reverse': ( 'models.tsmixer.html#reversibleinstancenorm1d.reverse',
@@ -1130,7 +1195,9 @@ d = { 'settings': { 'branch': 'main',
                                                'neuralforecast.models.tsmixer.TemporalMixing.__init__': ( 'models.tsmixer.html#temporalmixing.__init__',
                                                                                                           'neuralforecast/models/tsmixer.py'),
                                                'neuralforecast.models.tsmixer.TemporalMixing.forward': ( 'models.tsmixer.html#temporalmixing.forward',
-                                                                                                         'neuralforecast/models/tsmixer.py')},
+                                                                                                         'neuralforecast/models/tsmixer.py'),
+                                               'neuralforecast.models.tsmixer._batch_norm_subset': ( 'models.tsmixer.html#_batch_norm_subset',
+                                                                                                     'neuralforecast/models/tsmixer.py')},
             'neuralforecast.models.tsmixerx': { 'neuralforecast.models.tsmixerx.FeatureMixing': ( 'models.tsmixerx.html#featuremixing',
                                                                                                   'neuralforecast/models/tsmixerx.py'),
                                                 'neuralforecast.models.tsmixerx.FeatureMixing.__init__': ( 'models.tsmixerx.html#featuremixing.__init__',
@@ -1187,10 +1254,57 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                                     'neuralforecast/models/vanillatransformer.py'),
                                                           'neuralforecast.models.vanillatransformer.VanillaTransformer.forward': ( 'models.vanillatransformer.html#vanillatransformer.forward',
                                                                                                                                    'neuralforecast/models/vanillatransformer.py')},
-            'neuralforecast.tsdataset': { 'neuralforecast.tsdataset.TimeSeriesDataModule': ( 'tsdataset.html#timeseriesdatamodule',
+            'neuralforecast.serving': { 'neuralforecast.serving.ForecastServer': ( 'serving.html#forecastserver',
+                                                                                   'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.__aenter__': ( 'serving.html#forecastserver.__aenter__',
+                                                                                              'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.__aexit__': ( 'serving.html#forecastserver.__aexit__',
+                                                                                             'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.__init__': ( 'serving.html#forecastserver.__init__',
+                                                                                            'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._predict_batch': ( 'serving.html#forecastserver._predict_batch',
+                                                                                                  'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._resolve': ( 'serving.html#forecastserver._resolve',
+                                                                                            'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._serve': ( 'serving.html#forecastserver._serve',
+                                                                                          'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.load': ( 'serving.html#forecastserver.load',
+                                                                                        'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.predict': ( 'serving.html#forecastserver.predict',
+                                                                                           'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.start': ( 'serving.html#forecastserver.start',
+                                                                                         'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.stop': ( 'serving.html#forecastserver.stop',
+                                                                                        'neuralforecast/serving.py'),
+                                        'neuralforecast.serving._Request': ('serving.html#_request', 'neuralforecast/serving.py'),
+                                        'neuralforecast.serving._encode_ids': ('serving.html#_encode_ids', 'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.load_test': ('serving.html#load_test', 'neuralforecast/serving.py')},
+            'neuralforecast.tsdataset': { 'neuralforecast.tsdataset.MemmapTimeSeriesDataset': ( 'tsdataset.html#memmaptimeseriesdataset',
+                                                                                                'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.MemmapTimeSeriesDataset.__getstate__': ( 'tsdataset.html#memmaptimeseriesdataset.__getstate__',
+                                                                                                             'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.MemmapTimeSeriesDataset.__init__': ( 'tsdataset.html#memmaptimeseriesdataset.__init__',
+                                                                                                         'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.MemmapTimeSeriesDataset.__repr__': ( 'tsdataset.html#memmaptimeseriesdataset.__repr__',
+                                                                                                         'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.MemmapTimeSeriesDataset.__setstate__': ( 'tsdataset.html#memmaptimeseriesdataset.__setstate__',
+                                                                                                             'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.MemmapTimeSeriesDataset._allocate': ( 'tsdataset.html#memmaptimeseriesdataset._allocate',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.MemmapTimeSeriesDataset.from_chunks': ( 'tsdataset.html#memmaptimeseriesdataset.from_chunks',
+                                                                                                            'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.MemmapTimeSeriesDataset.share_memory': ( 'tsdataset.html#memmaptimeseriesdataset.share_memory',
+                                                                                                             'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.MemmapTimeSeriesDataset.to_memory': ( 'tsdataset.html#memmaptimeseriesdataset.to_memory',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.MemmapTimeSeriesDataset.write': ( 'tsdataset.html#memmaptimeseriesdataset.write',
+                                                                                                      'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataModule': ( 'tsdataset.html#timeseriesdatamodule',
                                                                                              'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataModule.__init__': ( 'tsdataset.html#timeseriesdatamodule.__init__',
                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataModule._workers_kwargs': ( 'tsdataset.html#timeseriesdatamodule._workers_kwargs',
+                                                                                                             'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataModule.predict_dataloader': ( 'tsdataset.html#timeseriesdatamodule.predict_dataloader',
                                                                                                                 'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataModule.train_dataloader': ( 'tsdataset.html#timeseriesdatamodule.train_dataloader',
@@ -1203,18 +1317,36 @@ d = { 'settings': { 'branch': 'main',
                                                                                                  'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__getitem__': ( 'tsdataset.html#timeseriesdataset.__getitem__',
                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.__getitems__': ( 'tsdataset.html#timeseriesdataset.__getitems__',
+                                                                                                       'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__init__': ( 'tsdataset.html#timeseriesdataset.__init__',
                                                                                                    'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__len__': ( 'tsdataset.html#timeseriesdataset.__len__',
                                                                                                   'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__repr__': ( 'tsdataset.html#timeseriesdataset.__repr__',
                                                                                                    'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._allocate': ( 'tsdataset.html#timeseriesdataset._allocate',
+                                                                                                    'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._getitems': ( 'tsdataset.html#timeseriesdataset._getitems',
+                                                                                                    'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.align': ( 'tsdataset.html#timeseriesdataset.align',
                                                                                                 'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.append': ( 'tsdataset.html#timeseriesdataset.append',
                                                                                                  'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.astype': ( 'tsdataset.html#timeseriesdataset.astype',
+                                                                                                 'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.from_arrow': ( 'tsdataset.html#timeseriesdataset.from_arrow',
+                                                                                                     'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.from_df': ( 'tsdataset.html#timeseriesdataset.from_df',
                                                                                                   'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.from_parquet': ( 'tsdataset.html#timeseriesdataset.from_parquet',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.select': ( 'tsdataset.html#timeseriesdataset.select',
+                                                                                                 'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.share_memory': ( 'tsdataset.html#timeseriesdataset.share_memory',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.tail': ( 'tsdataset.html#timeseriesdataset.tail',
+                                                                                               'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.trim_dataset': ( 'tsdataset.html#timeseriesdataset.trim_dataset',
                                                                                                        'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.update_dataset': ( 'tsdataset.html#timeseriesdataset.update_dataset',
@@ -1225,6 +1357,16 @@ d = { 'settings': { 'branch': 'main',
                                                                                                   'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesLoader._collate_fn': ( 'tsdataset.html#timeseriesloader._collate_fn',
                                                                                                      'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchPaddedDataset': ( 'tsdataset.html#_batchpaddeddataset',
+                                                                                            'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchPaddedDataset.__getitem__': ( 'tsdataset.html#_batchpaddeddataset.__getitem__',
+                                                                                                        'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchPaddedDataset.__getitems__': ( 'tsdataset.html#_batchpaddeddataset.__getitems__',
+                                                                                                         'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchPaddedDataset.__init__': ( 'tsdataset.html#_batchpaddeddataset.__init__',
+                                                                                                     'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._BatchPaddedDataset.__len__': ( 'tsdataset.html#_batchpaddeddataset.__len__',
+                                                                                                    'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset._DistributedTimeSeriesDataModule': ( 'tsdataset.html#_distributedtimeseriesdatamodule',
                                                                                                          'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset._DistributedTimeSeriesDataModule.__init__': ( 'tsdataset.html#_distributedtimeseriesdatamodule.__init__',
@@ -1234,7 +1376,35 @@ d = { 'settings': { 'branch': 'main',
                                           'neuralforecast.tsdataset._FilesDataset': ( 'tsdataset.html#_filesdataset',
                                                                                       'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset._FilesDataset.__init__': ( 'tsdataset.html#_filesdataset.__init__',
-                                                                                               'neuralforecast/tsdataset.py')},
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._LengthBucketBatchSampler': ( 'tsdataset.html#_lengthbucketbatchsampler',
+                                                                                                  'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._LengthBucketBatchSampler.__init__': ( 'tsdataset.html#_lengthbucketbatchsampler.__init__',
+                                                                                                           'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._LengthBucketBatchSampler.__iter__': ( 'tsdataset.html#_lengthbucketbatchsampler.__iter__',
+                                                                                                           'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._LengthBucketBatchSampler.__len__': ( 'tsdataset.html#_lengthbucketbatchsampler.__len__',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesIndexedDataset': ( 'tsdataset.html#_seriesindexeddataset',
+                                                                                              'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesIndexedDataset.__getitem__': ( 'tsdataset.html#_seriesindexeddataset.__getitem__',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesIndexedDataset.__getitems__': ( 'tsdataset.html#_seriesindexeddataset.__getitems__',
+                                                                                                           'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesIndexedDataset.__init__': ( 'tsdataset.html#_seriesindexeddataset.__init__',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._SeriesIndexedDataset.__len__': ( 'tsdataset.html#_seriesindexeddataset.__len__',
+                                                                                                      'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._arrow_to_dataset': ( 'tsdataset.html#_arrow_to_dataset',
+                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._arrow_value_cols': ( 'tsdataset.html#_arrow_value_cols',
+                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._concat_ranges': ( 'tsdataset.html#_concat_ranges',
+                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._reorder_memmap_series': ( 'tsdataset.html#_reorder_memmap_series',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._write_memmap_meta': ( 'tsdataset.html#_write_memmap_meta',
+                                                                                           'neuralforecast/tsdataset.py')},
             'neuralforecast.utils': { 'neuralforecast.utils.DayOfMonth': ('utils.html#dayofmonth', 'neuralforecast/utils.py'),
                                       'neuralforecast.utils.DayOfMonth.__call__': ( 'utils.html#dayofmonth.__call__',
                                                                                     'neuralforecast/utils.py'),
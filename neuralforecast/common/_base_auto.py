@@ -458,6 +458,12 @@ class BaseAuto(pl.LightningModule):
     def get_test_size(self):
         return self.model.test_size
 
+    def get_predict_input_size(self):
+        return self.model.get_predict_input_size()
+
+    def get_predict_tail_size(self, dataset):
+        return self.model.get_predict_tail_size(dataset)
+
     def save(self, path):
         """BaseAuto.save
 
@@ -17,6 +17,7 @@ import torch
 import torch.nn as nn
 import pytorch_lightning as pl
 from pytorch_lightning.callbacks.early_stopping import EarlyStopping
+from pytorch_lightning.utilities import move_data_to_device
 
 from neuralforecast.tsdataset import (
     TimeSeriesDataModule,
@@ -62,6 +63,26 @@ def _disable_torch_init():
         nn.init.xavier_normal_ = xavier_normal
 
 # %% ../../nbs/common.base_model.ipynb 5
+def _available_windows(available_mask, input_size, h, step_size, n_windows):
+    """Availability of the `n_windows` windows of size `input_size + h` unfolded
+    with `step_size` from `available_mask` [..., T], as a boolean tensor [..., n_windows].
+
+    A window is available when its insample and its outsample (if `h > 0`) contain
+    available values. Both conditions are differences of the prefix sums of the mask,
+    which costs O(T) instead of summing the mask over every window."""
+    mask_cumsum = nn.functional.pad(available_mask.cumsum(dim=-1), (1, 0))
+    starts = torch.arange(n_windows, device=available_mask.device) * step_size
+    insample = mask_cumsum[..., starts + input_size] - mask_cumsum[..., starts]
+    condition = insample > 0
+    if h > 0:
+        outsample = (
+            mask_cumsum[..., starts + input_size + h]
+            - mask_cumsum[..., starts + input_size]
+        )
+        condition = condition & (outsample > 0)
+    return condition
+
+# %% ../../nbs/common.base_model.ipynb 6
 class BaseModel(pl.LightningModule):
     def __init__(
         self,
@@ -91,6 +112,9 @@ class BaseModel(pl.LightningModule):
         self.train_trajectories = []
         self.valid_trajectories = []
 
+        # Warm starts carry the optimizer state between fits, see `NeuralForecast.cross_validation`
+        self._warm_start = None
+
         # Optimization
         if optimizer is not None and not issubclass(optimizer, torch.optim.Optimizer):
             raise TypeError(
@@ -105,6 +129,9 @@ class BaseModel(pl.LightningModule):
         self.stat_exog_list = list(stat_exog_list) if stat_exog_list is not None else []
 
         ## Trainer arguments ##
+        # Training DataModule arguments, e.g. dataloader_kwargs=dict(bucket_by_length=True)
+        self.dataloader_kwargs = trainer_kwargs.pop("dataloader_kwargs", None) or {}
+
         # Max steps, validation steps and check_val_every_n_epoch
         trainer_kwargs = {**trainer_kwargs, "max_steps": max_steps}
 
@@ -191,6 +218,13 @@ class BaseModel(pl.LightningModule):
             datamodule_constructor = TimeSeriesDataModule
         else:
             datamodule_constructor = _DistributedTimeSeriesDataModule
+        dataloader_kwargs = self.dataloader_kwargs
+        if is_local and dataloader_kwargs.get("bucket_by_length", False):
+            # bucketed batches are drawn in proportion to their number of training windows
+            dataloader_kwargs = {
+                **dataloader_kwargs,
+                "bucket_weights": self._train_window_counts(dataset),
+            }
         datamodule = datamodule_constructor(
             dataset=dataset,
             batch_size=batch_size,
@@ -198,6 +232,7 @@ class BaseModel(pl.LightningModule):
             num_workers=self.num_workers_loader,
             drop_last=self.drop_last_loader,
             shuffle_train=shuffle_train,
+            **dataloader_kwargs,
         )
 
         if self.val_check_steps > self.max_steps:
@@ -205,15 +240,26 @@ class BaseModel(pl.LightningModule):
                 "val_check_steps is greater than max_steps, \
                     setting val_check_steps to max_steps"
             )
-        val_check_interval = min(self.val_check_steps, self.max_steps)
+        max_steps = self.max_steps
+        if (self._warm_start is not None) and (
+            self._warm_start["max_steps"] is not None
+        ):
+            max_steps = self._warm_start["max_steps"]
+        val_check_interval = min(self.val_check_steps, max_steps)
         self.trainer_kwargs["val_check_interval"] = int(val_check_interval)
         self.trainer_kwargs["check_val_every_n_epoch"] = None
 
         if is_local:
             model = self
-            trainer = pl.Trainer(**model.trainer_kwargs)
+            trainer = pl.Trainer(**{**model.trainer_kwargs, "max_steps": max_steps})
             trainer.fit(model, datamodule=datamodule)
             model.metrics = trainer.callback_metrics
+            if model._warm_start is not None:
+                # The next warm start continues from this optimizer and learning rate schedule
+                model._warm_start["optimizer"] = trainer.optimizers[0].state_dict()
+                model._warm_start["lr_scheduler"] = trainer.lr_scheduler_configs[
+                    0
+                ].scheduler.state_dict()
             model.__dict__.pop("_trainer", None)
         else:
             assert distributed_config is not None
@@ -284,6 +330,49 @@ class BaseModel(pl.LightningModule):
             )
         return model
 
+    def _predict_batches(
+        self, datamodule, inference_engine="lightning", num_threads=None
+    ):
+        # Runs `predict_step` over the predict loader, returns the outputs of each batch
+        if inference_engine not in ["lightning", "torch"]:
+            raise ValueError(
+                f"inference_engine must be 'lightning' or 'torch', got {inference_engine}"
+            )
+
+        default_num_threads = torch.get_num_threads()
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        try:
+            if inference_engine == "lightning":
+                # Protect when case of multiple gpu. PL does not support return preds with multiple gpu.
+                pred_trainer_kwargs = self.trainer_kwargs.copy()
+                if (pred_trainer_kwargs.get("accelerator", None) == "gpu") and (
+                    torch.cuda.device_count() > 1
+                ):
+                    pred_trainer_kwargs["devices"] = [0]
+
+                trainer = pl.Trainer(**pred_trainer_kwargs)
+                return trainer.predict(self, datamodule=datamodule)
+
+            # Plain loop on the device that holds the weights, without the trainer's fixed cost
+            training = self.training
+            self.eval()
+            try:
+                with torch.inference_mode():
+                    fcsts = []
+                    for batch_idx, batch in enumerate(datamodule.predict_dataloader()):
+                        batch = self.transfer_batch_to_device(batch, self.device, 0)
+                        fcsts.append(
+                            move_data_to_device(
+                                self.predict_step(batch, batch_idx), "cpu"
+                            )
+                        )
+                return fcsts
+            finally:
+                self.train(training)
+        finally:
+            torch.set_num_threads(default_num_threads)
+
     def on_fit_start(self):
         torch.manual_seed(self.random_seed)
         np.random.seed(self.random_seed)
@@ -309,6 +398,11 @@ class BaseModel(pl.LightningModule):
             "frequency": 1,
             "interval": "step",
         }
+        if (self._warm_start is not None) and (
+            self._warm_start.get("optimizer") is not None
+        ):
+            optimizer.load_state_dict(self._warm_start["optimizer"])
+            scheduler["scheduler"].load_state_dict(self._warm_start["lr_scheduler"])
         return {"optimizer": optimizer, "lr_scheduler": scheduler}
 
     def get_test_size(self):
@@ -317,6 +411,21 @@ class BaseModel(pl.LightningModule):
     def set_test_size(self, test_size):
         self.test_size = test_size
 
+    def get_predict_input_size(self):
+        """Number of trailing observations of each serie used by `predict`,
+        None when `predict` uses the whole history."""
+        return None
+
+    def _train_window_counts(self, dataset):
+        """Number of training windows of each serie of `dataset`,
+        None when every serie is a single training sample."""
+        return None
+
+    def get_predict_tail_size(self, dataset):
+        """Number of trailing observations of each serie of `dataset` used by the next `predict`,
+        None when it uses the whole history."""
+        return self.get_predict_input_size()
+
     def on_validation_epoch_end(self):
         if self.val_size == 0:
             return
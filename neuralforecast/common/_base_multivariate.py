@@ -7,10 +7,9 @@ __all__ = ['BaseMultivariate']
 import numpy as np
 import torch
 import torch.nn as nn
-import pytorch_lightning as pl
 
 import neuralforecast.losses.pytorch as losses
-from ._base_model import BaseModel
+from ._base_model import BaseModel, _available_windows
 from ._scalers import TemporalNorm
 from ..tsdataset import TimeSeriesDataModule
 from ..utils import get_indexer_raise_missing
@@ -26,8 +25,18 @@ class BaseMultivariate(BaseModel):
     - PyTorch Lightning's methods training_step, validation_step, predict_step.<br>
     - fit and predict methods used by NeuralForecast.core class.<br>
     - sampling and wrangling methods to generate multivariate windows.
+
+    With `series_batch_size` each training step sees a random subset of `series_batch_size`
+    series, the only ones that the loader gathers, and the inference runs over chunks of that
+    many series, which bounds the memory of large panels. The indices of the series are passed to the model as `series_idx` so
+    that the parameters tied to each serie are selected consistently, and only the models
+    with `SERIES_BATCHING = True` support it. Models that mix the series only see those of
+    the same chunk.
     """
 
+    # Whether the model accepts subsets of the series, see `series_batch_size`
+    SERIES_BATCHING = False
+
     def __init__(
         self,
         h,
@@ -52,6 +61,7 @@ class BaseMultivariate(BaseModel):
         alias=None,
         optimizer=None,
         optimizer_kwargs=None,
+        series_batch_size=None,
         **trainer_kwargs,
     ):
         super().__init__(
@@ -75,6 +85,14 @@ class BaseMultivariate(BaseModel):
         self.n_series = n_series
         self.padder = nn.ConstantPad1d(padding=(0, self.h), value=0)
 
+        # Subsets of series for training steps and inference chunks
+        if (series_batch_size is not None) and not self.SERIES_BATCHING:
+            raise Exception(f"{type(self).__name__} does not support series_batch_size")
+        self.series_batch_size = series_batch_size
+        if series_batch_size is not None:
+            # the training loader only gathers the sampled series and returns their indices
+            self.dataloader_kwargs.setdefault("return_series_idx", True)
+
         # Multivariate models do not support these loss functions yet.
         unsupported_losses = (
             losses.sCRPS,
@@ -126,6 +144,10 @@ class BaseMultivariate(BaseModel):
         self.validation_step_outputs = []
         self.alias = alias
 
+    def get_predict_input_size(self):
+        # predict windows only look at the last input_size steps before the horizon
+        return self.input_size
+
     def _create_windows(self, batch, step):
         # Parse common data
         window_size = self.input_size + self.h
@@ -143,24 +165,16 @@ class BaseMultivariate(BaseModel):
             )
             # [n_series, C, Ws, L+H] 0, 1, 2, 3
 
-            # Sample and Available conditions
+            # Sample and Available conditions, from the mask summed over time-series
             available_idx = temporal_cols.get_loc("available_mask")
-            sample_condition = windows[:, available_idx, :, -self.h :]
-            sample_condition = torch.sum(sample_condition, axis=2)  # Sum over time
-            sample_condition = torch.sum(
-                sample_condition, axis=0
-            )  # Sum over time-series
-            available_condition = windows[:, available_idx, :, : -self.h]
-            available_condition = torch.sum(
-                available_condition, axis=2
-            )  # Sum over time
-            available_condition = torch.sum(
-                available_condition, axis=0
-            )  # Sum over time-series
-            final_condition = (sample_condition > 0) & (
-                available_condition > 0
+            final_condition = _available_windows(
+                temporal[:, available_idx].sum(axis=0),
+                input_size=self.input_size,
+                h=self.h,
+                step_size=self.step_size,
+                n_windows=windows.shape[2],
             )  # Of shape [Ws]
-            windows = windows[:, :, final_condition, :]
+            valid_idxs = final_condition.nonzero().squeeze(1)
 
             # Get Static data
             static = batch.get("static", None)
@@ -170,15 +184,16 @@ class BaseMultivariate(BaseModel):
             if final_condition.sum() == 0:
                 raise Exception("No windows available for training")
 
-            # Sample windows
-            n_windows = windows.shape[2]
+            # Sample windows, only the sampled ones are copied
+            n_windows = len(valid_idxs)
             if self.batch_size is not None:
                 w_idxs = np.random.choice(
                     n_windows,
                     size=self.batch_size,
                     replace=(n_windows < self.batch_size),
                 )
-                windows = windows[:, :, w_idxs, :]
+                valid_idxs = valid_idxs[w_idxs]
+            windows = windows[:, :, valid_idxs, :]
 
             windows = windows.permute(2, 1, 3, 0)  # [Ws, C, L+H, n_series]
 
@@ -338,7 +353,44 @@ class BaseMultivariate(BaseModel):
             stat_exog,
         )
 
+    def _select_series(self, batch, series_idx):
+        # Batch restricted to the series in series_idx
+        batch = dict(batch, temporal=batch["temporal"][series_idx])
+        if batch.get("static", None) is not None:
+            batch["static"] = batch["static"][series_idx]
+        return batch
+
+    def _series_chunks(self, batch):
+        # Splits the batch in chunks of series_batch_size series, yields them with their indices
+        n_series = len(batch["temporal"])
+        if (self.series_batch_size is None) or (self.series_batch_size >= n_series):
+            yield batch, None
+            return
+        for start in range(0, n_series, self.series_batch_size):
+            series_idx = torch.arange(
+                start,
+                min(start + self.series_batch_size, n_series),
+                device=batch["temporal"].device,
+            )
+            yield self._select_series(batch, series_idx), series_idx
+
+    def _series_loss(self, loss_fn, series_idx, **loss_kwargs):
+        # The losses weight the last dimension, which holds the series in multivariate models,
+        # so a subset of the series is weighted with the weights of its own series
+        if series_idx is None:
+            return loss_fn(**loss_kwargs)
+        horizon_weight = loss_fn.horizon_weight
+        if horizon_weight is not None:
+            loss_fn.horizon_weight = horizon_weight[series_idx.cpu()]
+        try:
+            return loss_fn(**loss_kwargs)
+        finally:
+            loss_fn.horizon_weight = horizon_weight
+
     def training_step(self, batch, batch_idx):
+        # With series_batch_size the loader samples the series, see `fit`
+        series_idx = batch.get("series_idx", None)
+
         # Create and normalize windows [batch_size, n_series, C, L+H]
         windows = self._create_windows(batch, step="train")
         y_idx = batch["y_idx"]
@@ -360,8 +412,9 @@ class BaseMultivariate(BaseModel):
             insample_mask=insample_mask,  # [batch_size, L, n_series]
             futr_exog=futr_exog,  # [batch_size, n_feats, L+H, n_series]
             hist_exog=hist_exog,  # [batch_size, n_feats, L, n_series]
-            stat_exog=stat_exog,
-        )  # [n_series, n_feats]
+            stat_exog=stat_exog,  # [n_series, n_feats]
+            series_idx=series_idx,
+        )  # [n_series]
 
         # Model Predictions
         output = self(windows_batch)
@@ -372,9 +425,17 @@ class BaseMultivariate(BaseModel):
             distr_args = self.loss.scale_decouple(
                 output=output, loc=y_loc, scale=y_scale
             )
-            loss = self.loss(y=outsample_y, distr_args=distr_args, mask=outsample_mask)
+            loss = self._series_loss(
+                self.loss,
+                series_idx,
+                y=outsample_y,
+                distr_args=distr_args,
+                mask=outsample_mask,
+            )
         else:
-            loss = self.loss(y=outsample_y, y_hat=output, mask=outsample_mask)
+            loss = self._series_loss(
+                self.loss, series_idx, y=outsample_y, y_hat=output, mask=outsample_mask
+            )
 
         if torch.isnan(loss):
             print("Model Parameters", self.hparams)
@@ -391,6 +452,26 @@ class BaseMultivariate(BaseModel):
         if self.val_size == 0:
             return np.nan
 
+        # Series chunks are evaluated separately and weighted by their available horizons
+        valid_losses, weights = [], []
+        for chunk, series_idx in self._series_chunks(batch):
+            valid_loss, weight = self._validation_chunk(chunk, series_idx)
+            valid_losses.append(valid_loss)
+            weights.append(weight)
+        if len(valid_losses) == 1:
+            valid_loss = valid_losses[0]
+        else:
+            weights = torch.stack(weights)
+            valid_loss = (torch.stack(valid_losses) * weights).sum() / weights.sum()
+
+        if torch.isnan(valid_loss):
+            raise Exception("Loss is NaN, training stopped.")
+
+        self.log("valid_loss", valid_loss, prog_bar=True, on_epoch=True)
+        self.validation_step_outputs.append(valid_loss)
+        return valid_loss
+
+    def _validation_chunk(self, batch, series_idx):
         # Create and normalize windows [Ws, L+H, C]
         windows = self._create_windows(batch, step="val")
         y_idx = batch["y_idx"]
@@ -412,8 +493,9 @@ class BaseMultivariate(BaseModel):
             insample_mask=insample_mask,  # [Ws, L]
             futr_exog=futr_exog,  # [Ws, L+H]
             hist_exog=hist_exog,  # [Ws, L]
-            stat_exog=stat_exog,
-        )  # [Ws, 1]
+            stat_exog=stat_exog,  # [Ws, 1]
+            series_idx=series_idx,
+        )  # [n_series]
 
         # Model Predictions
         output = self(windows_batch)
@@ -433,22 +515,32 @@ class BaseMultivariate(BaseModel):
 
         # Validation Loss evaluation
         if self.valid_loss.is_distribution_output:
-            valid_loss = self.valid_loss(
-                y=outsample_y, distr_args=distr_args, mask=outsample_mask
+            valid_loss = self._series_loss(
+                self.valid_loss,
+                series_idx,
+                y=outsample_y,
+                distr_args=distr_args,
+                mask=outsample_mask,
             )
         else:
-            valid_loss = self.valid_loss(
-                y=outsample_y, y_hat=output, mask=outsample_mask
+            valid_loss = self._series_loss(
+                self.valid_loss,
+                series_idx,
+                y=outsample_y,
+                y_hat=output,
+                mask=outsample_mask,
             )
-
-        if torch.isnan(valid_loss):
-            raise Exception("Loss is NaN, training stopped.")
-
-        self.log("valid_loss", valid_loss, prog_bar=True, on_epoch=True)
-        self.validation_step_outputs.append(valid_loss)
-        return valid_loss
+        return valid_loss, outsample_mask.sum()
 
     def predict_step(self, batch, batch_idx):
+        # Series chunks are forecasted separately, [Ws, H, n_series]
+        y_hat = [
+            self._predict_chunk(chunk, series_idx)
+            for chunk, series_idx in self._series_chunks(batch)
+        ]
+        return torch.cat(y_hat, dim=2)
+
+    def _predict_chunk(self, batch, series_idx):
         # Create and normalize windows [Ws, L+H, C]
         windows = self._create_windows(batch, step="predict")
         y_idx = batch["y_idx"]
@@ -464,8 +556,9 @@ class BaseMultivariate(BaseModel):
             insample_mask=insample_mask,  # [Ws, L]
             futr_exog=futr_exog,  # [Ws, L+H]
             hist_exog=hist_exog,  # [Ws, L]
-            stat_exog=stat_exog,
-        )  # [Ws, 1]
+            stat_exog=stat_exog,  # [Ws, 1]
+            series_idx=series_idx,
+        )  # [n_series]
 
         # Model Predictions
         output = self(windows_batch)
@@ -522,14 +615,18 @@ class BaseMultivariate(BaseModel):
             raise ValueError(
                 "multivariate models cannot be trained using distributed data parallel."
             )
+        # Each training batch is a random subset of series_batch_size series
+        series_batching = (self.series_batch_size is not None) and (
+            self.series_batch_size < self.n_series
+        )
         return self._fit(
             dataset=dataset,
-            batch_size=self.n_series,
+            batch_size=self.series_batch_size if series_batching else self.n_series,
             valid_batch_size=self.n_series,
             val_size=val_size,
             test_size=test_size,
             random_seed=random_seed,
-            shuffle_train=False,
+            shuffle_train=series_batching,
             distributed_config=None,
         )
 
@@ -539,6 +636,8 @@ class BaseMultivariate(BaseModel):
         test_size=None,
         step_size=1,
         random_seed=None,
+        inference_engine="lightning",
+        num_threads=None,
         **data_module_kwargs,
     ):
         """Predict.
@@ -549,6 +648,8 @@ class BaseMultivariate(BaseModel):
         `dataset`: NeuralForecast's `TimeSeriesDataset`, see [documentation](https://nixtla.github.io/neuralforecast/tsdataset.html).<br>
         `test_size`: int=None, test size for temporal cross-validation.<br>
         `step_size`: int=1, Step size between each window.<br>
+        `inference_engine`: str='lightning', 'lightning' runs PL's `Trainer`, 'torch' loops over `predict_step` without it, on the device of the weights.<br>
+        `num_threads`: int=None, number of torch threads used for the prediction, defaults to torch's setting.<br>
         `**data_module_kwargs`: PL's TimeSeriesDataModule args, see [documentation](https://pytorch-lightning.readthedocs.io/en/1.6.1/extensions/datamodules.html#using-a-datamodule).
         """
         self._check_exog(dataset)
@@ -563,15 +664,9 @@ class BaseMultivariate(BaseModel):
             **data_module_kwargs,
         )
 
-        # Protect when case of multiple gpu. PL does not support return preds with multiple gpu.
-        pred_trainer_kwargs = self.trainer_kwargs.copy()
-        if (pred_trainer_kwargs.get("accelerator", None) == "gpu") and (
-            torch.cuda.device_count() > 1
-        ):
-            pred_trainer_kwargs["devices"] = [0]
-
-        trainer = pl.Trainer(**pred_trainer_kwargs)
-        fcsts = trainer.predict(self, datamodule=datamodule)
+        fcsts = self._predict_batches(
+            datamodule, inference_engine=inference_engine, num_threads=num_threads
+        )
         fcsts = torch.vstack(fcsts).numpy()
 
         fcsts = np.transpose(fcsts, (2, 0, 1))
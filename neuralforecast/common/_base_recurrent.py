@@ -4,12 +4,14 @@
 __all__ = ['BaseRecurrent']
 
 # %% ../../nbs/common.base_recurrent.ipynb 6
+import hashlib
+
 import numpy as np
 import torch
 import torch.nn as nn
-import pytorch_lightning as pl
 
 from ._base_model import BaseModel
+from ._modules import TemporalConvolutionEncoder
 from ._scalers import TemporalNorm
 from ..tsdataset import TimeSeriesDataModule
 from ..utils import get_indexer_raise_missing
@@ -25,6 +27,21 @@ class BaseRecurrent(BaseModel):
     - PyTorch Lightning's methods training_step, validation_step, predict_step. <br>
     - fit and predict methods used by NeuralForecast.core class. <br>
     - sampling and wrangling methods to sequential windows. <br>
+
+    With `stateful_inference=True` the model keeps, after each prediction, the encoder state
+    of every serie (the RNN hidden states or the TCN receptive-field buffers) and the scaler
+    statistics of its history. A later prediction on the same series only feeds the encoder
+    with the observations appended since, instead of unrolling it over the whole history.
+    The state is dropped by `fit` and rebuilt when the series get shorter, change in number or
+    their last stored observation or static features change; edits to older observations are not detected.
+    The forecasts match those over the whole history when the scaler statistics are not moved
+    by the new observations (e.g. `scaler_type='identity'`) and every serie receives the same
+    number of them, since shorter series are left padded to the longest one. <br>
+
+    With `truncated_bptt=True` the training walks the series of each batch in consecutive
+    chunks of `input_size` windows and carries the detached encoder state between steps,
+    instead of unrolling a random slice from a zero state. The batches hold the same series
+    every epoch and their scaler statistics are computed once. <br>
     """
 
     def __init__(
@@ -51,6 +68,8 @@ class BaseRecurrent(BaseModel):
         alias=None,
         optimizer=None,
         optimizer_kwargs=None,
+        stateful_inference=False,
+        truncated_bptt=False,
         **trainer_kwargs,
     ):
         super().__init__(
@@ -74,6 +93,22 @@ class BaseRecurrent(BaseModel):
         self.inference_input_size = inference_input_size
         self.padder = nn.ConstantPad1d(padding=(0, self.h), value=0)
 
+        # Stateful inference, the encoder unrolls over the whole history
+        if stateful_inference and (inference_input_size > 0):
+            raise Exception("stateful_inference requires inference_input_size=-1")
+        self.stateful_inference = stateful_inference
+        self._stream = None
+        self._stream_pending = None
+        self._cutoffs = None
+        self._stream_state = None
+
+        # Truncated backpropagation through time, the chunks have input_size windows
+        if truncated_bptt and (input_size <= 0):
+            raise Exception("truncated_bptt requires input_size > 0")
+        self.truncated_bptt = truncated_bptt
+        self._tbptt_state = {}
+        self._tbptt_group = None
+
         if (
             str(type(self.loss))
             == "<class 'neuralforecast.losses.pytorch.DistributionLoss'>"
@@ -141,7 +176,40 @@ class BaseRecurrent(BaseModel):
         temporal_mask = temporal_mask.unsqueeze(
             1
         )  # Add channel dimension for scaler.transform.
-        temporal_data = self.scaler.transform(x=temporal_data, mask=temporal_mask)
+        x_shift, x_scale = None, None
+        if self._stream is not None:
+            # Streaming keeps the statistics of the history where the state was built
+            if self._stream["mode"] == "build":
+                x_shift, x_scale = self.scaler.compute_statistics(
+                    x=temporal_data,
+                    mask=temporal_mask,
+                    dim=self.scaler.dim,
+                    eps=self.scaler.eps,
+                )
+                self._stream["x_shift"].append(x_shift.cpu())
+                self._stream["x_scale"].append(x_scale.cpu())
+            else:
+                idxs = self._stream["idxs"]
+                x_shift = self._stream_state["x_shift"][idxs].to(temporal.device)
+                x_scale = self._stream_state["x_scale"][idxs].to(temporal.device)
+        elif self._tbptt_group is not None:
+            # Truncated BPTT computes the statistics of each batch of series once
+            if "x_shift" not in self._tbptt_group:
+                self._tbptt_group["x_shift"], self._tbptt_group["x_scale"] = (
+                    self.scaler.compute_statistics(
+                        x=temporal_data,
+                        mask=temporal_mask,
+                        dim=self.scaler.dim,
+                        eps=self.scaler.eps,
+                    )
+                )
+            x_shift, x_scale = (
+                self._tbptt_group["x_shift"],
+                self._tbptt_group["x_scale"],
+            )
+        temporal_data = self.scaler.transform(
+            x=temporal_data, mask=temporal_mask, x_shift=x_shift, x_scale=x_scale
+        )
 
         # Replace values in windows dict
         temporal[:, temporal_idxs, :] = temporal_data
@@ -217,7 +285,15 @@ class BaseRecurrent(BaseModel):
         input_size = -1
         if (step == "train") and (self.input_size > 0):
             input_size = self.input_size
-            if (input_size > 0) and (n_windows > input_size):
+            if self._tbptt_group is not None:
+                # Consecutive chunks, back to the first one after the end of the series
+                start = self._tbptt_group["next_start"]
+                self._tbptt_group["start"] = start
+                self._tbptt_group["next_start"] = (
+                    start + input_size if start + input_size < n_windows else 0
+                )
+                windows = windows[:, :, start : (start + input_size), :]
+            elif (input_size > 0) and (n_windows > input_size):
                 max_sampleable_time = n_windows - self.input_size + 1
                 start = np.random.choice(max_sampleable_time)
                 windows = windows[:, :, start : (start + input_size), :]
@@ -286,7 +362,159 @@ class BaseRecurrent(BaseModel):
             stat_exog,
         )
 
+    def _check_stateful_encoder(self, option):
+        if not isinstance(
+            getattr(self, "hist_encoder", None),
+            (nn.RNNBase, TemporalConvolutionEncoder),
+        ):
+            raise Exception(f"{type(self).__name__} does not support {option}")
+
+    def _encoder_unroll(self, encoder_input, state=None):
+        # Unrolls the encoder over the sequence from `state` (zeros if None),
+        # returns its hidden states and final state. The state is a tuple of batch first tensors.
+        if isinstance(self.hist_encoder, nn.RNNBase):
+            if state is not None:
+                state = tuple(s.transpose(0, 1).contiguous() for s in state)
+                state = state if len(state) > 1 else state[0]
+            hidden_state, state = self.hist_encoder(encoder_input, state)
+            state = state if isinstance(state, tuple) else (state,)
+            return hidden_state, tuple(s.transpose(0, 1) for s in state)
+
+        # The TCN state are the last inputs seen by each causal convolution
+        x = encoder_input.permute(0, 2, 1)
+        seq_len = x.shape[-1]
+        new_state = []
+        for i, layer in enumerate(self.hist_encoder.tcn):
+            size = layer.chomp.horizon
+            x = (
+                nn.functional.pad(x, (size, 0))
+                if state is None
+                else torch.cat((state[i], x), dim=-1)
+            )
+            new_state.append(x[:, :, -size:])
+            x = layer(x)[:, :, -seq_len:]
+        return x.permute(0, 2, 1), tuple(new_state)
+
+    def _encode(self, encoder_input):
+        # [B, seq_len, C] -> [B, seq_len, hidden_size]
+        if self._tbptt_group is not None:
+            # Continue from the state of the previous chunk, the gradients stop at its boundary
+            state = (
+                self._tbptt_group["state"] if self._tbptt_group["start"] > 0 else None
+            )
+            hidden_state, state = self._encoder_unroll(encoder_input, state)
+            self._tbptt_group["state"] = tuple(s.detach() for s in state)
+            return hidden_state
+
+        if self._stream is None:
+            hidden_state = self.hist_encoder(encoder_input)
+            if isinstance(hidden_state, tuple):
+                hidden_state, _ = hidden_state
+            return hidden_state
+
+        if self._stream["mode"] == "build":
+            hidden_state, state = self._encoder_unroll(encoder_input)
+        else:
+            idxs = self._stream["idxs"]
+            device = encoder_input.device
+            state = tuple(s[idxs].to(device) for s in self._stream_state["encoder"])
+            last_hidden = self._stream_state["hidden"][idxs].to(device)
+            n_new = self._stream["n_new"][idxs].to(device)
+
+            # Only the observations after the stored state advance it
+            seq_len = encoder_input.shape[1]
+            active = torch.arange(seq_len, device=device) >= (
+                seq_len - n_new[:, None]
+            )  # [B, seq_len]
+            hidden_state = []
+            for t in range(seq_len):
+                hidden_t, state_t = self._encoder_unroll(
+                    encoder_input[:, t : t + 1], state
+                )
+                state = tuple(
+                    torch.where(active[:, t].view(-1, *(1,) * (s.ndim - 1)), s_t, s)
+                    for s_t, s in zip(state_t, state)
+                )
+                last_hidden = torch.where(active[:, [t]], hidden_t[:, 0], last_hidden)
+                hidden_state.append(hidden_t)
+            hidden_state = torch.cat(hidden_state, dim=1)
+            # Series without new observations forecast from their stored state
+            hidden_state[:, -1] = last_hidden
+
+        self._stream["encoder"].append(tuple(s.cpu() for s in state))
+        self._stream["hidden"].append(hidden_state[:, -1].cpu())
+        return hidden_state
+
+    def _select_cutoffs(self, hidden_state):
+        # [B, seq_len, ...] -> [B, n_cutoffs, ...], the decoder only runs at the forecast cutoffs
+        if self._cutoffs is None:
+            return hidden_state
+        return hidden_state[:, self._cutoffs]
+
+    def get_predict_tail_size(self, dataset):
+        # With valid stored states only the observations appended since are needed. The context
+        # is checked here on the whole history and reused by `predict` on the tail of `dataset`.
+        self._stream_pending = self._stream_context(dataset, np.diff(dataset.indptr))
+        if (self._stream_pending is None) or (self._stream_pending["mode"] == "build"):
+            return None
+        return max(int(self._stream_pending["n_new"].max()), 1)
+
+    def _stream_context(self, dataset, sizes):
+        # Stateful inference covers the forecasts after the first `sizes` observations of each serie
+        if not self.stateful_inference:
+            return None
+        self._check_stateful_encoder("stateful_inference")
+
+        stream = dict(
+            sizes=sizes,
+            digest=self._stream_digest(dataset, sizes),
+            encoder=[],
+            hidden=[],
+        )
+        state = self._stream_state
+        if (
+            (state is None)
+            or (len(state["sizes"]) != len(sizes))
+            or np.any(sizes < state["sizes"])
+            or (self._stream_digest(dataset, state["sizes"]) != state["digest"])
+        ):
+            return dict(stream, mode="build", x_shift=[], x_scale=[])
+        return dict(
+            stream, mode="update", n_new=torch.as_tensor(sizes - state["sizes"])
+        )
+
+    @staticmethod
+    def _stream_matches(stream, sizes) -> bool:
+        # Whether `sizes` are those of the history of `stream`, or of its tail with all the new observations
+        if len(sizes) != len(stream["sizes"]):
+            return False
+        if stream["mode"] == "build":
+            return np.array_equal(sizes, stream["sizes"])
+        kept = sizes.max(initial=0)
+        return (
+            np.array_equal(sizes, np.minimum(stream["sizes"], kept))
+            and kept >= stream["n_new"].max()
+        )
+
+    @staticmethod
+    def _stream_digest(dataset, sizes) -> str:
+        # The stored states are only valid for the same series with the same history, which is
+        # checked with their number of observations, the last one and the static features
+        rows = torch.as_tensor(dataset.indptr[:-1] + np.maximum(sizes, 1) - 1)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(np.asarray(sizes, dtype=np.int64).tobytes())
+        h.update(dataset.temporal[rows].contiguous().view(torch.uint8).numpy())
+        if dataset.static is not None:
+            h.update(dataset.static.contiguous().view(torch.uint8).numpy())
+        return h.hexdigest()
+
     def training_step(self, batch, batch_idx):
+        if self.truncated_bptt:
+            # The training loader is not shuffled, each batch index holds the same series
+            self._tbptt_group = self._tbptt_state.setdefault(
+                batch_idx, dict(next_start=0, state=None)
+            )
+
         # Create and normalize windows [Ws, L+H, C]
         batch = self._normalization(
             batch, val_size=self.val_size, test_size=self.test_size
@@ -314,6 +542,7 @@ class BaseRecurrent(BaseModel):
 
         # Model predictions
         output = self(windows_batch)  # tuple([B, seq_len, H, output])
+        self._tbptt_group = None
         if self.loss.is_distribution_output:
             outsample_y, y_loc, y_scale = self._inv_normalization(
                 y_hat=outsample_y,
@@ -447,26 +676,46 @@ class BaseRecurrent(BaseModel):
         return valid_loss
 
     def predict_step(self, batch, batch_idx):
+        if self._stream is not None:
+            # The predict loader is not shuffled, batches hold consecutive series
+            start = batch_idx * self.valid_batch_size
+            self._stream["idxs"] = slice(start, start + len(batch["temporal"]))
+
         # Create and normalize windows [Ws, L+H, C]
         batch = self._normalization(batch, val_size=0, test_size=self.test_size)
         windows = self._create_windows(batch, step="predict")
         y_idx = batch["y_idx"]
 
+        # Cutoffs every predict_step_size windows, back from the last one through the test region
+        n_windows = windows["temporal"].shape[2]
+        n_cutoffs = 1
+        if self.test_size > 0:
+            n_cutoffs = (self.test_size - self.h) // self.predict_step_size + 1
+        first_cutoff = n_windows - 1 - (n_cutoffs - 1) * self.predict_step_size
+        self._cutoffs = torch.arange(
+            first_cutoff,
+            n_windows,
+            self.predict_step_size,
+            device=windows["temporal"].device,
+        )
+
         # Parse windows
         insample_y, insample_mask, _, _, hist_exog, futr_exog, stat_exog = (
             self._parse_windows(batch, windows)
         )
+        if futr_exog is not None:
+            futr_exog = futr_exog[:, :, self._cutoffs]
 
         windows_batch = dict(
             insample_y=insample_y,  # [B, seq_len, 1]
             insample_mask=insample_mask,  # [B, seq_len, 1]
-            futr_exog=futr_exog,  # [B, F, seq_len, 1+H]
+            futr_exog=futr_exog,  # [B, F, n_cutoffs, 1+H]
             hist_exog=hist_exog,  # [B, C, seq_len]
             stat_exog=stat_exog,
         )  # [B, S]
 
         # Model Predictions
-        output = self(windows_batch)  # tuple([B, seq_len, H], ...)
+        output = self(windows_batch)  # tuple([B, n_cutoffs, H], ...)
         if self.loss.is_distribution_output:
             _, y_loc, y_scale = self._inv_normalization(
                 y_hat=output[0], temporal_cols=batch["temporal_cols"], y_idx=y_idx
@@ -523,6 +772,11 @@ class BaseRecurrent(BaseModel):
         `test_size`: int, test size for temporal cross-validation.<br>
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
         """
+        # New weights invalidate the stored encoder states
+        self._stream_state = None
+        self._tbptt_state = {}
+        if self.truncated_bptt:
+            self._check_stateful_encoder("truncated_bptt")
         return self._fit(
             dataset=dataset,
             batch_size=self.batch_size,
@@ -530,10 +784,19 @@ class BaseRecurrent(BaseModel):
             val_size=val_size,
             test_size=test_size,
             random_seed=random_seed,
+            shuffle_train=not self.truncated_bptt,
             distributed_config=distributed_config,
         )
 
-    def predict(self, dataset, step_size=1, random_seed=None, **data_module_kwargs):
+    def predict(
+        self,
+        dataset,
+        step_size=1,
+        random_seed=None,
+        inference_engine="lightning",
+        num_threads=None,
+        **data_module_kwargs,
+    ):
         """Predict.
 
         Neural network prediction with PL's `Trainer` execution of `predict_step`.
@@ -542,23 +805,26 @@ class BaseRecurrent(BaseModel):
         `dataset`: NeuralForecast's `TimeSeriesDataset`, see [documentation](https://nixtla.github.io/neuralforecast/tsdataset.html).<br>
         `step_size`: int=1, Step size between each window.<br>
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
+        `inference_engine`: str='lightning', 'lightning' runs PL's `Trainer`, 'torch' loops over `predict_step` without it, on the device of the weights.<br>
+        `num_threads`: int=None, number of torch threads used for the prediction, defaults to torch's setting.<br>
         `**data_module_kwargs`: PL's TimeSeriesDataModule args, see [documentation](https://pytorch-lightning.readthedocs.io/en/1.6.1/extensions/datamodules.html#using-a-datamodule).
         """
         self._check_exog(dataset)
         self._restart_seed(random_seed)
 
-        if step_size > 1:
-            raise Exception("Recurrent models do not support step_size > 1")
+        self.predict_step_size = step_size
 
-        # fcsts (window, batch, h)
-        # Protect when case of multiple gpu. PL does not support return preds with multiple gpu.
-        pred_trainer_kwargs = self.trainer_kwargs.copy()
-        if (pred_trainer_kwargs.get("accelerator", None) == "gpu") and (
-            torch.cuda.device_count() > 1
-        ):
-            pred_trainer_kwargs["devices"] = [0]
-
-        trainer = pl.Trainer(**pred_trainer_kwargs)
+        sizes = np.diff(dataset.indptr) - self.h
+        pending, self._stream_pending = self._stream_pending, None
+        if self.test_size != self.h:
+            self._stream = None
+        elif (pending is not None) and self._stream_matches(pending, sizes):
+            self._stream = pending
+        else:
+            self._stream = self._stream_context(dataset, sizes)
+        if (self._stream is not None) and (self._stream["mode"] == "update"):
+            # The stored states only need the new observations and the horizon
+            dataset = dataset.tail(int(self._stream["n_new"].max()) + self.h)
 
         datamodule = TimeSeriesDataModule(
             dataset=dataset,
@@ -566,16 +832,31 @@ class BaseRecurrent(BaseModel):
             num_workers=self.num_workers_loader,
             **data_module_kwargs,
         )
-        fcsts = trainer.predict(self, datamodule=datamodule)
-        if self.test_size > 0:
-            # Remove warmup windows (from train and validation)
-            # [N,T,H,output], avoid indexing last dim for univariate output compatibility
-            fcsts = torch.vstack(
-                [fcst[:, -(1 + self.test_size - self.h) :, :] for fcst in fcsts]
+        try:
+            fcsts = self._predict_batches(
+                datamodule, inference_engine=inference_engine, num_threads=num_threads
             )
-            fcsts = fcsts.numpy().flatten()
-            fcsts = fcsts.reshape(-1, len(self.loss.output_names))
-        else:
-            fcsts = torch.vstack([fcst[:, -1:, :] for fcst in fcsts]).numpy().flatten()
-            fcsts = fcsts.reshape(-1, len(self.loss.output_names))
+        finally:
+            stream, self._stream = self._stream, None
+            self._cutoffs = None
+        if stream is not None:
+            if stream["mode"] == "build":
+                scaler_state = dict(
+                    x_shift=torch.cat(stream["x_shift"]),
+                    x_scale=torch.cat(stream["x_scale"]),
+                )
+            else:
+                scaler_state = self._stream_state
+            self._stream_state = dict(
+                sizes=stream["sizes"],
+                digest=stream["digest"],
+                x_shift=scaler_state["x_shift"],
+                x_scale=scaler_state["x_scale"],
+                encoder=tuple(torch.cat(s) for s in zip(*stream["encoder"])),
+                hidden=torch.cat(stream["hidden"]),
+            )
+
+        # [N,n_cutoffs,H,output], the warmup windows (from train and validation) were never decoded
+        fcsts = torch.vstack(fcsts).numpy().flatten()
+        fcsts = fcsts.reshape(-1, len(self.loss.output_names))
         return fcsts
@@ -9,9 +9,9 @@ import torch
 import torch.nn as nn
 import pytorch_lightning as pl
 
-from ._base_model import BaseModel
+from ._base_model import BaseModel, _available_windows
 from ._scalers import TemporalNorm
-from ..tsdataset import TimeSeriesDataModule
+from ..tsdataset import TimeSeriesDataModule, TimeSeriesDataset
 from ..utils import get_indexer_raise_missing
 
 # %% ../../nbs/common.base_windows.ipynb 6
@@ -71,6 +71,10 @@ class BaseWindows(BaseModel):
             **trainer_kwargs,
         )
 
+        # Batches bucketed by length keep the context needed by the windows of their longest serie
+        if self.dataloader_kwargs.get("bucket_by_length", False):
+            self.dataloader_kwargs.setdefault("bucket_padding", input_size - 1)
+
         # Padder to complete train windows,
         # example y=[1,2,3,4,5] h=3 -> last y_output = [5,0,0]
         self.h = h
@@ -130,6 +134,106 @@ class BaseWindows(BaseModel):
         self.validation_step_outputs = []
         self.alias = alias
 
+    def get_predict_input_size(self):
+        # predict windows only look at the last input_size steps before the horizon
+        return self.input_size
+
+    def _train_window_counts(self, dataset):
+        # windows need an available insample and outsample value, so a serie of size s with
+        # input_size - 1 zeros on its left holds s - 1 windows, missing values are ignored
+        sizes = np.diff(dataset.indptr)
+        if self.start_padding_enabled:
+            left_padding = self.input_size - 1
+        else:
+            # batches are padded to their longest serie plus `bucket_padding`, up to `max_size`
+            left_padding = np.minimum(self.input_size - 1, dataset.max_size - sizes)
+        n_windows = np.maximum(
+            sizes - self.val_size - self.test_size - self.input_size + left_padding, 0
+        )
+        return -(-n_windows // self.step_size)
+
+    def _gather_windows(self, batch, windows, w_idxs):
+        # windows [B, Ws, L+H, C] -> [len(w_idxs), L+H, C]
+        # w_idxs index the windows flattened as [B * Ws], only these windows are copied
+        w_idxs = torch.as_tensor(w_idxs, device=windows.device)
+        serie_idxs = w_idxs // windows.shape[1]
+
+        # Parse Static data to match windows
+        static = batch.get("static", None)
+        static_cols = batch.get("static_cols", None)
+        if static is not None:
+            static = static[serie_idxs]
+
+        windows_batch = dict(
+            temporal=windows[serie_idxs, w_idxs % windows.shape[1]],
+            temporal_cols=batch["temporal_cols"],
+            static=static,
+            static_cols=static_cols,
+        )
+        return windows_batch
+
+    def _unfold_inference_windows(self, batch, step):
+        # Parse common data
+        window_size = self.input_size + self.h
+        temporal = batch["temporal"]
+
+        if step == "predict":
+            initial_input = temporal.shape[-1] - self.test_size
+            if (
+                initial_input <= self.input_size
+            ):  # There is not enough data to predict first timestamp
+                padder_left = nn.ConstantPad1d(
+                    padding=(self.input_size - initial_input, 0), value=0
+                )
+                temporal = padder_left(temporal)
+            predict_step_size = self.predict_step_size
+            cutoff = -self.input_size - self.test_size
+            temporal = temporal[:, :, cutoff:]
+
+        elif step == "val":
+            predict_step_size = self.step_size
+            cutoff = -self.input_size - self.val_size - self.test_size
+            if self.test_size > 0:
+                temporal = batch["temporal"][:, :, cutoff : -self.test_size]
+            else:
+                temporal = batch["temporal"][:, :, cutoff:]
+            if temporal.shape[-1] < window_size:
+                initial_input = temporal.shape[-1] - self.val_size
+                padder_left = nn.ConstantPad1d(
+                    padding=(self.input_size - initial_input, 0), value=0
+                )
+                temporal = padder_left(temporal)
+        else:
+            raise ValueError(f"Unknown step {step}")
+
+        if (
+            (step == "predict")
+            and (self.test_size == 0)
+            and (len(self.futr_exog_list) == 0)
+        ):
+            padder_right = nn.ConstantPad1d(padding=(0, self.h), value=0)
+            temporal = padder_right(temporal)
+
+        # [batch, channels, windows, window_size] 0, 1, 2, 3
+        # -> [batch, windows, window_size, channels] 0, 2, 3, 1, a view of the batch
+        windows = temporal.unfold(
+            dimension=-1, size=window_size, step=predict_step_size
+        )
+        return windows.permute(0, 2, 3, 1)
+
+    def _inference_windows(self, batch, step):
+        """Windows of `batch` for the 'val' or 'predict' `step`, in chunks of
+        `inference_windows_batch_size`. The batch is unfolded once and
+        only the windows of the current chunk are copied."""
+        windows = self._unfold_inference_windows(batch, step)
+        n_windows = windows.shape[0] * windows.shape[1]
+        windows_batch_size = self.inference_windows_batch_size
+        if windows_batch_size < 0:
+            windows_batch_size = n_windows
+        for start in range(0, n_windows, windows_batch_size):
+            w_idxs = np.arange(start, min(start + windows_batch_size, n_windows))
+            yield self._gather_windows(batch, windows, w_idxs)
+
     def _create_windows(self, batch, step, w_idxs=None):
         # Parse common data
         window_size = self.input_size + self.h
@@ -143,134 +247,50 @@ class BaseWindows(BaseModel):
 
             temporal = self.padder_train(temporal)
             if temporal.shape[-1] < window_size:
-                raise Exception(
-                    "Time series is too short for training, consider setting a smaller input size or set start_padding_enabled=True"
+                # batch padded to its longest serie (see `fit`)
+                padder_left = nn.ConstantPad1d(
+                    padding=(window_size - temporal.shape[-1], 0), value=0
                 )
+                temporal = padder_left(temporal)
+            # [B, C, Ws, L+H] 0, 1, 2, 3
+            # -> [B, Ws, L+H, C] 0, 2, 3, 1, a view of the batch
             windows = temporal.unfold(
                 dimension=-1, size=window_size, step=self.step_size
             )
+            windows = windows.permute(0, 2, 3, 1)
 
-            # [B, C, Ws, L+H] 0, 1, 2, 3
-            # -> [B * Ws, L+H, C] 0, 2, 3, 1
-            windows_per_serie = windows.shape[2]
-            windows = windows.permute(0, 2, 3, 1).contiguous()
-            windows = windows.reshape(-1, window_size, len(temporal_cols))
-
-            # Sample and Available conditions
+            # Index of the valid windows, flattened as [B * Ws]
             available_idx = temporal_cols.get_loc("available_mask")
-            available_condition = windows[:, : self.input_size, available_idx]
-            available_condition = torch.sum(available_condition, axis=1)
-            final_condition = available_condition > 0
-            if self.h > 0:
-                sample_condition = windows[:, self.input_size :, available_idx]
-                sample_condition = torch.sum(sample_condition, axis=1)
-                final_condition = (sample_condition > 0) & (available_condition > 0)
-            windows = windows[final_condition]
-
-            # Parse Static data to match windows
-            # [B, S_in] -> [B, Ws, S_in] -> [B*Ws, S_in]
-            static = batch.get("static", None)
-            static_cols = batch.get("static_cols", None)
-            if static is not None:
-                static = torch.repeat_interleave(
-                    static, repeats=windows_per_serie, dim=0
-                )
-                static = static[final_condition]
+            final_condition = _available_windows(
+                temporal[:, available_idx],
+                input_size=self.input_size,
+                h=self.h,
+                step_size=self.step_size,
+                n_windows=windows.shape[1],
+            )
+            valid_idxs = final_condition.flatten().nonzero().squeeze(1)
 
             # Protection of empty windows
-            if final_condition.sum() == 0:
+            if len(valid_idxs) == 0:
                 raise Exception("No windows available for training")
 
             # Sample windows
-            n_windows = len(windows)
+            n_windows = len(valid_idxs)
             if self.windows_batch_size is not None:
                 w_idxs = np.random.choice(
                     n_windows,
                     size=self.windows_batch_size,
                     replace=(n_windows < self.windows_batch_size),
                 )
-                windows = windows[w_idxs]
-
-                if static is not None:
-                    static = static[w_idxs]
-
-            # think about interaction available * sample mask
-            # [B, C, Ws, L+H]
-            windows_batch = dict(
-                temporal=windows,
-                temporal_cols=temporal_cols,
-                static=static,
-                static_cols=static_cols,
-            )
-            return windows_batch
+                valid_idxs = valid_idxs[w_idxs]
+            return self._gather_windows(batch, windows, valid_idxs)
 
         elif step in ["predict", "val"]:
-
-            if step == "predict":
-                initial_input = temporal.shape[-1] - self.test_size
-                if (
-                    initial_input <= self.input_size
-                ):  # There is not enough data to predict first timestamp
-                    padder_left = nn.ConstantPad1d(
-                        padding=(self.input_size - initial_input, 0), value=0
-                    )
-                    temporal = padder_left(temporal)
-                predict_step_size = self.predict_step_size
-                cutoff = -self.input_size - self.test_size
-                temporal = temporal[:, :, cutoff:]
-
-            elif step == "val":
-                predict_step_size = self.step_size
-                cutoff = -self.input_size - self.val_size - self.test_size
-                if self.test_size > 0:
-                    temporal = batch["temporal"][:, :, cutoff : -self.test_size]
-                else:
-                    temporal = batch["temporal"][:, :, cutoff:]
-                if temporal.shape[-1] < window_size:
-                    initial_input = temporal.shape[-1] - self.val_size
-                    padder_left = nn.ConstantPad1d(
-                        padding=(self.input_size - initial_input, 0), value=0
-                    )
-                    temporal = padder_left(temporal)
-
-            if (
-                (step == "predict")
-                and (self.test_size == 0)
-                and (len(self.futr_exog_list) == 0)
-            ):
-                padder_right = nn.ConstantPad1d(padding=(0, self.h), value=0)
-                temporal = padder_right(temporal)
-
-            windows = temporal.unfold(
-                dimension=-1, size=window_size, step=predict_step_size
-            )
-
-            # [batch, channels, windows, window_size] 0, 1, 2, 3
-            # -> [batch * windows, window_size, channels] 0, 2, 3, 1
-            windows_per_serie = windows.shape[2]
-            windows = windows.permute(0, 2, 3, 1).contiguous()
-            windows = windows.reshape(-1, window_size, len(temporal_cols))
-
-            static = batch.get("static", None)
-            static_cols = batch.get("static_cols", None)
-            if static is not None:
-                static = torch.repeat_interleave(
-                    static, repeats=windows_per_serie, dim=0
-                )
-
+            windows = self._unfold_inference_windows(batch, step)
             # Sample windows for batched prediction
-            if w_idxs is not None:
-                windows = windows[w_idxs]
-                if static is not None:
-                    static = static[w_idxs]
-
-            windows_batch = dict(
-                temporal=windows,
-                temporal_cols=temporal_cols,
-                static=static,
-                static_cols=static_cols,
-            )
-            return windows_batch
+            if w_idxs is None:
+                w_idxs = np.arange(windows.shape[0] * windows.shape[1])
+            return self._gather_windows(batch, windows, w_idxs)
         else:
             raise ValueError(f"Unknown step {step}")
 
@@ -478,25 +498,12 @@ class BaseWindows(BaseModel):
         if self.val_size == 0:
             return np.nan
 
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="val")
-        n_windows = len(windows["temporal"])
         y_idx = batch["y_idx"]
 
-        # Number of windows in batch
-        windows_batch_size = self.inference_windows_batch_size
-        if windows_batch_size < 0:
-            windows_batch_size = n_windows
-        n_batches = int(np.ceil(n_windows / windows_batch_size))
-
         valid_losses = []
         batch_sizes = []
-        for i in range(n_batches):
-            # Create and normalize windows [Ws, L+H, C]
-            w_idxs = np.arange(
-                i * windows_batch_size, min((i + 1) * windows_batch_size, n_windows)
-            )
-            windows = self._create_windows(batch, step="val", w_idxs=w_idxs)
+        # Create and normalize windows [Ws, L+H, C]
+        for windows in self._inference_windows(batch, step="val"):
             original_outsample_y = torch.clone(windows["temporal"][:, -self.h :, y_idx])
             windows = self._normalization(windows=windows, y_idx=y_idx)
 
@@ -543,24 +550,11 @@ class BaseWindows(BaseModel):
 
     def predict_step(self, batch, batch_idx):
 
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="predict")
-        n_windows = len(windows["temporal"])
         y_idx = batch["y_idx"]
 
-        # Number of windows in batch
-        windows_batch_size = self.inference_windows_batch_size
-        if windows_batch_size < 0:
-            windows_batch_size = n_windows
-        n_batches = int(np.ceil(n_windows / windows_batch_size))
-
         y_hats = []
-        for i in range(n_batches):
-            # Create and normalize windows [Ws, L+H, C]
-            w_idxs = np.arange(
-                i * windows_batch_size, min((i + 1) * windows_batch_size, n_windows)
-            )
-            windows = self._create_windows(batch, step="predict", w_idxs=w_idxs)
+        # Create and normalize windows [Ws, L+H, C]
+        for windows in self._inference_windows(batch, step="predict"):
             windows = self._normalization(windows=windows, y_idx=y_idx)
 
             # Parse windows
@@ -629,12 +623,27 @@ class BaseWindows(BaseModel):
         By default the `model` is not saving training checkpoints to protect
         disk memory, to get them change `enable_checkpointing=True` in `__init__`.
 
+        Training batches can group series of similar length with
+        `dataloader_kwargs=dict(bucket_by_length=True)` in `__init__`, so that
+        each batch is only padded to the length of its longest serie. The batches
+        are then drawn in proportion to their number of windows, so that the windows
+        of short series are not sampled more often than those of long series.
+
         **Parameters:**<br>
         `dataset`: NeuralForecast's `TimeSeriesDataset`, see [documentation](https://nixtla.github.io/neuralforecast/tsdataset.html).<br>
         `val_size`: int, validation size for temporal cross-validation.<br>
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
         `test_size`: int, test size for temporal cross-validation.<br>
         """
+        # Checked here since batches are padded to their longest serie when bucketing by length
+        if isinstance(dataset, TimeSeriesDataset):
+            train_size = (
+                dataset.max_size - val_size - test_size + sum(self.padder_train.padding)
+            )
+            if train_size < self.input_size + self.h:
+                raise Exception(
+                    "Time series is too short for training, consider setting a smaller input size or set start_padding_enabled=True"
+                )
         return self._fit(
             dataset=dataset,
             batch_size=self.batch_size,
@@ -651,6 +660,8 @@ class BaseWindows(BaseModel):
         test_size=None,
         step_size=1,
         random_seed=None,
+        inference_engine="lightning",
+        num_threads=None,
         **data_module_kwargs,
     ):
         """Predict.
@@ -662,6 +673,8 @@ class BaseWindows(BaseModel):
         `test_size`: int=None, test size for temporal cross-validation.<br>
         `step_size`: int=1, Step size between each window.<br>
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
+        `inference_engine`: str='lightning', 'lightning' runs PL's `Trainer`, 'torch' loops over `predict_step` without it, on the device of the weights.<br>
+        `num_threads`: int=None, number of torch threads used for the prediction, defaults to torch's setting.<br>
         `**data_module_kwargs`: PL's TimeSeriesDataModule args, see [documentation](https://pytorch-lightning.readthedocs.io/en/1.6.1/extensions/datamodules.html#using-a-datamodule).
         """
         self._check_exog(dataset)
@@ -675,15 +688,9 @@ class BaseWindows(BaseModel):
             **data_module_kwargs,
         )
 
-        # Protect when case of multiple gpu. PL does not support return preds with multiple gpu.
-        pred_trainer_kwargs = self.trainer_kwargs.copy()
-        if (pred_trainer_kwargs.get("accelerator", None) == "gpu") and (
-            torch.cuda.device_count() > 1
-        ):
-            pred_trainer_kwargs["devices"] = [0]
-
-        trainer = pl.Trainer(**pred_trainer_kwargs)
-        fcsts = trainer.predict(self, datamodule=datamodule)
+        fcsts = self._predict_batches(
+            datamodule, inference_engine=inference_engine, num_threads=num_threads
+        )
         fcsts = torch.vstack(fcsts).numpy().flatten()
         fcsts = fcsts.reshape(-1, len(self.loss.output_names))
         return fcsts
@@ -409,7 +409,7 @@ class TemporalNorm(nn.Module):
             self.revin_weight = nn.Parameter(torch.ones(1, num_features, 1))
 
     # @torch.no_grad()
-    def transform(self, x, mask):
+    def transform(self, x, mask, x_shift=None, x_scale=None):
         """Center and scale the data.
 
         **Parameters:**<br>
@@ -417,13 +417,16 @@ class TemporalNorm(nn.Module):
         `mask`: torch Tensor bool, shape  [batch, time] where `x` is valid and False
                 where `x` should be masked. Mask should not be all False in any column of
                 dimension dim to avoid NaNs from zero division.<br>
+        `x_shift`: torch.Tensor, optional, precomputed shift statistics, computed from `x` if None.<br>
+        `x_scale`: torch.Tensor, optional, precomputed scale statistics, computed from `x` if None.<br>
 
         **Returns:**<br>
         `z`: torch.Tensor same shape as `x`, except scaled.
         """
-        x_shift, x_scale = self.compute_statistics(
-            x=x, mask=mask, dim=self.dim, eps=self.eps
-        )
+        if (x_shift is None) or (x_scale is None):
+            x_shift, x_scale = self.compute_statistics(
+                x=x, mask=mask, dim=self.dim, eps=self.eps
+            )
         self.x_shift = x_shift
         self.x_scale = x_scale
 
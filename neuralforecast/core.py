@@ -1,15 +1,21 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/core.ipynb.
 
 # %% auto 0
-__all__ = ['NeuralForecast']
+__all__ = ['ForecastCache', 'NeuralForecast']
 
 # %% ../nbs/core.ipynb 4
+import hashlib
+import json
 import os
 import pickle
+import reprlib
+import shutil
+import time
 import warnings
-from copy import deepcopy
+from collections import OrderedDict
+from copy import copy, deepcopy
 from itertools import chain
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import fsspec
 import numpy as np
@@ -23,12 +29,17 @@ from coreforecast.scalers import (
     LocalRobustScaler,
     LocalStandardScaler,
 )
+from fsspec.implementations.local import LocalFileSystem
 from utilsforecast.compat import DataFrame, Series, pl_DataFrame, pl_Series
 from utilsforecast.validation import validate_freq
 
-from .common._base_model import DistributedConfig
+from .common._base_auto import BaseAuto
+from .common._base_model import BaseModel, DistributedConfig
+from .common._base_model import _disable_torch_init
+from .common._base_multivariate import BaseMultivariate
 from .compat import SparkDataFrame
-from .tsdataset import _FilesDataset, TimeSeriesDataset
+from .tsdataset import _concat_ranges, _FilesDataset
+from .tsdataset import MemmapTimeSeriesDataset, TimeSeriesDataset
 from neuralforecast.models import (
     GRU,
     LSTM,
@@ -175,6 +186,16 @@ _type2scaler = {
     "boxcox": lambda: LocalBoxCoxScaler(method="loglik", lower=0.0),
 }
 
+
+def _take_scaler(scaler, idxs: Optional[np.ndarray]):
+    """Local scaler restricted to the series at positions `idxs`."""
+    if idxs is None:
+        return scaler
+    # local scalers keep one row of statistics per serie
+    out = copy(scaler)
+    out.stats_ = scaler.stats_[idxs]
+    return out
+
 # %% ../nbs/core.ipynb 9
 def _id_as_idx() -> bool:
     return not bool(os.getenv("NIXTLA_ID_AS_COL", ""))
@@ -189,6 +210,349 @@ def _warn_id_as_idx():
     )
 
 # %% ../nbs/core.ipynb 10
+def _hash_frame(df: Optional[DataFrame]) -> str:
+    """Digest of the columns, dtypes and values of `df`."""
+    h = hashlib.sha256()
+    if df is None:
+        return h.hexdigest()
+    h.update(repr([(col, str(df[col].dtype)) for col in df.columns]).encode())
+    if isinstance(df, pd.DataFrame):
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    else:
+        row_hashes = df.hash_rows().to_numpy()
+    h.update(row_hashes.tobytes())
+    return h.hexdigest()
+
+
+class _DatasetCache:
+    """Processed datasets stored in `directory`, one subdirectory per key.
+
+    The arrays are saved as .npy files and the rest (ids, dates and scalers) is pickled.
+    Reading an entry marks it as recently used, and the least recently used entries
+    are removed when the size of the cache exceeds `max_size` bytes."""
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, df: DataFrame, static_df: Optional[DataFrame], **params) -> str:
+        h = hashlib.sha256()
+        h.update(_hash_frame(df).encode())
+        h.update(_hash_frame(static_df).encode())
+        h.update(repr(sorted(params.items())).encode())
+        return h.hexdigest()
+
+    def get(self, key: str):
+        path = os.path.join(self.directory, key)
+        if not os.path.isdir(path):
+            return None
+        os.utime(path)
+        with open(os.path.join(path, "meta.pkl"), "rb") as f:
+            meta = pickle.load(f)
+        static = None
+        if meta["static_cols"] is not None:
+            static = np.load(os.path.join(path, "static.npy"))
+        dataset = TimeSeriesDataset(
+            temporal=np.load(os.path.join(path, "temporal.npy")),
+            temporal_cols=meta["temporal_cols"],
+            indptr=np.load(os.path.join(path, "indptr.npy")),
+            max_size=meta["max_size"],
+            min_size=meta["min_size"],
+            y_idx=meta["y_idx"],
+            static=static,
+            static_cols=meta["static_cols"],
+            sorted=meta["sorted"],
+        )
+        ds = np.load(os.path.join(path, "ds.npy"), allow_pickle=True)
+        return dataset, meta["uids"], meta["last_dates"], ds, meta["scalers"]
+
+    def put(
+        self, key: str, dataset: TimeSeriesDataset, uids, last_dates, ds, scalers
+    ) -> None:
+        path = os.path.join(self.directory, key)
+        # written aside and renamed, so that readers never see partial entries
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+        np.save(os.path.join(tmp_path, "temporal.npy"), dataset.temporal.numpy())
+        np.save(os.path.join(tmp_path, "indptr.npy"), dataset.indptr)
+        np.save(os.path.join(tmp_path, "ds.npy"), ds)
+        if dataset.static is not None:
+            np.save(os.path.join(tmp_path, "static.npy"), dataset.static.numpy())
+        meta = dict(
+            temporal_cols=dataset.temporal_cols,
+            static_cols=dataset.static_cols,
+            max_size=dataset.max_size,
+            min_size=dataset.min_size,
+            y_idx=dataset.y_idx,
+            sorted=dataset.sorted,
+            uids=uids,
+            last_dates=last_dates,
+            scalers=scalers,
+        )
+        with open(os.path.join(tmp_path, "meta.pkl"), "wb") as f:
+            pickle.dump(meta, f)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # the same entry was written by another process
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp") or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path))
+            entries.append((os.path.getmtime(path), size, path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+
+# %% ../nbs/core.ipynb 11
+_COLUMNAR_FORMAT_VERSION = 1
+
+_SAFETENSORS_DTYPES = {
+    torch.float64: "F64",
+    torch.float32: "F32",
+    torch.float16: "F16",
+    torch.bfloat16: "BF16",
+    torch.int64: "I64",
+    torch.int32: "I32",
+    torch.int16: "I16",
+    torch.int8: "I8",
+    torch.uint8: "U8",
+    torch.bool: "BOOL",
+}
+
+
+def _save_safetensors(tensors: Dict[str, torch.Tensor], path: str) -> None:
+    """Write `tensors` with the safetensors layout: the length of a JSON header
+    (8 bytes, little endian), the header and the raw bytes of each tensor."""
+    # larger elements go first, so every tensor starts at a multiple of its element size
+    names = sorted(tensors, key=lambda name: -tensors[name].element_size())
+    header: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name in names:
+        tensor = tensors[name]
+        if tensor.dtype not in _SAFETENSORS_DTYPES:
+            raise ValueError(f"Tensor {name} has an unsupported dtype: {tensor.dtype}.")
+        nbytes = tensor.numel() * tensor.element_size()
+        header[name] = {
+            "dtype": _SAFETENSORS_DTYPES[tensor.dtype],
+            "shape": list(tensor.shape),
+            "data_offsets": [offset, offset + nbytes],
+        }
+        offset += nbytes
+    header_bytes = json.dumps(header).encode()
+    header_bytes += b" " * (-len(header_bytes) % 8)
+    with open(path, "wb") as f:
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        for name in names:
+            data = (
+                tensors[name].detach().cpu().contiguous().reshape(-1).view(torch.uint8)
+            )
+            f.write(data.numpy().tobytes())
+
+
+def _load_safetensors(path: str, mmap: bool = False) -> Dict[str, torch.Tensor]:
+    """Read the tensors written by `_save_safetensors`. With `mmap=True` they are
+    copy-on-write views of the file, which is only read as they are used."""
+    with open(path, "rb") as f:
+        header_size = int.from_bytes(f.read(8), "little")
+        header: Dict[str, Any] = json.loads(f.read(header_size))
+    header.pop("__metadata__", None)
+    data_start = 8 + header_size
+    raw: np.ndarray
+    if os.path.getsize(path) == data_start:
+        # only empty tensors, np.memmap can't map an empty region
+        raw = np.empty(0, dtype=np.uint8)
+    elif mmap:
+        raw = np.memmap(path, dtype=np.uint8, mode="c", offset=data_start)
+    else:
+        raw = np.fromfile(path, dtype=np.uint8, offset=data_start)
+    buffer = torch.from_numpy(raw)
+    name2dtype = {v: k for k, v in _SAFETENSORS_DTYPES.items()}
+    tensors: Dict[str, torch.Tensor] = {}
+    for name, info in header.items():
+        start, end = info["data_offsets"]
+        dtype = name2dtype[info["dtype"]]
+        if start == end:
+            tensors[name] = torch.empty(info["shape"], dtype=dtype)
+            continue
+        data = buffer[start:end]
+        if start % dtype.itemsize:
+            # files written by other tools may not be aligned
+            data = data.clone()
+        tensors[name] = data.view(dtype).reshape(info["shape"])
+    return tensors
+
+# %% ../nbs/core.ipynb 13
+class ForecastCache:
+    """Forecasts of single series, reused by `NeuralForecast.predict` while their inputs don't change.
+
+    Each entry holds the forecasts of one serie by one model, before the local scalers' inverse transform.
+    It is keyed by the model's weights, the id, the values that the model reads from the serie
+    (its last `input_size` observations, future exogenous and static features) and the horizon.
+    The least recently used entries are removed when there are more than `max_entries`,
+    and entries older than `ttl` seconds are never returned.
+
+    Parameters
+    ----------
+    max_entries : int (default=100_000)
+        Maximum number of cached series forecasts.
+    ttl : float, optional (default=None)
+        Seconds during which an entry can be used. By default entries don't expire.
+    directory : str, optional (default=None)
+        If provided, the entries are stored there as .npy files, which are kept between sessions
+        and can be shared by several processes. By default they are kept in memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl: Optional[float] = None,
+        directory: Optional[str] = None,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        # key -> (creation time, forecasts), the forecasts are None when they are stored on disk
+        self._entries: OrderedDict = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            stored = [
+                entry for entry in os.scandir(directory) if entry.name.endswith(".npy")
+            ]
+            for entry in sorted(stored, key=lambda entry: entry.stat().st_mtime):
+                self._entries[entry.name[:-4]] = (entry.stat().st_mtime, None)
+            self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Forecasts stored for `key`, None when there are no valid ones."""
+        entry = self._entries.get(key)
+        if (
+            entry is not None
+            and self.ttl is not None
+            and time.time() - entry[0] > self.ttl
+        ):
+            self._remove(key)
+            entry = None
+        fcsts = None
+        if entry is not None:
+            fcsts = entry[1]
+            if fcsts is None:
+                try:
+                    fcsts = np.load(self._path(key))
+                except FileNotFoundError:
+                    # removed by another process
+                    self._entries.pop(key)
+        if fcsts is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return fcsts
+
+    def put(self, key: str, fcsts: np.ndarray) -> None:
+        """Stores the forecasts `fcsts` of a serie under `key`."""
+        stored: Optional[np.ndarray] = np.array(fcsts)
+        if self.directory is not None:
+            # written aside and renamed, so that readers never see partial entries
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, fcsts)
+            os.replace(tmp_path, self._path(key))
+            stored = None
+        self._entries[key] = (time.time(), stored)
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def clear(self) -> None:
+        """Removes all the entries."""
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _path(self, key: str) -> str:
+        # only called for caches stored on disk
+        assert self.directory is not None
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _remove(self, key: str) -> None:
+        self._entries.pop(key)
+        if self.directory is not None:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    @staticmethod
+    def model_id(model) -> str:
+        """Digest of the class, horizon, outputs and weights of `model`."""
+        h = hashlib.sha256()
+        h.update(
+            repr(
+                (type(model).__name__, model.h, list(model.loss.output_names))
+            ).encode()
+        )
+        for name, tensor in model.state_dict().items():
+            h.update(name.encode())
+            h.update(
+                tensor.detach()
+                .cpu()
+                .reshape(-1)
+                .contiguous()
+                .view(torch.uint8)
+                .numpy()
+                .tobytes()
+            )
+        return h.hexdigest()
+
+    @staticmethod
+    def series_keys(
+        model_id: str,
+        dataset: TimeSeriesDataset,
+        uids: Series,
+        h: int,
+        input_size: Optional[int],
+    ) -> List[str]:
+        """Keys of the series of `dataset`, which ends with the `h` future rows of each serie.
+        `input_size` is the number of observations that the model reads, all of them when None.
+        """
+        if input_size is not None:
+            dataset = dataset.tail(input_size + h)
+        # bytes of each row of the temporal data, valid for any storage dtype
+        rows = dataset.temporal.contiguous().view(torch.uint8).numpy()
+        static = None if dataset.static is None else dataset.static.numpy()
+        keys = []
+        for i, uid in enumerate(uids):
+            key = hashlib.blake2b(digest_size=20)
+            key.update(model_id.encode())
+            key.update(repr((uid, h)).encode())
+            key.update(rows[dataset.indptr[i] : dataset.indptr[i + 1]].tobytes())
+            if static is not None:
+                key.update(static[i].tobytes())
+            keys.append(key.hexdigest())
+        return keys
+
+# %% ../nbs/core.ipynb 14
 class NeuralForecast:
 
     def __init__(
@@ -196,6 +560,9 @@ class NeuralForecast:
         models: List[Any],
         freq: Union[str, int],
         local_scaler_type: Optional[str] = None,
+        dataset_dtype: torch.dtype = torch.float32,
+        dataset_cache_dir: Optional[str] = None,
+        dataset_cache_size: int = 10 * 2**30,
     ):
         """
         The `core.StatsForecast` class allows you to efficiently fit multiple `NeuralForecast` models
@@ -213,6 +580,15 @@ class NeuralForecast:
         local_scaler_type : str, optional (default=None)
             Scaler to apply per-serie to all features before fitting, which is inverted after predicting.
             Can be 'standard', 'robust', 'robust-iqr', 'minmax' or 'boxcox'
+        dataset_dtype : torch.dtype (default=torch.float32)
+            Precision used to store the temporal data of the datasets built from dataframes.
+            torch.float16 or torch.bfloat16 halve their memory and are upcast to float32 per batch.
+        dataset_cache_dir : str, optional (default=None)
+            Local directory where the datasets built from pandas or polars dataframes are cached, along with
+            the fitted local scalers. Calls with the same dataframes, columns and `local_scaler_type` load them
+            from the cache instead of processing the dataframes again.
+        dataset_cache_size : int (default=10 * 2**30)
+            Maximum size in bytes of the dataset cache, the least recently used datasets are removed to stay below it.
 
         Returns
         -------
@@ -229,10 +605,19 @@ class NeuralForecast:
         if local_scaler_type is not None and local_scaler_type not in _type2scaler:
             raise ValueError(f"scaler_type must be one of {_type2scaler.keys()}")
         self.local_scaler_type = local_scaler_type
+        if dataset_dtype not in (torch.float32, torch.float16, torch.bfloat16):
+            raise ValueError(
+                "dataset_dtype must be torch.float32, torch.float16 or torch.bfloat16"
+            )
+        self.dataset_dtype = dataset_dtype
+        self.dataset_cache_dir = dataset_cache_dir
+        self.dataset_cache_size = dataset_cache_size
         self.scalers_: Dict
+        self.models: List[Any]
 
         # Flags and attributes
         self._fitted = False
+        self._uids_index: Optional[Tuple[Series, pd.Index]] = None
         self._reset_models()
 
     def _scalers_fit_transform(self, dataset: TimeSeriesDataset) -> None:
@@ -246,24 +631,28 @@ class NeuralForecast:
             self.scalers_[col] = _type2scaler[self.local_scaler_type]().fit(ga)
             dataset.temporal[:, i] = torch.from_numpy(self.scalers_[col].transform(ga))
 
-    def _scalers_transform(self, dataset: TimeSeriesDataset) -> None:
+    def _scalers_transform(
+        self, dataset: TimeSeriesDataset, idxs: Optional[np.ndarray] = None
+    ) -> None:
         if not self.scalers_:
             return None
         for i, col in enumerate(dataset.temporal_cols):
             scaler = self.scalers_.get(col, None)
             if scaler is None:
                 continue
+            scaler = _take_scaler(scaler, idxs)
             ga = GroupedArray(dataset.temporal[:, i].numpy(), dataset.indptr)
             dataset.temporal[:, i] = torch.from_numpy(scaler.transform(ga))
 
     def _scalers_target_inverse_transform(
-        self, data: np.ndarray, indptr: np.ndarray
+        self, data: np.ndarray, indptr: np.ndarray, idxs: Optional[np.ndarray] = None
     ) -> np.ndarray:
         if not self.scalers_:
             return data
+        scaler = _take_scaler(self.scalers_[self.target_col], idxs)
         for i in range(data.shape[1]):
             ga = GroupedArray(data[:, i], indptr)
-            data[:, i] = self.scalers_[self.target_col].inverse_transform(ga)
+            data[:, i] = scaler.inverse_transform(ga)
         return data
 
     def _prepare_fit(
@@ -273,6 +662,23 @@ class NeuralForecast:
         self.id_col = id_col
         self.time_col = time_col
         self.target_col = target_col
+        if isinstance(df, MemmapTimeSeriesDataset):
+            return self._prepare_fit_memmap(df, static_df, predict_only)
+        if self.dataset_cache_dir is not None:
+            dataset, uids, last_dates, ds = self._process_df_cached(
+                df, static_df, sort_df, predict_only, id_col, time_col, target_col
+            )
+        else:
+            dataset, uids, last_dates, ds = self._process_df(
+                df, static_df, sort_df, predict_only, id_col, time_col, target_col
+            )
+        # scaling is done at full precision
+        dataset = dataset.astype(self.dataset_dtype)
+        return dataset, uids, last_dates, ds
+
+    def _process_df(
+        self, df, static_df, sort_df, predict_only, id_col, time_col, target_col
+    ):
         self._check_nan(df, static_df, id_col, time_col, target_col)
 
         dataset, uids, last_dates, ds = TimeSeriesDataset.from_df(
@@ -289,6 +695,57 @@ class NeuralForecast:
             self._scalers_fit_transform(dataset)
         return dataset, uids, last_dates, ds
 
+    def _process_df_cached(
+        self, df, static_df, sort_df, predict_only, id_col, time_col, target_col
+    ):
+        cache = _DatasetCache(self.dataset_cache_dir, self.dataset_cache_size)
+        # datasets for predictions are scaled with the fitted scalers
+        scalers_digest = (
+            hashlib.sha256(pickle.dumps(self.scalers_)).hexdigest()
+            if predict_only
+            else None
+        )
+        key = cache.key(
+            df,
+            static_df,
+            sort_df=sort_df,
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+            local_scaler_type=self.local_scaler_type,
+            scalers=scalers_digest,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            dataset, uids, last_dates, ds, scalers = cached
+            if not predict_only:
+                self.scalers_ = scalers
+            return dataset, uids, last_dates, ds
+        dataset, uids, last_dates, ds = self._process_df(
+            df, static_df, sort_df, predict_only, id_col, time_col, target_col
+        )
+        cache.put(key, dataset, uids, last_dates, ds, self.scalers_)
+        return dataset, uids, last_dates, ds
+
+    def _prepare_fit_memmap(self, dataset, static_df, predict_only):
+        if dataset.uids is None:
+            raise ValueError(
+                "The memory-mapped dataset must be created with `MemmapTimeSeriesDataset.from_chunks`."
+            )
+        if static_df is not None:
+            raise ValueError(
+                "`static_df` must be None when `df` is a memory-mapped dataset, "
+                "provide it to `MemmapTimeSeriesDataset.from_chunks` instead."
+            )
+        # scaling would read the whole dataset into memory
+        if self.local_scaler_type is not None:
+            raise ValueError(
+                "Historic scaling isn't supported for memory-mapped datasets."
+            )
+        if not predict_only:
+            self.scalers_ = {}
+        return dataset, dataset.uids, dataset.last_dates, dataset.ds
+
     def _check_nan(self, df, static_df, id_col, time_col, target_col):
         cols_with_nans = []
 
@@ -333,9 +790,10 @@ class NeuralForecast:
 
         Parameters
         ----------
-        df : pandas, polars or spark DataFrame, optional (default=None)
+        df : pandas, polars or spark DataFrame or MemmapTimeSeriesDataset, optional (default=None)
             DataFrame with columns [`unique_id`, `ds`, `y`] and exogenous variables.
             If None, a previously stored dataset is required.
+            A MemmapTimeSeriesDataset is read from disk as needed, it requires `local_scaler_type=None`.
         static_df : pandas, polars or spark DataFrame, optional (default=None)
             DataFrame with columns [`unique_id`] and static exogenous.
         val_size : int, optional (default=0)
@@ -370,8 +828,9 @@ class NeuralForecast:
             raise Exception("Set val_size>0 if early stopping is enabled.")
 
         # Process and save new dataset (in self)
-        if isinstance(df, (pd.DataFrame, pl_DataFrame)):
-            validate_freq(df[time_col], self.freq)
+        if isinstance(df, (pd.DataFrame, pl_DataFrame, MemmapTimeSeriesDataset)):
+            if not isinstance(df, MemmapTimeSeriesDataset):
+                validate_freq(df[time_col], self.freq)
             self.dataset, self.uids, self.last_dates, self.ds = self._prepare_fit(
                 df=df,
                 static_df=static_df,
@@ -433,7 +892,8 @@ class NeuralForecast:
                 print("Using stored dataset.")
         else:
             raise ValueError(
-                f"`df` must be a pandas, polars or spark DataFrame or `None`, got: {type(df)}"
+                "`df` must be a pandas, polars or spark DataFrame, a MemmapTimeSeriesDataset "
+                f"or `None`, got: {type(df)}"
             )
 
         if val_size is not None:
@@ -453,6 +913,97 @@ class NeuralForecast:
 
         self._fitted = True
 
+    def update(self, df: DataFrame) -> None:
+        """Update the stored dataset with new observations.
+
+        Only the rows of `df` are processed: they are validated, scaled with the fitted
+        local scalers and appended to the end of their series, so that `predict` and `fit`
+        without a `df` use them. Series without new observations are left unchanged.
+
+        Parameters
+        ----------
+        df : pandas or polars DataFrame
+            DataFrame with the columns used in `fit` and the observations that follow
+            the last stored timestamp of each serie.
+        """
+        if not isinstance(getattr(self, "dataset", None), TimeSeriesDataset):
+            raise Exception(
+                "You must have a stored dataset to update it, fit the models with a DataFrame first."
+            )
+        if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
+            raise ValueError(
+                f"`df` must be a pandas or polars DataFrame, got {type(df)}."
+            )
+        temporal_cols = self.dataset.temporal_cols
+        new_cols = set(df.columns) - {self.id_col, self.time_col}
+        if new_cols not in (
+            set(temporal_cols),
+            set(temporal_cols) - {"available_mask"},
+        ):
+            raise ValueError(
+                f"`df` must have the columns used in `fit`: {temporal_cols.tolist()}."
+            )
+        validate_freq(df[self.time_col], self.freq)
+        self._check_nan(df, None, self.id_col, self.time_col, self.target_col)
+
+        df = df[
+            [self.id_col, self.time_col]
+            + [col for col in temporal_cols if col in new_cols]
+        ]
+        new_dataset, uids, last_dates, ds = TimeSeriesDataset.from_df(
+            df=df,
+            sort_df=self.sort_df,
+            id_col=self.id_col,
+            time_col=self.time_col,
+            target_col=self.target_col,
+        )
+        if not new_dataset.temporal_cols.equals(temporal_cols):
+            raise ValueError(
+                f"`df` must have the columns used in `fit`: {temporal_cols.tolist()}."
+            )
+
+        # Position of the updated series in the stored dataset
+        idxs = pd.Index(self.uids.to_numpy()).get_indexer(uids.to_numpy())
+        if (idxs == -1).any():
+            raise ValueError("`df` contains series that are not in the stored dataset.")
+        first_dates = ds[new_dataset.indptr[:-1]]
+        if (first_dates <= self.last_dates.to_numpy()[idxs]).any():
+            raise ValueError(
+                "The observations of `df` must follow the last stored timestamp of each serie."
+            )
+
+        # Spread the new rows over all the stored series, in their order
+        order = np.argsort(idxs)
+        new_sizes = np.diff(new_dataset.indptr)
+        rows = _concat_ranges(new_dataset.indptr[:-1][order], new_sizes[order])
+        sizes = np.zeros(self.dataset.n_groups, dtype=np.int64)
+        sizes[idxs] = new_sizes
+        new_dataset = TimeSeriesDataset(
+            temporal=new_dataset.temporal[rows],
+            temporal_cols=temporal_cols,
+            indptr=np.append(0, sizes.cumsum()),
+            max_size=sizes.max(),
+            min_size=sizes.min(),
+            y_idx=self.dataset.y_idx,
+            sorted=self.sort_df,
+        )
+        self._scalers_transform(new_dataset)
+
+        curr_sizes = np.diff(self.dataset.indptr)
+        self.dataset = self.dataset.append(new_dataset)
+        updated_ds = np.empty(self.dataset.indptr[-1], dtype=self.ds.dtype)
+        updated_ds[_concat_ranges(self.dataset.indptr[:-1], curr_sizes)] = self.ds
+        updated_ds[_concat_ranges(self.dataset.indptr[:-1] + curr_sizes, sizes)] = ds[
+            rows
+        ]
+        self.ds = updated_ds
+        updated_last_dates = self.last_dates.to_numpy().copy()
+        updated_last_dates[idxs] = last_dates.to_numpy()
+        if isinstance(self.last_dates, pd.Index):
+            self.last_dates = pd.Index(updated_last_dates, name=self.time_col)
+        else:
+            self.last_dates = pl_Series(self.time_col, updated_last_dates)
+
     def make_future_dataframe(self, df: Optional[DataFrame] = None) -> DataFrame:
         """Create a dataframe with all ids and future times in the forecasting horizon.
 
@@ -508,6 +1059,21 @@ class NeuralForecast:
             chain.from_iterable(getattr(m, "futr_exog_list", []) for m in self.models)
         )
 
+    def _check_futr_exog(self, futr_df: Optional[DataFrame]) -> None:
+        needed_futr_exog = self._get_needed_futr_exog()
+        if needed_futr_exog:
+            if futr_df is None:
+                raise ValueError(
+                    f"Models require the following future exogenous features: {needed_futr_exog}. "
+                    "Please provide them through the `futr_df` argument."
+                )
+            else:
+                missing = needed_futr_exog - set(futr_df.columns)
+                if missing:
+                    raise ValueError(
+                        f"The following features are missing from `futr_df`: {missing}"
+                    )
+
     def _get_model_names(self) -> List[str]:
         names: List[str] = []
         count_names = {"model": 0}
@@ -527,6 +1093,10 @@ class NeuralForecast:
         sort_df: bool = True,
         verbose: bool = False,
         engine=None,
+        inference_engine: str = "lightning",
+        num_threads: Optional[int] = None,
+        ids: Optional[Sequence] = None,
+        cache: Optional[ForecastCache] = None,
         **data_kwargs,
     ):
         """Predict with core.NeuralForecast.
@@ -535,7 +1105,7 @@ class NeuralForecast:
 
         Parameters
         ----------
-        df : pandas, polars or spark DataFrame, optional (default=None)
+        df : pandas, polars or spark DataFrame or MemmapTimeSeriesDataset, optional (default=None)
             DataFrame with columns [`unique_id`, `ds`, `y`] and exogenous variables.
             If a DataFrame is passed, it is used to generate forecasts.
         static_df : pandas, polars or spark DataFrame, optional (default=None)
@@ -548,6 +1118,18 @@ class NeuralForecast:
             Print processing steps.
         engine : spark session
             Distributed engine for inference. Only used if df is a spark dataframe or if fit was called on a spark dataframe.
+        inference_engine : str (default='lightning')
+            Engine that runs the models' `predict_step`. 'lightning' uses PyTorch Lightning's `Trainer`,
+            'torch' a plain loop under `torch.inference_mode`, which avoids the trainer's fixed cost on small requests.
+        num_threads : int, optional (default=None)
+            Number of torch threads used by the models' prediction. Defaults to torch's current setting.
+        ids : sequence, optional (default=None)
+            Ids of the stored series to predict, they are returned in the order of the stored dataset.
+            Only these series are taken from it, so the cost scales with the number of requested ids.
+            Not supported by multivariate models, whose forecasts depend on all the series.
+        cache : ForecastCache, optional (default=None)
+            Cache of the forecasts of each serie. Only the series without a valid entry are predicted
+            by the models, multivariate models don't use it.
         data_kwargs : kwargs
             Extra arguments to be passed to the dataset within each model.
 
@@ -564,18 +1146,17 @@ class NeuralForecast:
             raise Exception("You must fit the model before predicting.")
 
         needed_futr_exog = self._get_needed_futr_exog()
-        if needed_futr_exog:
-            if futr_df is None:
-                raise ValueError(
-                    f"Models require the following future exogenous features: {needed_futr_exog}. "
-                    "Please provide them through the `futr_df` argument."
-                )
-            else:
-                missing = needed_futr_exog - set(futr_df.columns)
-                if missing:
-                    raise ValueError(
-                        f"The following features are missing from `futr_df`: {missing}"
-                    )
+        self._check_futr_exog(futr_df)
+        if ids is not None and (
+            df is not None or isinstance(self.dataset, _FilesDataset)
+        ):
+            raise ValueError(
+                "`ids` can only be used to predict the series of the stored dataset."
+            )
+        if ids is not None and self._has_multivariate_models():
+            raise ValueError(
+                "`ids` cannot be used with multivariate models, their forecasts depend on all the series."
+            )
 
         # distributed df or NeuralForecast instance was trained with a distributed input and no df is provided
         # we assume the user wants to perform distributed inference as well
@@ -692,9 +1273,62 @@ class NeuralForecast:
                 ),
             )
 
+        dataset, uids, last_dates = self._get_predict_dataset(
+            df, static_df, sort_df, verbose
+        )
+        series_idxs = None
+        if ids is not None:
+            series_idxs = np.unique(self._uids_positions(ids))
+            dataset = dataset.select(series_idxs)
+            uids = ufp.take_rows(uids, series_idxs)
+            last_dates = ufp.take_rows(last_dates, series_idxs)
+            if futr_df is not None:
+                futr_df = ufp.filter_with_mask(
+                    futr_df, ufp.is_in(futr_df[self.id_col], uids)
+                )
+        fcsts_df = self._predict_dataset(
+            dataset=dataset,
+            uids=uids,
+            last_dates=last_dates,
+            futr_df=futr_df,
+            stored=df is None,
+            series_idxs=series_idxs,
+            cache=cache,
+            inference_engine=inference_engine,
+            num_threads=num_threads,
+            **data_kwargs,
+        )
+        if isinstance(fcsts_df, pd.DataFrame) and _id_as_idx():
+            _warn_id_as_idx()
+            fcsts_df = fcsts_df.set_index(self.id_col)
+        return fcsts_df
+
+    def _has_multivariate_models(self) -> bool:
+        # auto models hold the fitted model in `model`
+        return any(
+            isinstance(getattr(model, "model", model), BaseMultivariate)
+            for model in self.models
+        )
+
+    def _uids_positions(self, ids) -> np.ndarray:
+        # The index over the stored ids is built once and reused while they don't change
+        uids_index = self._uids_index
+        if uids_index is None or uids_index[0] is not self.uids:
+            uids_index = self._uids_index = (self.uids, pd.Index(self.uids.to_numpy()))
+        ids = np.asarray(ids)
+        positions = uids_index[1].get_indexer(ids)
+        missing = ids[positions == -1]
+        if missing.size:
+            raise ValueError(
+                f"The following ids are not in the stored dataset: {reprlib.repr(missing.tolist())}"
+            )
+        return positions
+
+    def _get_predict_dataset(self, df, static_df, sort_df, verbose):
         # Process new dataset but does not store it.
         if df is not None:
-            validate_freq(df[self.time_col], self.freq)
+            if not isinstance(df, MemmapTimeSeriesDataset):
+                validate_freq(df[self.time_col], self.freq)
             dataset, uids, last_dates, _ = self._prepare_fit(
                 df=df,
                 static_df=static_df,
@@ -710,6 +1344,31 @@ class NeuralForecast:
             last_dates = self.last_dates
             if verbose:
                 print("Using stored dataset.")
+        return dataset, uids, last_dates
+
+    def _predict_dataset(
+        self,
+        dataset: TimeSeriesDataset,
+        uids: Series,
+        last_dates: Series,
+        futr_df: Optional[DataFrame],
+        stored: bool,
+        series_idxs: Optional[np.ndarray] = None,
+        cache: Optional[ForecastCache] = None,
+        inference_engine: str = "lightning",
+        num_threads: Optional[int] = None,
+        **data_kwargs,
+    ) -> DataFrame:
+        # Forecasts of the series in `dataset`, which are the ones at positions `series_idxs`
+        # of the fitted scalers (all of them by default)
+        # Keep only the history that the models look at, when none of them needs all of it
+        if cache is None:
+            tail_sizes = [model.get_predict_tail_size(dataset) for model in self.models]
+        else:
+            # the keys of the cache hold the observations of the fixed input windows
+            tail_sizes = [model.get_predict_input_size() for model in self.models]
+        if None not in tail_sizes:
+            dataset = dataset.tail(max(tail_sizes))
 
         cols = self._get_model_names()
 
@@ -724,13 +1383,14 @@ class NeuralForecast:
         )
 
         # Update and define new forecasting dataset
+        needed_futr_exog = self._get_needed_futr_exog()
         if futr_df is None:
             futr_df = fcsts_df
         else:
             futr_orig_rows = futr_df.shape[0]
             futr_df = ufp.join(futr_df, fcsts_df, on=[self.id_col, self.time_col])
             if futr_df.shape[0] < fcsts_df.shape[0]:
-                if df is None:
+                if stored:
                     expected_cmd = "make_future_dataframe()"
                     missing_cmd = "get_missing_future(futr_df)"
                 else:
@@ -752,7 +1412,7 @@ class NeuralForecast:
             time_col=self.time_col,
             target_col=self.target_col,
         )
-        self._scalers_transform(futr_dataset)
+        self._scalers_transform(futr_dataset, series_idxs)
         dataset = dataset.append(futr_dataset)
 
         col_idx = 0
@@ -762,7 +1422,17 @@ class NeuralForecast:
         for model in self.models:
             old_test_size = model.get_test_size()
             model.set_test_size(self.h)  # To predict h steps ahead
-            model_fcsts = model.predict(dataset=dataset, **data_kwargs)
+            predict_kwargs = dict(
+                inference_engine=inference_engine,
+                num_threads=num_threads,
+                **data_kwargs,
+            )
+            if cache is None or isinstance(model, BaseMultivariate):
+                model_fcsts = model.predict(dataset=dataset, **predict_kwargs)
+            else:
+                model_fcsts = self._cached_model_predict(
+                    model, dataset, uids, cache, **predict_kwargs
+                )
             # Append predictions in memory placeholder
             output_length = len(model.loss.output_names)
             fcsts[:, col_idx : col_idx + output_length] = model_fcsts
@@ -770,18 +1440,163 @@ class NeuralForecast:
             model.set_test_size(old_test_size)  # Set back to original value
         if self.scalers_:
             indptr = np.append(0, np.full(len(uids), self.h).cumsum())
-            fcsts = self._scalers_target_inverse_transform(fcsts, indptr)
+            fcsts = self._scalers_target_inverse_transform(fcsts, indptr, series_idxs)
 
         # Declare predictions pd.DataFrame
         if isinstance(fcsts_df, pl_DataFrame):
             fcsts = pl_DataFrame(dict(zip(cols, fcsts.T)))
         else:
             fcsts = pd.DataFrame(fcsts, columns=cols)
-        fcsts_df = ufp.horizontal_concat([fcsts_df, fcsts])
-        if isinstance(fcsts_df, pd.DataFrame) and _id_as_idx():
-            _warn_id_as_idx()
-            fcsts_df = fcsts_df.set_index(self.id_col)
-        return fcsts_df
+        return ufp.horizontal_concat([fcsts_df, fcsts])
+
+    def _cached_model_predict(self, model, dataset, uids, cache, **predict_kwargs):
+        # Forecasts of the series with a valid cache entry are reused, the rest are predicted together
+        inner_model = model.model if isinstance(model, BaseAuto) else model
+        keys = ForecastCache.series_keys(
+            model_id=ForecastCache.model_id(inner_model),
+            dataset=dataset,
+            uids=uids,
+            h=self.h,
+            input_size=model.get_predict_input_size(),
+        )
+        fcsts = np.empty(
+            (len(keys), self.h, len(model.loss.output_names)), dtype=np.float32
+        )
+        misses = []
+        for i, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is None:
+                misses.append(i)
+            else:
+                fcsts[i] = cached
+        if misses:
+            misses = np.array(misses)
+            missed_fcsts = model.predict(
+                dataset=dataset.select(misses), **predict_kwargs
+            )
+            fcsts[misses] = missed_fcsts.reshape(len(misses), self.h, -1)
+            for i in misses:
+                cache.put(keys[i], fcsts[i])
+        return fcsts.reshape(-1, fcsts.shape[-1])
+
+    def predict_to_parquet(
+        self,
+        path: str,
+        df: Optional[DataFrame] = None,
+        static_df: Optional[DataFrame] = None,
+        futr_df: Optional[DataFrame] = None,
+        shard_size: int = 100_000,
+        sort_df: bool = True,
+        verbose: bool = False,
+        inference_engine: str = "lightning",
+        num_threads: Optional[int] = None,
+        **data_kwargs,
+    ) -> None:
+        """Predict with core.NeuralForecast and write the forecasts to a parquet file.
+
+        The series are processed in shards of `shard_size`: each shard is extended with its future values,
+        predicted, inverse scaled and written as a row group of `path` before the next one starts,
+        so the memory used by the forecasts depends on `shard_size` instead of the number of series.
+
+        Parameters
+        ----------
+        path : str
+            Parquet file where the forecasts are written, it has the columns returned by `predict`.
+        df : pandas or polars DataFrame or MemmapTimeSeriesDataset, optional (default=None)
+            DataFrame with columns [`unique_id`, `ds`, `y`] and exogenous variables.
+            If a DataFrame is passed, it is used to generate forecasts.
+        static_df : pandas or polars DataFrame, optional (default=None)
+            DataFrame with columns [`unique_id`] and static exogenous.
+        futr_df : pandas or polars DataFrame, optional (default=None)
+            DataFrame with [`unique_id`, `ds`] columns and `df`'s future exogenous.
+        shard_size : int (default=100_000)
+            Number of series predicted and written at a time.
+            Multivariate models forecast from all the series, so with them every serie is predicted in one shard.
+        sort_df : bool (default=True)
+            Sort `df` before fitting.
+        verbose : bool (default=False)
+            Print processing steps.
+        inference_engine : str (default='lightning')
+            Engine that runs the models' `predict_step`, see `predict`.
+        num_threads : int, optional (default=None)
+            Number of torch threads used by the models' prediction. Defaults to torch's current setting.
+        data_kwargs : kwargs
+            Extra arguments to be passed to the dataset within each model.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Please install `pyarrow` to use `predict_to_parquet`")
+        if (df is None) and not (hasattr(self, "dataset")):
+            raise Exception("You must pass a DataFrame or have one stored.")
+        if not self._fitted:
+            raise Exception("You must fit the model before predicting.")
+        if isinstance(df, SparkDataFrame) or (
+            df is None and isinstance(self.dataset, _FilesDataset)
+        ):
+            raise ValueError(
+                "`predict_to_parquet` does not support distributed inputs, use `predict` instead."
+            )
+        if shard_size < 1:
+            raise ValueError("shard_size must be a positive integer.")
+        self._check_futr_exog(futr_df)
+
+        dataset, uids, last_dates = self._get_predict_dataset(
+            df, static_df, sort_df, verbose
+        )
+        if self._has_multivariate_models():
+            shard_size = dataset.n_groups
+        if futr_df is not None:
+            # The rows of futr_df are grouped by serie once, so that each shard takes a slice of them.
+            # Rows of series that are not predicted are dropped.
+            futr_codes = pd.Index(uids.to_numpy()).get_indexer(
+                futr_df[self.id_col].to_numpy()
+            )
+            futr_rows = np.argsort(futr_codes, kind="stable")
+            futr_rows = futr_rows[futr_codes[futr_rows] >= 0]
+            futr_indptr = np.append(
+                0,
+                np.bincount(
+                    futr_codes[futr_codes >= 0], minlength=dataset.n_groups
+                ).cumsum(),
+            )
+        writer = None
+        try:
+            for start in range(0, dataset.n_groups, shard_size):
+                idxs = np.arange(start, min(start + shard_size, dataset.n_groups))
+                shard_uids = ufp.take_rows(uids, idxs)
+                shard_futr_df = futr_df
+                if futr_df is not None:
+                    shard_rows = futr_rows[
+                        futr_indptr[idxs[0]] : futr_indptr[idxs[-1] + 1]
+                    ]
+                    shard_futr_df = ufp.take_rows(futr_df, shard_rows)
+                fcsts_df = self._predict_dataset(
+                    dataset=dataset.select(idxs),
+                    uids=shard_uids,
+                    last_dates=ufp.take_rows(last_dates, idxs),
+                    futr_df=shard_futr_df,
+                    stored=df is None,
+                    series_idxs=idxs,
+                    inference_engine=inference_engine,
+                    num_threads=num_threads,
+                    **data_kwargs,
+                )
+                if isinstance(fcsts_df, pl_DataFrame):
+                    table = fcsts_df.to_arrow()
+                else:
+                    table = pa.Table.from_pandas(fcsts_df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                if verbose:
+                    print(
+                        f"Wrote forecasts of {idxs[-1] + 1:,}/{dataset.n_groups:,} series."
+                    )
+        finally:
+            if writer is not None:
+                writer.close()
 
     def _reset_models(self):
         self.models = [deepcopy(model) for model in self.models_init]
@@ -801,14 +1616,19 @@ class NeuralForecast:
         id_col: str,
         time_col: str,
         target_col: str,
+        refit: Union[bool, int] = False,
+        warm_start_steps: Optional[int] = None,
         **data_kwargs,
     ) -> DataFrame:
+        # Fits once on the stored dataset, or warm-starts a refit every `refit` windows.
+        # Each fit excludes the windows that follow it through its `test_size`.
         if (df is None) and not (hasattr(self, "dataset")):
             raise Exception("You must pass a DataFrame or have one stored.")
 
         # Process and save new dataset (in self)
         if df is not None:
-            validate_freq(df[time_col], self.freq)
+            if not isinstance(df, MemmapTimeSeriesDataset):
+                validate_freq(df[time_col], self.freq)
             self.dataset, self.uids, self.last_dates, self.ds = self._prepare_fit(
                 df=df,
                 static_df=static_df,
@@ -851,23 +1671,60 @@ class NeuralForecast:
         # the cv_times is sorted by window and then id
         fcsts_df = ufp.sort(fcsts_df, [id_col, "cutoff", time_col])
 
-        col_idx = 0
-        fcsts = np.full(
-            (self.dataset.n_groups * self.h * n_windows, len(cols)),
-            np.nan,
-            dtype=np.float32,
-        )
-
-        for model in self.models:
-            model.fit(dataset=self.dataset, val_size=val_size, test_size=test_size)
-            model_fcsts = model.predict(
-                self.dataset, step_size=step_size, **data_kwargs
+        # Placeholder for the forecasts of each model [n_series, n_windows, h, output]
+        models_fcsts = [
+            np.full(
+                (
+                    self.dataset.n_groups,
+                    n_windows,
+                    self.h,
+                    len(model.loss.output_names),
+                ),
+                np.nan,
+                dtype=np.float32,
             )
-
-            # Append predictions in memory placeholder
-            output_length = len(model.loss.output_names)
-            fcsts[:, col_idx : (col_idx + output_length)] = model_fcsts
-            col_idx += output_length
+            for model in self.models
+        ]
+        refit_windows = int(refit) if refit else n_windows
+        if warm_start_steps is not None:
+            for model in self.models:
+                if not isinstance(model, BaseModel):
+                    raise ValueError(f"{model} does not support warm starts.")
+                model._warm_start = dict(
+                    max_steps=None, optimizer=None, lr_scheduler=None
+                )
+        try:
+            for first_window in range(0, n_windows, refit_windows):
+                last_window = min(first_window + refit_windows, n_windows)
+                for model, model_fcsts in zip(self.models, models_fcsts):
+                    model.fit(
+                        dataset=self.dataset,
+                        val_size=val_size,
+                        test_size=test_size - first_window * step_size,
+                    )
+                    # The forecasts start at `first_window`, the refit takes over after `last_window`
+                    window_fcsts = model.predict(
+                        self.dataset, step_size=step_size, **data_kwargs
+                    )
+                    window_fcsts = window_fcsts.reshape(
+                        self.dataset.n_groups, n_windows - first_window, self.h, -1
+                    )
+                    model_fcsts[:, first_window:last_window] = window_fcsts[
+                        :, : (last_window - first_window)
+                    ]
+                    if warm_start_steps is not None:
+                        model._warm_start["max_steps"] = warm_start_steps
+        finally:
+            if warm_start_steps is not None:
+                for model in self.models:
+                    model._warm_start = None
+        fcsts = np.concatenate(
+            [
+                model_fcsts.reshape(-1, model_fcsts.shape[-1])
+                for model_fcsts in models_fcsts
+            ],
+            axis=1,
+        )
         if self.scalers_:
             indptr = np.append(
                 0, np.full(self.dataset.n_groups, self.h * n_windows).cumsum()
@@ -884,9 +1741,13 @@ class NeuralForecast:
         fcsts_df = ufp.horizontal_concat([fcsts_df, fcsts])
 
         # Add original input df's y to forecasts DataFrame
+        if (df is None) or isinstance(df, MemmapTimeSeriesDataset):
+            y_df = self._stored_test_target(test_size)
+        else:
+            y_df = df[[id_col, time_col, target_col]]
         fcsts_df = ufp.join(
             fcsts_df,
-            df[[id_col, time_col, target_col]],
+            y_df,
             how="left",
             on=[id_col, time_col],
         )
@@ -895,6 +1756,25 @@ class NeuralForecast:
             fcsts_df = fcsts_df.set_index(id_col)
         return fcsts_df
 
+    def _stored_test_target(self, test_size: int) -> DataFrame:
+        # target of the last test_size rows of each serie, only these are read from disk for memory-mapped datasets
+        sizes = np.diff(self.dataset.indptr)
+        test_sizes = np.minimum(sizes, test_size)
+        rows = _concat_ranges(self.dataset.indptr[1:] - test_sizes, test_sizes)
+        y = self.dataset.temporal[rows, self.dataset.y_idx].to(torch.float32).numpy()
+        # the stored dataset holds the scaled target
+        y = self._scalers_target_inverse_transform(
+            y[:, None], np.append(0, test_sizes.cumsum())
+        )[:, 0]
+        y_df = {
+            self.id_col: ufp.repeat(self.uids, test_sizes),
+            self.time_col: self.ds[rows],
+            self.target_col: y,
+        }
+        if isinstance(self.uids, pl_Series):
+            return pl_DataFrame(y_df)
+        return pd.DataFrame(y_df)
+
     def cross_validation(
         self,
         df: Optional[DataFrame] = None,
@@ -910,6 +1790,7 @@ class NeuralForecast:
         id_col: str = "unique_id",
         time_col: str = "ds",
         target_col: str = "y",
+        warm_start_steps: Optional[int] = None,
         **data_kwargs,
     ) -> DataFrame:
         """Temporal Cross-Validation with core.NeuralForecast.
@@ -919,9 +1800,10 @@ class NeuralForecast:
 
         Parameters
         ----------
-        df : pandas or polars DataFrame, optional (default=None)
+        df : pandas or polars DataFrame or MemmapTimeSeriesDataset, optional (default=None)
             DataFrame with columns [`unique_id`, `ds`, `y`] and exogenous variables.
             If None, a previously stored dataset is required.
+            A MemmapTimeSeriesDataset is only supported with `refit=False` or `warm_start_steps`.
         static_df : pandas or polars DataFrame, optional (default=None)
             DataFrame with columns [`unique_id`] and static exogenous.
         n_windows : int (default=1)
@@ -948,6 +1830,10 @@ class NeuralForecast:
             Column that identifies each timestep, its values can be timestamps or integers.
         target_col : str (default='y')
             Column that contains the target.
+        warm_start_steps : int, optional (default=None)
+            With `refit`, the refits after the first window continue from the previous weights and optimizer state
+            for `warm_start_steps` steps instead of a full `max_steps` training, on the single dataset built from `df`.
+            It requires `local_scaler_type=None`.
         data_kwargs : kwargs
             Extra arguments to be passed to the dataset within each model.
 
@@ -977,7 +1863,14 @@ class NeuralForecast:
                 FutureWarning,
             )
             df = df.reset_index(id_col)
-        if not refit:
+        if warm_start_steps is not None:
+            if not refit:
+                raise ValueError("`warm_start_steps` requires `refit`.")
+            if self.local_scaler_type is not None:
+                raise ValueError(
+                    "`warm_start_steps` is not supported with `local_scaler_type`."
+                )
+        if (not refit) or (warm_start_steps is not None):
             return self._no_refit_cross_validation(
                 df=df,
                 static_df=static_df,
@@ -990,10 +1883,16 @@ class NeuralForecast:
                 id_col=id_col,
                 time_col=time_col,
                 target_col=target_col,
+                refit=refit,
+                warm_start_steps=warm_start_steps,
                 **data_kwargs,
             )
         if df is None:
             raise ValueError("Must specify `df` with `refit!=False`.")
+        if isinstance(df, MemmapTimeSeriesDataset):
+            raise ValueError(
+                "Memory-mapped datasets are only supported with `refit=False`."
+            )
         validate_freq(df[time_col], self.freq)
         splits = ufp.backtest_splits(
             df,
@@ -1105,14 +2004,9 @@ class NeuralForecast:
             trimmed_dataset = TimeSeriesDataset.trim_dataset(
                 dataset=self.dataset, right_trim=test_size, left_trim=forefront_offset
             )
-            new_idxs = np.hstack(
-                [
-                    np.arange(
-                        self.dataset.indptr[i] + forefront_offset,
-                        self.dataset.indptr[i + 1] - test_size,
-                    )
-                    for i in range(self.dataset.n_groups)
-                ]
+            new_idxs = _concat_ranges(
+                self.dataset.indptr[:-1] + forefront_offset,
+                np.diff(self.dataset.indptr) - forefront_offset - test_size,
             )
             times = self.ds[new_idxs]
         else:
@@ -1150,7 +2044,7 @@ class NeuralForecast:
         original_y = {
             self.id_col: ufp.repeat(self.uids, np.diff(self.dataset.indptr)),
             self.time_col: self.ds,
-            self.target_col: self.dataset.temporal[:, 0].numpy(),
+            self.target_col: self.dataset.temporal[:, 0].float().numpy(),
         }
 
         # Add predictions to forecasts DataFrame
@@ -1183,6 +2077,7 @@ class NeuralForecast:
         model_index: Optional[List] = None,
         save_dataset: bool = True,
         overwrite: bool = False,
+        format: str = "pickle",
     ):
         """Save NeuralForecast core class.
 
@@ -1200,7 +2095,15 @@ class NeuralForecast:
             Whether to save dataset or not.
         overwrite : bool (default=False)
             Whether to overwrite files or not.
+        format : str (default='pickle')
+            'pickle' stores the models as checkpoints and pickles the dataset and configuration.
+            'columnar' writes a versioned directory with the configuration as JSON, the weights in the
+            safetensors layout and the dataset as raw arrays, which `NeuralForecast.load(lazy=True)`
+            memory-maps. It requires a local path.
         """
+        if format not in ("pickle", "columnar"):
+            raise ValueError(f"format must be 'pickle' or 'columnar', got {format!r}.")
+
         # Standarize path without '/'
         if path[-1] == "/":
             path = path[:-1]
@@ -1210,6 +2113,8 @@ class NeuralForecast:
             model_index = list(range(len(self.models)))
 
         fs, _, _ = fsspec.get_fs_token_paths(path)
+        if format == "columnar" and not isinstance(fs, LocalFileSystem):
+            raise ValueError("The columnar format can only be saved to a local path.")
         if not fs.exists(path):
             fs.makedirs(path)
         else:
@@ -1226,6 +2131,12 @@ class NeuralForecast:
                     fs.rm(path, recursive=True)
                     fs.mkdir(path)
 
+        if format == "columnar":
+            self._save_columnar(
+                path, model_index=model_index, save_dataset=save_dataset
+            )
+            return
+
         # Save models
         count_names = {"model": 0}
         alias_to_model = {}
@@ -1250,8 +2161,12 @@ class NeuralForecast:
                     "You can set `save_dataset=False` and use the `df` argument in the predict method after loading "
                     "this model to use it for inference."
                 )
+            dataset = self.dataset
+            if isinstance(dataset, MemmapTimeSeriesDataset):
+                # its pickles only hold the location of its files, which can be temporary
+                dataset = dataset.to_memory()
             with fsspec.open(f"{path}/dataset.pkl", "wb") as f:
-                pickle.dump(self.dataset, f)
+                pickle.dump(dataset, f)
         elif save_dataset:
             raise Exception(
                 "You need to have a stored dataset to save it, \
@@ -1265,6 +2180,7 @@ class NeuralForecast:
             "sort_df": self.sort_df,
             "_fitted": self._fitted,
             "local_scaler_type": self.local_scaler_type,
+            "dataset_dtype": self.dataset_dtype,
             "scalers_": self.scalers_,
             "id_col": self.id_col,
             "time_col": self.time_col,
@@ -1282,8 +2198,143 @@ class NeuralForecast:
         with fsspec.open(f"{path}/configuration.pkl", "wb") as f:
             pickle.dump(config_dict, f)
 
+    def _save_columnar(self, path: str, model_index: List[int], save_dataset: bool):
+        # layout (format_version 1):
+        #   neuralforecast.json: configuration, models and scaled columns
+        #   models/{file}.safetensors, models/{file}.hparams.pkl: weights and init arguments
+        #   scalers/{i}.npy: statistics of the local scaler of each column
+        #   dataset/: files of a MemmapTimeSeriesDataset, with the ids and times
+        if save_dataset and not hasattr(self, "dataset"):
+            raise Exception(
+                "You need to have a stored dataset to save it, \
+                             set `save_dataset=False` to skip saving dataset."
+            )
+        if save_dataset and isinstance(self.dataset, _FilesDataset):
+            raise ValueError(
+                "Cannot save distributed dataset.\n"
+                "You can set `save_dataset=False` and use the `df` argument in the predict method after loading "
+                "this model to use it for inference."
+            )
+        os.makedirs(f"{path}/models", exist_ok=True)
+        models = []
+        count_names: Dict[str, int] = {}
+        for i, model in enumerate(self.models):
+            if i not in model_index:
+                continue
+            model_name = repr(model)
+            count_names[model_name] = count_names.get(model_name, -1) + 1
+            file = f"{model_name}_{count_names[model_name]}"
+            # auto models and HINT store their underlying model, as in `save`
+            base_model = model if isinstance(model, BaseModel) else model.model
+            _save_safetensors(
+                base_model.state_dict(), f"{path}/models/{file}.safetensors"
+            )
+            with open(f"{path}/models/{file}.hparams.pkl", "wb") as f:
+                pickle.dump(base_model.hparams, f)
+            models.append(
+                {
+                    "file": file,
+                    "alias": model_name,
+                    "class": model.__class__.__name__.lower(),
+                }
+            )
+
+        os.makedirs(f"{path}/scalers", exist_ok=True)
+        for i, scaler in enumerate(self.scalers_.values()):
+            np.save(f"{path}/scalers/{i}.npy", scaler.stats_)
+
+        has_dataset = save_dataset and self.dataset is not None
+        if has_dataset:
+            MemmapTimeSeriesDataset.write(
+                self.dataset,
+                f"{path}/dataset",
+                uids=self.uids,
+                last_dates=self.last_dates,
+                ds=self.ds,
+            )
+        freq = getattr(self.freq, "freqstr", self.freq)
+        meta = {
+            "format_version": _COLUMNAR_FORMAT_VERSION,
+            "h": self.h,
+            "freq": freq,
+            "sort_df": self.sort_df,
+            "_fitted": self._fitted,
+            "local_scaler_type": self.local_scaler_type,
+            "dataset_dtype": str(self.dataset_dtype).replace("torch.", ""),
+            "id_col": self.id_col,
+            "time_col": self.time_col,
+            "target_col": self.target_col,
+            "models": models,
+            "scalers": list(self.scalers_),
+            "dataset": has_dataset,
+        }
+        with open(f"{path}/neuralforecast.json", "w") as f:
+            json.dump(meta, f, indent=2)
+
+    @staticmethod
+    def _load_columnar(path: str, verbose: bool, lazy: bool) -> "NeuralForecast":
+        with open(f"{path}/neuralforecast.json", "r") as f:
+            meta = json.load(f)
+        if meta["format_version"] > _COLUMNAR_FORMAT_VERSION:
+            raise ValueError(
+                f"The model was saved with format version {meta['format_version']}, "
+                f"this version of neuralforecast can load up to version {_COLUMNAR_FORMAT_VERSION}."
+            )
+
+        if verbose:
+            print(10 * "-" + " Loading models " + 10 * "-")
+        models = []
+        for info in meta["models"]:
+            with open(f"{path}/models/{info['file']}.hparams.pkl", "rb") as f:
+                hparams = pickle.load(f)
+            with _disable_torch_init():
+                model = MODEL_FILENAME_DICT[info["class"]](**hparams)
+            state_dict = _load_safetensors(
+                f"{path}/models/{info['file']}.safetensors", mmap=lazy
+            )
+            model.load_state_dict(state_dict, strict=True, assign=True)
+            model.alias = info["alias"]
+            models.append(model)
+            if verbose:
+                print(f"Model {info['alias']} loaded.")
+
+        neuralforecast = NeuralForecast(
+            models=models,
+            freq=meta["freq"],
+            local_scaler_type=meta["local_scaler_type"],
+            dataset_dtype=getattr(torch, meta["dataset_dtype"]),
+        )
+        for attr in ["id_col", "time_col", "target_col"]:
+            setattr(neuralforecast, attr, meta[attr])
+
+        if verbose:
+            print(10 * "-" + " Loading dataset " + 10 * "-")
+        if meta["dataset"]:
+            dataset = MemmapTimeSeriesDataset(f"{path}/dataset")
+            neuralforecast.uids = dataset.uids
+            neuralforecast.last_dates = dataset.last_dates
+            neuralforecast.ds = dataset.ds
+            neuralforecast.dataset = dataset
+            if not lazy:
+                # the arrays are read into memory and the files are no longer used
+                neuralforecast.ds = np.array(dataset.ds)
+                neuralforecast.dataset = dataset.to_memory()
+            neuralforecast.sort_df = meta["sort_df"]
+            if verbose:
+                print("Dataset loaded.")
+        elif verbose:
+            print("No dataset found in directory.")
+
+        neuralforecast._fitted = meta["_fitted"]
+        neuralforecast.scalers_ = {}
+        for i, col in enumerate(meta["scalers"]):
+            scaler = _type2scaler[meta["local_scaler_type"]]()
+            scaler.stats_ = np.load(f"{path}/scalers/{i}.npy")
+            neuralforecast.scalers_[col] = scaler
+        return neuralforecast
+
     @staticmethod
-    def load(path, verbose=False, **kwargs):
+    def load(path, verbose=False, lazy=False, **kwargs):
         """Load NeuralForecast
 
         `core.NeuralForecast`'s method to load checkpoint from path.
@@ -1292,6 +2343,11 @@ class NeuralForecast:
         -----------
         path : str
             Directory with stored artifacts.
+        verbose : bool (default=False)
+            Print the loading progress.
+        lazy : bool (default=False)
+            Only for directories saved with `format='columnar'`. Memory-map the weights and the dataset
+            instead of reading them, so that they're read from disk as they're used.
         kwargs
             Additional keyword arguments to be passed to the function
             `load_from_checkpoint`.
@@ -1306,6 +2362,12 @@ class NeuralForecast:
             path = path[:-1]
 
         fs, _, _ = fsspec.get_fs_token_paths(path)
+        if fs.exists(f"{path}/neuralforecast.json"):
+            return NeuralForecast._load_columnar(path, verbose=verbose, lazy=lazy)
+        if lazy:
+            raise ValueError(
+                "`lazy=True` requires a directory saved with `format='columnar'`."
+            )
         files = [f.split("/")[-1] for f in fs.ls(path) if fs.isfile(f)]
 
         # Load models
@@ -1361,6 +2423,7 @@ class NeuralForecast:
             models=models,
             freq=config_dict["freq"],
             local_scaler_type=config_dict["local_scaler_type"],
+            dataset_dtype=config_dict.get("dataset_dtype", torch.float32),
         )
 
         for attr in ["id_col", "time_col", "target_col"]:
@@ -466,6 +466,10 @@ class DilatedRNN(BaseRecurrent):
             if layer_num > 0:
                 output += residual
             encoder_input = output
+        encoder_input = self._select_cutoffs(
+            encoder_input
+        )  # [B, n_cutoffs, encoder_hidden_size]
+        seq_len = encoder_input.shape[1]
 
         if self.futr_exog_size > 0:
             futr_exog = futr_exog.permute(0, 2, 3, 1)[
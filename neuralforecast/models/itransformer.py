@@ -133,6 +133,7 @@ class iTransformer(BaseMultivariate):
 
     # Class attributes
     SAMPLING_TYPE = "multivariate"
+    SERIES_BATCHING = True
 
     def __init__(
         self,
@@ -186,9 +186,11 @@ class LSTM(BaseRecurrent):
             encoder_input = torch.cat((encoder_input, stat_exog), dim=2)
 
         # RNN forward
-        hidden_state, _ = self.hist_encoder(
-            encoder_input
-        )  # [B, seq_len, rnn_hidden_state]
+        hidden_state = self._encode(encoder_input)  # [B, seq_len, rnn_hidden_state]
+        hidden_state = self._select_cutoffs(
+            hidden_state
+        )  # [B, n_cutoffs, rnn_hidden_state]
+        seq_len = hidden_state.shape[1]
 
         if self.futr_exog_size > 0:
             futr_exog = futr_exog.permute(0, 2, 3, 1)[
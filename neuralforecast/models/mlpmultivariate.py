@@ -6,6 +6,7 @@ __all__ = ['MLPMultivariate']
 # %% ../../nbs/models.mlpmultivariate.ipynb 5
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
 from ..losses.pytorch import MAE
 from ..common._base_multivariate import BaseMultivariate
@@ -50,6 +51,7 @@ class MLPMultivariate(BaseMultivariate):
 
     # Class attributes
     SAMPLING_TYPE = "multivariate"
+    SERIES_BATCHING = True
 
     def __init__(
         self,
@@ -134,6 +136,30 @@ class MLPMultivariate(BaseMultivariate):
             out_features=h * self.loss.outputsize_multiplier * n_series,
         )
 
+    def _series_weights(self, series_idx):
+        # First layer columns and output layer rows of the series in series_idx
+        first_weight = self.mlp[0].weight  # [hidden_size, n_series * n_features]
+        n_temporal = first_weight.shape[1] - self.n_series * self.stat_input_size
+        temporal_weight = first_weight[:, :n_temporal].view(
+            self.hidden_size, -1, self.n_series
+        )[:, :, series_idx]
+        stat_weight = first_weight[:, n_temporal:].view(
+            self.hidden_size, self.n_series, -1
+        )[:, series_idx]
+        first_weight = torch.cat(
+            (temporal_weight.flatten(1), stat_weight.flatten(1)), dim=1
+        )
+
+        out_weight = self.out.weight.view(self.h, -1, self.n_series, self.hidden_size)[
+            :, :, series_idx
+        ]
+        out_bias = self.out.bias.view(self.h, -1, self.n_series)[:, :, series_idx]
+        return (
+            first_weight,
+            out_weight.reshape(-1, self.hidden_size),
+            out_bias.flatten(),
+        )
+
     def forward(self, windows_batch):
 
         # Parse windows_batch
@@ -143,6 +169,9 @@ class MLPMultivariate(BaseMultivariate):
         hist_exog = windows_batch["hist_exog"]  #   [B, hist_exog_size (X), L, N]
         futr_exog = windows_batch["futr_exog"]  #   [B, futr_exog_size (F), L + h, N]
         stat_exog = windows_batch["stat_exog"]  #   [N, stat_exog_size (S)]
+        series_idx = windows_batch.get(
+            "series_idx", None
+        )  #   subset of the series, see `series_batch_size`
 
         # Flatten MLP inputs [B, C, L+H, N] -> [B, C * (L+H) * N]
         # Contatenate [ Y^1_t, ..., Y^N_t | X^1_{t-L},..., X^1_{t}, ..., X^N_{t} | F^1_{t-L},..., F^1_{t+H}, ...., F^N_{t+H} | S^1, ..., S^N ]
@@ -157,9 +186,16 @@ class MLPMultivariate(BaseMultivariate):
         if self.stat_input_size > 0:
             x = torch.cat((x, stat_exog.reshape(batch_size, -1)), dim=1)
 
-        for layer in self.mlp:
-            x = torch.relu(layer(x))
-        x = self.out(x)
+        if series_idx is None:
+            for layer in self.mlp:
+                x = torch.relu(layer(x))
+            x = self.out(x)
+        else:
+            first_weight, out_weight, out_bias = self._series_weights(series_idx)
+            x = torch.relu(F.linear(x, first_weight, self.mlp[0].bias))
+            for layer in self.mlp[1:]:
+                x = torch.relu(layer(x))
+            x = F.linear(x, out_weight, out_bias)
 
         x = x.reshape(batch_size, self.h, -1)
         forecast = self.loss.domain_map(x)
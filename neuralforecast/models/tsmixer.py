@@ -12,6 +12,27 @@ from ..losses.pytorch import MAE
 from ..common._base_multivariate import BaseMultivariate
 
 # %% ../../nbs/models.tsmixer.ipynb 8
+def _batch_norm_subset(norm, x, idx):
+    # BatchNorm1d restricted to the features in idx, only their running statistics are updated
+    running_mean = norm.running_mean[idx]
+    running_var = norm.running_var[idx]
+    x = F.batch_norm(
+        x,
+        running_mean,
+        running_var,
+        weight=norm.weight[idx],
+        bias=norm.bias[idx],
+        training=norm.training,
+        momentum=norm.momentum,
+        eps=norm.eps,
+    )
+    if norm.training:
+        norm.running_mean[idx] = running_mean
+        norm.running_var[idx] = running_var
+        norm.num_batches_tracked.add_(1)
+    return x
+
+
 class TemporalMixing(nn.Module):
     def __init__(self, n_series, input_size, dropout):
         super().__init__()
@@ -21,7 +42,7 @@ class TemporalMixing(nn.Module):
         self.temporal_lin = nn.Linear(input_size, input_size)
         self.temporal_drop = nn.Dropout(dropout)
 
-    def forward(self, input):
+    def forward(self, input, series_idx=None):
         # Get shapes
         batch_size = input.shape[0]
         input_size = input.shape[1]
@@ -30,7 +51,13 @@ class TemporalMixing(nn.Module):
         # Temporal MLP
         x = input.permute(0, 2, 1)  # [B, L, N] -> [B, N, L]
         x = x.reshape(batch_size, -1)  # [B, N, L] -> [B, N * L]
-        x = self.temporal_norm(x)  # [B, N * L] -> [B, N * L]
+        if series_idx is None:
+            x = self.temporal_norm(x)  # [B, N * L] -> [B, N * L]
+        else:
+            idx = series_idx[:, None] * input_size + torch.arange(
+                input_size, device=x.device
+            )
+            x = _batch_norm_subset(self.temporal_norm, x, idx.flatten())
         x = x.reshape(batch_size, n_series, input_size)  # [B, N * L] -> [B, N, L]
         x = F.relu(self.temporal_lin(x))  # [B, N, L] -> [B, N, L]
         x = x.permute(0, 2, 1)  # [B, N, L] -> [B, L, N]
@@ -50,7 +77,7 @@ class FeatureMixing(nn.Module):
         self.feature_drop_1 = nn.Dropout(dropout)
         self.feature_drop_2 = nn.Dropout(dropout)
 
-    def forward(self, input):
+    def forward(self, input, series_idx=None):
         # Get shapes
         batch_size = input.shape[0]
         input_size = input.shape[1]
@@ -58,11 +85,32 @@ class FeatureMixing(nn.Module):
 
         # Feature MLP
         x = input.reshape(batch_size, -1)  # [B, L, N] -> [B, L * N]
-        x = self.feature_norm(x)  # [B, L * N] -> [B, L * N]
-        x = x.reshape(batch_size, input_size, n_series)  # [B, L * N] -> [B, L, N]
-        x = F.relu(self.feature_lin_1(x))  # [B, L, N] -> [B, L, ff_dim]
-        x = self.feature_drop_1(x)  # [B, L, ff_dim] -> [B, L, ff_dim]
-        x = self.feature_lin_2(x)  # [B, L, ff_dim] -> [B, L, N]
+        if series_idx is None:
+            x = self.feature_norm(x)  # [B, L * N] -> [B, L * N]
+            x = x.reshape(batch_size, input_size, n_series)  # [B, L * N] -> [B, L, N]
+            x = F.relu(self.feature_lin_1(x))  # [B, L, N] -> [B, L, ff_dim]
+            x = self.feature_drop_1(x)  # [B, L, ff_dim] -> [B, L, ff_dim]
+            x = self.feature_lin_2(x)  # [B, L, ff_dim] -> [B, L, N]
+        else:
+            # Weights of the series in the subset
+            idx = (
+                torch.arange(input_size, device=x.device)[:, None]
+                * self.feature_lin_1.in_features
+                + series_idx
+            )
+            x = _batch_norm_subset(self.feature_norm, x, idx.flatten())
+            x = x.reshape(batch_size, input_size, n_series)
+            x = F.relu(
+                F.linear(
+                    x, self.feature_lin_1.weight[:, series_idx], self.feature_lin_1.bias
+                )
+            )
+            x = self.feature_drop_1(x)
+            x = F.linear(
+                x,
+                self.feature_lin_2.weight[series_idx],
+                self.feature_lin_2.bias[series_idx],
+            )
         x = self.feature_drop_2(x)  # [B, L, N] -> [B, L, N]
 
         return x + input
@@ -75,9 +123,9 @@ class MixingLayer(nn.Module):
         self.temporal_mixer = TemporalMixing(n_series, input_size, dropout)
         self.feature_mixer = FeatureMixing(n_series, input_size, dropout, ff_dim)
 
-    def forward(self, input):
-        x = self.temporal_mixer(input)
-        x = self.feature_mixer(x)
+    def forward(self, input, series_idx=None):
+        x = self.temporal_mixer(input, series_idx)
+        x = self.feature_mixer(x, series_idx)
         return x
 
 # %% ../../nbs/models.tsmixer.ipynb 10
@@ -89,7 +137,12 @@ class ReversibleInstanceNorm1d(nn.Module):
 
         self.eps = eps
 
-    def forward(self, x):
+    def _affine(self, series_idx=None):
+        if series_idx is None:
+            return self.weight, self.bias
+        return self.weight[..., series_idx], self.bias[..., series_idx]
+
+    def forward(self, x, series_idx=None):
         # Batch statistics
         self.batch_mean = torch.mean(x, axis=1, keepdim=True).detach()
         self.batch_std = torch.sqrt(
@@ -97,17 +150,19 @@ class ReversibleInstanceNorm1d(nn.Module):
         ).detach()
 
         # Instance normalization
+        weight, bias = self._affine(series_idx)
         x = x - self.batch_mean
         x = x / self.batch_std
-        x = x * self.weight
-        x = x + self.bias
+        x = x * weight
+        x = x + bias
 
         return x
 
-    def reverse(self, x):
+    def reverse(self, x, series_idx=None):
         # Reverse the normalization
-        x = x - self.bias
-        x = x / self.weight
+        weight, bias = self._affine(series_idx)
+        x = x - bias
+        x = x / weight
         x = x * self.batch_std
         x = x + self.batch_mean
 
@@ -155,6 +210,7 @@ class TSMixer(BaseMultivariate):
 
     # Class attributes
     SAMPLING_TYPE = "multivariate"
+    SERIES_BATCHING = True
 
     def __init__(
         self,
@@ -247,21 +303,23 @@ class TSMixer(BaseMultivariate):
     def forward(self, windows_batch):
         # Parse batch
         x = windows_batch["insample_y"]  # x: [batch_size, input_size, n_series]
-        batch_size = x.shape[0]
+        series_idx = windows_batch.get(
+            "series_idx", None
+        )  # subset of the series, see `series_batch_size`
+        batch_size, _, n_series = x.shape
 
         # TSMixer: InstanceNorm + Mixing layers + Dense output layer + ReverseInstanceNorm
         if self.revin:
-            x = self.norm(x)
-        x = self.mixing_layers(x)
+            x = self.norm(x, series_idx)
+        for mixing_layer in self.mixing_layers:
+            x = mixing_layer(x, series_idx)
         x = x.permute(0, 2, 1)
         x = self.out(x)
         x = x.permute(0, 2, 1)
         if self.revin:
-            x = self.norm.reverse(x)
+            x = self.norm.reverse(x, series_idx)
 
-        x = x.reshape(
-            batch_size, self.h, self.loss.outputsize_multiplier * self.n_series
-        )
+        x = x.reshape(batch_size, self.h, self.loss.outputsize_multiplier * n_series)
         forecast = self.loss.domain_map(x)
 
         # domain_map might have squeezed the last dimension in case n_series == 1
@@ -0,0 +1,313 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/serving.ipynb.
+
+# %% auto 0
+__all__ = ['ForecastServer', 'load_test']
+
+# %% ../nbs/serving.ipynb 3
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .core import NeuralForecast
+
+# %% ../nbs/serving.ipynb 7
+@dataclass
+class _Request:
+    df: pd.DataFrame
+    static_df: Optional[pd.DataFrame]
+    futr_df: Optional[pd.DataFrame]
+    n_series: int
+    future: asyncio.Future
+
+
+def _encode_ids(
+    df: Optional[pd.DataFrame], id_col: str, uniques: pd.Index, offset: int
+) -> Optional[pd.DataFrame]:
+    """Replaces the ids of a request's frame by their batch-wide integer keys,
+    rows with ids that are not in the request's history are dropped."""
+    if df is None:
+        return None
+    codes = uniques.get_indexer(df[id_col])
+    keep = codes >= 0
+    return df[keep].assign(**{id_col: codes[keep] + offset})
+
+# %% ../nbs/serving.ipynb 8
+class ForecastServer:
+    """Serves the forecasts of a fitted `NeuralForecast` to concurrent async requests.
+
+    Requests received within `max_wait_ms` of the first one of a batch, up to `max_batch_size` series,
+    are predicted together with a single `NeuralForecast.predict` call, so the dataset is built once
+    and each model runs one batched forward for all of them. Each caller receives only its own rows.
+
+    Parameters
+    ----------
+    nf : NeuralForecast
+        Fitted `NeuralForecast`, usually obtained with `NeuralForecast.load`.
+    max_batch_size : int (default=256)
+        Number of series after which a batch is predicted without waiting for more requests.
+    max_wait_ms : float (default=5.0)
+        Latency budget, time that the first request of a batch waits for others to join it.
+    inference_engine : str (default='torch')
+        Engine that runs the models' `predict_step`, see `NeuralForecast.predict`.
+    num_threads : int, optional (default=None)
+        Number of torch threads used by the models' prediction. Defaults to torch's current setting.
+    """
+
+    def __init__(
+        self,
+        nf: NeuralForecast,
+        max_batch_size: int = 256,
+        max_wait_ms: float = 5.0,
+        inference_engine: str = "torch",
+        num_threads: Optional[int] = None,
+    ):
+        if not nf._fitted:
+            raise Exception("You must fit the model before serving it.")
+        if nf.scalers_:
+            raise ValueError(
+                "Models fitted with `local_scaler_type` can only predict the series they were fitted on."
+            )
+        if nf._has_multivariate_models():
+            # their forecasts depend on the other series of the batch
+            raise ValueError(
+                "Multivariate models cannot be served, the requests of a batch would change each other's forecasts."
+            )
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+        self.nf = nf
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.inference_engine = inference_engine
+        self.num_threads = num_threads
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @classmethod
+    def load(
+        cls, path: str, verbose: bool = False, **server_kwargs
+    ) -> "ForecastServer":
+        """Server of the `NeuralForecast` saved in `path`, `server_kwargs` are passed to the constructor."""
+        return cls(NeuralForecast.load(path, verbose=verbose), **server_kwargs)
+
+    async def start(self) -> None:
+        """Starts batching the requests in the running event loop."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._serve(self._queue))
+
+    async def stop(self) -> None:
+        """Stops the server, requests that were not predicted yet are cancelled."""
+        if self._worker is None or self._queue is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+        self._queue, self._worker = None, None
+
+    async def __aenter__(self) -> "ForecastServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def predict(
+        self,
+        df: pd.DataFrame,
+        static_df: Optional[pd.DataFrame] = None,
+        futr_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """Forecasts of the series in `df`.
+
+        Parameters
+        ----------
+        df : pandas DataFrame
+            History of the series, with columns [`unique_id`, `ds`, `y`] and exogenous variables.
+        static_df : pandas DataFrame, optional (default=None)
+            DataFrame with columns [`unique_id`] and static exogenous.
+        futr_df : pandas DataFrame, optional (default=None)
+            DataFrame with [`unique_id`, `ds`] columns and `df`'s future exogenous.
+
+        Returns
+        -------
+        fcsts_df : pandas DataFrame
+            DataFrame with the `unique_id` and `ds` columns and one column per model output, as `NeuralForecast.predict`.
+        """
+        if self._worker is None or self._queue is None:
+            raise RuntimeError("The server is not running, call `start` first.")
+        self.nf._check_futr_exog(futr_df)
+        future = asyncio.get_running_loop().create_future()
+        n_series = df[self.nf.id_col].nunique()
+        await self._queue.put(_Request(df, static_df, futr_df, n_series, future))
+        return await future
+
+    async def _serve(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = [await queue.get()]
+            n_series = requests[0].n_series
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while n_series < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                requests.append(request)
+                n_series += request.n_series
+            requests = [r for r in requests if not r.future.cancelled()]
+            if requests:
+                await self._resolve(requests)
+
+    async def _resolve(self, requests: List[_Request]) -> None:
+        loop = asyncio.get_running_loop()
+        # the models run in a worker thread so that the loop keeps receiving requests
+        try:
+            results = await loop.run_in_executor(None, self._predict_batch, requests)
+        except Exception as e:
+            if len(requests) > 1:
+                # a single invalid request fails its whole batch, so they're retried one by one
+                # and only the invalid ones receive the exception
+                for request in requests:
+                    await self._resolve([request])
+            elif not requests[0].future.done():
+                requests[0].future.set_exception(e)
+            return
+        for request, result in zip(requests, results):
+            if not request.future.done():
+                request.future.set_result(result)
+
+    def _predict_batch(self, requests: List[_Request]) -> List[pd.DataFrame]:
+        # Different callers can send the same ids, so every (request, id) pair gets its own integer key
+        id_col = self.nf.id_col
+        dfs, static_dfs, futr_dfs, uniques, offsets = [], [], [], [], [0]
+        for request in requests:
+            request_uniques = pd.Index(pd.unique(request.df[id_col]))
+            dfs.append(_encode_ids(request.df, id_col, request_uniques, offsets[-1]))
+            static_dfs.append(
+                _encode_ids(request.static_df, id_col, request_uniques, offsets[-1])
+            )
+            futr_dfs.append(
+                _encode_ids(request.futr_df, id_col, request_uniques, offsets[-1])
+            )
+            uniques.append(request_uniques)
+            offsets.append(offsets[-1] + len(request_uniques))
+        static_dfs = [static_df for static_df in static_dfs if static_df is not None]
+        futr_dfs = [futr_df for futr_df in futr_dfs if futr_df is not None]
+        fcsts_df = self.nf.predict(
+            df=pd.concat(dfs, ignore_index=True),
+            static_df=pd.concat(static_dfs, ignore_index=True) if static_dfs else None,
+            futr_df=pd.concat(futr_dfs, ignore_index=True) if futr_dfs else None,
+            inference_engine=self.inference_engine,
+            num_threads=self.num_threads,
+        )
+        if fcsts_df.index.name == id_col:
+            fcsts_df = fcsts_df.reset_index()
+        # the forecasts are sorted by key, so the rows of each request are contiguous
+        keys = fcsts_df[id_col].to_numpy()
+        bounds = np.searchsorted(keys, offsets)
+        results = []
+        for request_uniques, offset, start, end in zip(
+            uniques, offsets, bounds[:-1], bounds[1:]
+        ):
+            result = fcsts_df.iloc[start:end].reset_index(drop=True)
+            result[id_col] = request_uniques[keys[start:end] - offset]
+            results.append(result)
+        return results
+
+# %% ../nbs/serving.ipynb 12
+async def load_test(
+    server: ForecastServer,
+    df: pd.DataFrame,
+    n_requests: int = 1_000,
+    concurrency: int = 32,
+    series_per_request: int = 1,
+    static_df: Optional[pd.DataFrame] = None,
+    futr_df: Optional[pd.DataFrame] = None,
+) -> Dict[str, float]:
+    """Sends `n_requests` requests to a running `server`, with at most `concurrency` of them in flight,
+    and measures their latency. Request `i` asks for `series_per_request` consecutive series of `df`
+    starting at the `i * series_per_request`-th one (wrapping around).
+
+    Parameters
+    ----------
+    server : ForecastServer
+        Started server.
+    df : pandas DataFrame
+        History of the series, with columns [`unique_id`, `ds`, `y`] and exogenous variables.
+    n_requests : int (default=1_000)
+        Number of requests.
+    concurrency : int (default=32)
+        Maximum number of requests waiting for their forecasts at the same time.
+    series_per_request : int (default=1)
+        Number of series in each request.
+    static_df : pandas DataFrame, optional (default=None)
+        DataFrame with columns [`unique_id`] and static exogenous.
+    futr_df : pandas DataFrame, optional (default=None)
+        DataFrame with [`unique_id`, `ds`] columns and `df`'s future exogenous.
+
+    Returns
+    -------
+    stats : dict
+        Number of requests, elapsed seconds, requests per second and latency percentiles in milliseconds.
+    """
+    id_col = server.nf.id_col
+    by_id = {uid: group for uid, group in df.groupby(id_col, observed=True, sort=False)}
+    uids = list(by_id)
+
+    def subset(frames, ids):
+        if frames is None:
+            return None
+        return frames[frames[id_col].isin(ids)]
+
+    # requests are built before sending them, so that only the server is timed
+    requests = []
+    for i in range(n_requests):
+        ids = [
+            uids[(i * series_per_request + j) % len(uids)]
+            for j in range(series_per_request)
+        ]
+        requests.append(
+            (
+                pd.concat([by_id[uid] for uid in ids]),
+                subset(static_df, ids),
+                subset(futr_df, ids),
+            )
+        )
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = np.empty(n_requests)
+
+    async def send(i):
+        request_df, request_static_df, request_futr_df = requests[i]
+        async with semaphore:
+            start = time.perf_counter()
+            await server.predict(
+                request_df, static_df=request_static_df, futr_df=request_futr_df
+            )
+            latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(i) for i in range(n_requests)))
+    elapsed = time.perf_counter() - start
+    latencies_ms = 1000 * latencies
+    return {
+        "requests": n_requests,
+        "seconds": elapsed,
+        "requests_per_second": n_requests / elapsed,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "max_ms": float(latencies_ms.max()),
+    }
@@ -1,20 +1,35 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/tsdataset.ipynb.
 
 # %% auto 0
-__all__ = ['TimeSeriesLoader', 'TimeSeriesDataset', 'TimeSeriesDataModule']
+__all__ = ['TimeSeriesLoader', 'TimeSeriesDataset', 'MemmapTimeSeriesDataset', 'TimeSeriesDataModule']
 
 # %% ../nbs/tsdataset.ipynb 4
+import json
+import os
+import pickle
+import shutil
+import tempfile
 import warnings
+import weakref
 from collections.abc import Mapping
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import pytorch_lightning as pl
 import torch
 import utilsforecast.processing as ufp
-from torch.utils.data import Dataset, DataLoader
-from utilsforecast.compat import DataFrame, pl_Series
+from torch.utils.data import Dataset, DataLoader, Sampler
+from utilsforecast.compat import DataFrame, Series, pl_DataFrame, pl_Series
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as pa_ds
+
+    IS_PYARROW_INSTALLED = True
+except ImportError:
+    IS_PYARROW_INSTALLED = False
 
 # %% ../nbs/tsdataset.ipynb 5
 class TimeSeriesLoader(DataLoader):
@@ -42,6 +57,10 @@ class TimeSeriesLoader(DataLoader):
         DataLoader.__init__(self, dataset=dataset, **kwargs_)
 
     def _collate_fn(self, batch):
+        # batches built by the dataset's `__getitems__` are already collated
+        if isinstance(batch, Mapping):
+            return batch
+
         elem = batch[0]
         elem_type = type(elem)
 
@@ -74,6 +93,16 @@ class TimeSeriesLoader(DataLoader):
         raise TypeError(f"Unknown {elem_type}")
 
 # %% ../nbs/tsdataset.ipynb 7
+def _concat_ranges(starts, sizes) -> np.ndarray:
+    """Concatenation of `range(start, start + size)` for each pair of `starts` and `sizes`,
+    e.g. starts=[0, 10], sizes=[2, 3] -> [0, 1, 10, 11, 12]."""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    offsets = sizes.cumsum() - sizes
+    return np.repeat(np.asarray(starts, dtype=np.int64) - offsets, sizes) + np.arange(
+        sizes.sum()
+    )
+
+# %% ../nbs/tsdataset.ipynb 8
 class TimeSeriesDataset(Dataset):
 
     def __init__(
@@ -87,13 +116,20 @@ class TimeSeriesDataset(Dataset):
         static=None,
         static_cols=None,
         sorted=False,
+        dtype=torch.float32,
     ):
         super().__init__()
-        self.temporal = torch.tensor(temporal, dtype=torch.float)
+        # as_tensor avoids copying temporal when it already has the storage dtype.
+        # float16/bfloat16 storage halves the memory and is upcast to float32 per batch
+        if dtype not in (torch.float32, torch.float16, torch.bfloat16):
+            raise ValueError(
+                f"dtype must be torch.float32, torch.float16 or torch.bfloat16, got {dtype}"
+            )
+        self.temporal = torch.as_tensor(temporal, dtype=dtype)
         self.temporal_cols = pd.Index(list(temporal_cols))
 
         if static is not None:
-            self.static = torch.tensor(static, dtype=torch.float)
+            self.static = torch.as_tensor(static, dtype=torch.float)
             self.static_cols = static_cols
         else:
             self.static = static
@@ -132,6 +168,46 @@ class TimeSeriesDataset(Dataset):
             return item
         raise ValueError(f"idx must be int, got {type(idx)}")
 
+    def __getitems__(self, idxs):
+        return self._getitems(idxs, max_size=self.max_size)
+
+    def _getitems(self, idxs, max_size: int):
+        # Gather in one step the max_size rows that end at the last row of each serie,
+        # then zero the rows that belong to previous series (left padding)
+        idxs = np.asarray(idxs)
+        ends = self.indptr[idxs + 1]
+        sizes = ends - self.indptr[idxs]
+        windows = self.temporal.unfold(
+            0, max_size, 1
+        )  # [n_rows - max_size + 1, C, max_size]
+        starts = torch.as_tensor(np.maximum(ends - max_size, 0))
+        out = None
+        if torch.utils.data.get_worker_info() is not None:
+            # If we're in a background process, gather directly into a
+            # shared memory tensor to avoid an extra copy
+            out = torch.empty(
+                size=(len(idxs), *windows.shape[1:]), dtype=torch.float32
+            ).share_memory_()
+        if windows.dtype == torch.float32:
+            temporal = torch.index_select(windows, 0, starts, out=out)
+        else:
+            # compact storage, batches are upcast to float32
+            temporal = torch.index_select(windows, 0, starts)
+            temporal = temporal.float() if out is None else out.copy_(temporal)
+        # series that end before max_size rows start at the first row, move them to the end
+        for i in np.flatnonzero(ends < max_size):
+            temporal[i] = temporal[i].roll(int(max_size - ends[i]), dims=-1)
+        padding = torch.as_tensor(np.arange(max_size) < (max_size - sizes)[:, None])
+        temporal.masked_fill_(padding.unsqueeze(1), 0.0)
+
+        batch = dict(
+            temporal=temporal, temporal_cols=self.temporal_cols, y_idx=self.y_idx
+        )
+        if self.static is not None:
+            batch["static"] = self.static[torch.as_tensor(idxs)]
+            batch["static_cols"] = self.static_cols
+        return batch
+
     def __len__(self):
         return self.n_groups
 
@@ -145,32 +221,54 @@ class TimeSeriesDataset(Dataset):
             self.indptr, other.indptr
         )
 
+    def _allocate(self, indptr, max_size: int, min_size: int) -> "TimeSeriesDataset":
+        """Empty dataset with the columns and static features of this one and room for `indptr[-1]` rows."""
+        return TimeSeriesDataset(
+            temporal=torch.empty(
+                size=(indptr[-1], len(self.temporal_cols)), dtype=self.temporal.dtype
+            ),
+            temporal_cols=self.temporal_cols.copy(),
+            indptr=indptr,
+            max_size=max_size,
+            min_size=min_size,
+            y_idx=self.y_idx,
+            static=self.static,
+            static_cols=self.static_cols,
+            sorted=self.sorted,
+            dtype=self.temporal.dtype,
+        )
+
     def align(
         self, df: DataFrame, id_col: str, time_col: str, target_col: str
     ) -> "TimeSeriesDataset":
-        # Protect consistency
-        df = ufp.copy_if_pandas(df, deep=False)
-
-        # Add Nones to missing columns (without available_mask)
-        temporal_cols = self.temporal_cols.copy()
-        for col in temporal_cols:
-            if col not in df.columns:
-                df = ufp.assign_columns(df, col, np.nan)
-            if col == "available_mask":
-                df = ufp.assign_columns(df, col, 1.0)
-
-        # Sort columns to match self.temporal_cols (without available_mask)
-        df = df[[id_col, time_col] + temporal_cols.tolist()]
-
-        # Process future_df
-        dataset, *_ = TimeSeriesDataset.from_df(
-            df=df,
-            sort_df=self.sorted,
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
+        # Only the columns of df that belong to self.temporal_cols are processed,
+        # missing ones are filled with NaN and available_mask with 1
+        cols = [
+            col
+            for col in self.temporal_cols
+            if col in df.columns and col != "available_mask"
+        ]
+        _, _, data, indptr, _ = ufp.process_df(
+            df[[id_col, time_col] + cols], id_col, time_col, None
+        )
+        temporal = np.full(
+            (indptr[-1], len(self.temporal_cols)), np.nan, dtype=np.float32
+        )
+        if cols:
+            temporal[:, self.temporal_cols.get_indexer(cols)] = data
+        if "available_mask" in self.temporal_cols:
+            temporal[:, self.temporal_cols.get_loc("available_mask")] = 1.0
+
+        sizes = np.diff(indptr)
+        return TimeSeriesDataset(
+            temporal=temporal,
+            temporal_cols=self.temporal_cols.copy(),
+            indptr=indptr,
+            max_size=sizes.max(),
+            min_size=sizes.min(),
+            y_idx=self.y_idx,
+            sorted=self.sorted,
         )
-        return dataset
 
     def append(self, futr_dataset: "TimeSeriesDataset") -> "TimeSeriesDataset":
         """Add future observations to the dataset. Returns a copy"""
@@ -178,39 +276,106 @@ class TimeSeriesDataset(Dataset):
             raise ValueError(
                 "Cannot append `futr_dataset` with different number of groups."
             )
-        # Define and fill new temporal with updated information
-        len_temporal, col_temporal = self.temporal.shape
-        len_futr = futr_dataset.temporal.shape[0]
-        new_temporal = torch.empty(size=(len_temporal + len_futr, col_temporal))
-        new_sizes = np.diff(self.indptr) + np.diff(futr_dataset.indptr)
-        new_indptr = np.append(0, new_sizes.cumsum()).astype(np.int32)
+        # Define and fill new temporal with updated information,
+        # each source is scattered to its rows of every serie in one step
+        curr_sizes = np.diff(self.indptr)
+        futr_sizes = np.diff(futr_dataset.indptr)
+        new_sizes = curr_sizes + futr_sizes
+        new_indptr = np.append(0, new_sizes.cumsum()).astype(self.indptr.dtype)
         new_max_size = np.max(new_sizes)
+        updated_dataset = self._allocate(
+            new_indptr, max_size=new_max_size, min_size=self.min_size
+        )
+        new_temporal = updated_dataset.temporal
 
-        for i in range(self.n_groups):
-            curr_slice = slice(self.indptr[i], self.indptr[i + 1])
-            curr_size = curr_slice.stop - curr_slice.start
-            futr_slice = slice(futr_dataset.indptr[i], futr_dataset.indptr[i + 1])
-            new_temporal[new_indptr[i] : new_indptr[i] + curr_size] = self.temporal[
-                curr_slice
-            ]
-            new_temporal[new_indptr[i] + curr_size : new_indptr[i + 1]] = (
-                futr_dataset.temporal[futr_slice]
-            )
+        curr_idxs = _concat_ranges(new_indptr[:-1], curr_sizes)
+        futr_idxs = _concat_ranges(new_indptr[:-1] + curr_sizes, futr_sizes)
+        new_temporal.index_copy_(
+            0, torch.as_tensor(curr_idxs), self.temporal.to(new_temporal.dtype)
+        )
+        new_temporal.index_copy_(
+            0, torch.as_tensor(futr_idxs), futr_dataset.temporal.to(new_temporal.dtype)
+        )
+
+        return updated_dataset
 
-        # Define new dataset
-        updated_dataset = TimeSeriesDataset(
-            temporal=new_temporal,
+    def astype(self, dtype) -> "TimeSeriesDataset":
+        """Dataset storing its temporal data as `dtype` (torch.float32, torch.float16 or torch.bfloat16).
+        Returns the dataset itself when it already uses `dtype`."""
+        if self.temporal.dtype == dtype:
+            return self
+        return TimeSeriesDataset(
+            temporal=self.temporal.to(dtype),
             temporal_cols=self.temporal_cols.copy(),
-            indptr=new_indptr,
-            max_size=new_max_size,
+            indptr=self.indptr,
+            max_size=self.max_size,
             min_size=self.min_size,
+            y_idx=self.y_idx,
             static=self.static,
+            static_cols=self.static_cols,
+            sorted=self.sorted,
+            dtype=dtype,
+        )
+
+    def share_memory(self) -> "TimeSeriesDataset":
+        """Moves the tensors of the dataset to shared memory, so that DataLoader workers
+        receive handles to them instead of copies. Returns the dataset itself."""
+        self.temporal.share_memory_()
+        if self.static is not None:
+            self.static.share_memory_()
+        return self
+
+    def tail(self, n: int) -> "TimeSeriesDataset":
+        """Dataset with the last `n` observations of each serie.
+        Returns the dataset itself when no serie is longer than `n`."""
+        if self.max_size <= n:
+            return self
+        sizes = np.minimum(np.diff(self.indptr), n)
+        indptr = np.append(0, sizes.cumsum()).astype(self.indptr.dtype)
+        if self.n_groups == 1:
+            temporal = self.temporal[self.indptr[-1] - n : self.indptr[-1]]
+        else:
+            idxs = _concat_ranges(self.indptr[1:] - sizes, sizes)
+            temporal = torch.index_select(self.temporal, 0, torch.as_tensor(idxs))
+        return TimeSeriesDataset(
+            temporal=temporal,
+            temporal_cols=self.temporal_cols.copy(),
+            indptr=indptr,
+            max_size=n,
+            min_size=min(self.min_size, n),
             y_idx=self.y_idx,
+            static=self.static,
             static_cols=self.static_cols,
             sorted=self.sorted,
+            dtype=self.temporal.dtype,
         )
 
-        return updated_dataset
+    def select(self, idxs) -> "TimeSeriesDataset":
+        """Dataset with the series at positions `idxs`, in that order.
+        A contiguous range of series shares the temporal data of this dataset."""
+        idxs = np.asarray(idxs, dtype=np.int64)
+        if idxs.size == 0:
+            raise ValueError("idxs must select at least one serie.")
+        sizes = np.diff(self.indptr)[idxs]
+        indptr = np.append(0, sizes.cumsum()).astype(self.indptr.dtype)
+        if np.array_equal(idxs, np.arange(idxs[0], idxs[0] + idxs.size)):
+            temporal = self.temporal[self.indptr[idxs[0]] : self.indptr[idxs[-1] + 1]]
+        else:
+            rows = _concat_ranges(self.indptr[idxs], sizes)
+            temporal = torch.index_select(self.temporal, 0, torch.as_tensor(rows))
+        static = None if self.static is None else self.static[torch.as_tensor(idxs)]
+        return TimeSeriesDataset(
+            temporal=temporal,
+            temporal_cols=self.temporal_cols.copy(),
+            indptr=indptr,
+            max_size=sizes.max(),
+            min_size=sizes.min(),
+            y_idx=self.y_idx,
+            static=static,
+            static_cols=self.static_cols,
+            sorted=self.sorted,
+            dtype=self.temporal.dtype,
+        )
 
     @staticmethod
     def update_dataset(
@@ -226,6 +391,8 @@ class TimeSeriesDataset(Dataset):
         """
         Trim temporal information from a dataset.
         Returns temporal indexes [t+left:t-right] for all series.
+        When the kept rows are contiguous (nothing to trim or a single serie)
+        the returned dataset is a view that shares memory with `dataset`.
         """
         if dataset.min_size <= left_trim + right_trim:
             raise Exception(
@@ -234,35 +401,32 @@ class TimeSeriesDataset(Dataset):
             )
 
         # Define and fill new temporal with trimmed information
-        len_temporal, col_temporal = dataset.temporal.shape
-        total_trim = (left_trim + right_trim) * dataset.n_groups
-        new_temporal = torch.zeros(size=(len_temporal - total_trim, col_temporal))
-        new_indptr = [0]
-
-        acum = 0
-        for i in range(dataset.n_groups):
-            series_length = dataset.indptr[i + 1] - dataset.indptr[i]
-            new_length = series_length - left_trim - right_trim
-            new_temporal[acum : (acum + new_length), :] = dataset.temporal[
-                dataset.indptr[i] + left_trim : dataset.indptr[i + 1] - right_trim, :
-            ]
-            acum += new_length
-            new_indptr.append(acum)
-
+        new_sizes = np.diff(dataset.indptr) - left_trim - right_trim
+        new_indptr = np.append(0, new_sizes.cumsum()).astype(dataset.indptr.dtype)
         new_max_size = dataset.max_size - left_trim - right_trim
         new_min_size = dataset.min_size - left_trim - right_trim
 
-        # Define new dataset
-        updated_dataset = TimeSeriesDataset(
-            temporal=new_temporal,
-            temporal_cols=dataset.temporal_cols.copy(),
-            indptr=np.array(new_indptr).astype(np.int32),
-            max_size=new_max_size,
-            min_size=new_min_size,
-            y_idx=dataset.y_idx,
-            static=dataset.static,
-            static_cols=dataset.static_cols,
-            sorted=dataset.sorted,
+        if left_trim + right_trim == 0 or dataset.n_groups == 1:
+            temporal = dataset.temporal[left_trim : dataset.indptr[-1] - right_trim]
+            return TimeSeriesDataset(
+                temporal=temporal,
+                temporal_cols=dataset.temporal_cols.copy(),
+                indptr=new_indptr,
+                max_size=new_max_size,
+                min_size=new_min_size,
+                y_idx=dataset.y_idx,
+                static=dataset.static,
+                static_cols=dataset.static_cols,
+                sorted=dataset.sorted,
+                dtype=dataset.temporal.dtype,
+            )
+
+        updated_dataset = dataset._allocate(
+            new_indptr, max_size=new_max_size, min_size=new_min_size
+        )
+        idxs = _concat_ranges(dataset.indptr[:-1] + left_trim, new_sizes)
+        torch.index_select(
+            dataset.temporal, 0, torch.as_tensor(idxs), out=updated_dataset.temporal
         )
 
         return updated_dataset
@@ -342,7 +506,557 @@ class TimeSeriesDataset(Dataset):
             ds = ds[sort_idxs]
         return dataset, indices, dates, ds
 
-# %% ../nbs/tsdataset.ipynb 10
+    @staticmethod
+    def from_arrow(
+        table,
+        static_df=None,
+        id_col="unique_id",
+        time_col="ds",
+        target_col="y",
+        columns=None,
+    ):
+        """Build a dataset from a pyarrow Table without converting it to a DataFrame.
+        The values are copied column by column and batch by batch into the `temporal` buffer,
+        so the peak memory is the table plus the dataset.
+
+        **Parameters:**<br>
+        `table`: pyarrow Table with the `id_col`, `time_col` and `target_col` columns and exogenous variables.<br>
+        `static_df`: pandas or polars DataFrame, optional, with `id_col` and the static exogenous.<br>
+        `columns`: list of str, optional, exogenous columns to keep. All of them by default, dictionary columns are decoded to their numeric values.<br>
+
+        **Returns:**<br>
+        The dataset, unique ids, last dates and dates of each row, as returned by `from_df`.
+        """
+        if not IS_PYARROW_INSTALLED:
+            raise ImportError(
+                "Please install `pyarrow` to use `TimeSeriesDataset.from_arrow`"
+            )
+        value_cols = _arrow_value_cols(
+            table.schema.names, id_col, time_col, target_col, columns
+        )
+        return _arrow_to_dataset(
+            keys=table.select([id_col, time_col]),
+            batches=table.select(value_cols).to_batches(),
+            value_cols=value_cols,
+            static_df=static_df,
+            id_col=id_col,
+            time_col=time_col,
+        )
+
+    @staticmethod
+    def from_parquet(
+        path,
+        static_df=None,
+        id_col="unique_id",
+        time_col="ds",
+        target_col="y",
+        columns=None,
+        filesystem=None,
+    ):
+        """Build a dataset from parquet files, reading them one row group at a time
+        straight into the `temporal` buffer. Only the id and time columns are fully
+        loaded besides the dataset, so the peak memory is close to the dataset size.
+
+        **Parameters:**<br>
+        `path`: str or list of str, parquet file, directory with parquet files or list of files.<br>
+        `static_df`: pandas or polars DataFrame, optional, with `id_col` and the static exogenous.<br>
+        `columns`: list of str, optional, exogenous columns to read. All of them by default, dictionary columns are decoded to their numeric values.<br>
+        `filesystem`: pyarrow or fsspec filesystem, optional, used to read `path`.<br>
+
+        **Returns:**<br>
+        The dataset, unique ids, last dates and dates of each row, as returned by `from_df`.
+        """
+        if not IS_PYARROW_INSTALLED:
+            raise ImportError(
+                "Please install `pyarrow` to use `TimeSeriesDataset.from_parquet`"
+            )
+        parquet = pa_ds.dataset(path, format="parquet", filesystem=filesystem)
+        value_cols = _arrow_value_cols(
+            parquet.schema.names, id_col, time_col, target_col, columns
+        )
+        fragments = list(parquet.get_fragments())
+
+        def read_batches(cols):
+            # row groups in file order, the same for every call
+            for fragment in fragments:
+                yield from fragment.to_batches(
+                    columns=cols,
+                    use_threads=False,
+                    batch_readahead=0,
+                    fragment_readahead=0,
+                )
+
+        keys_schema = pa.schema(
+            [parquet.schema.field(id_col), parquet.schema.field(time_col)]
+        )
+        return _arrow_to_dataset(
+            keys=pa.Table.from_batches(
+                read_batches([id_col, time_col]), schema=keys_schema
+            ),
+            batches=read_batches(value_cols),
+            value_cols=value_cols,
+            static_df=static_df,
+            id_col=id_col,
+            time_col=time_col,
+        )
+
+# %% ../nbs/tsdataset.ipynb 9
+def _arrow_value_cols(names, id_col, time_col, target_col, columns=None) -> List[str]:
+    missing_cols = sorted({id_col, time_col, target_col} - set(names))
+    if missing_cols:
+        raise ValueError(f"The following columns are missing: {missing_cols}")
+    if columns is None:
+        columns = names
+    # target goes first, as in `from_df`
+    return [target_col] + [
+        c for c in columns if c not in (id_col, time_col, target_col)
+    ]
+
+
+def _arrow_to_dataset(keys, batches, value_cols, static_df, id_col, time_col):
+    """Fill the temporal buffer of a dataset from record batches of `value_cols`,
+    sorting the rows by id and time only when `keys` are not already sorted."""
+    # chunked columns are used as they are, combining them would copy the keys
+    ids = keys.column(id_col)
+    if pa.types.is_dictionary(ids.type):
+        ids = ids.cast(ids.type.value_type)
+    times = keys.column(time_col)
+    n_rows = len(ids)
+
+    same_id = pc.equal(ids[1:], ids[:-1])
+    is_sorted = pc.all(
+        pc.or_(
+            pc.greater(ids[1:], ids[:-1]),
+            pc.and_(same_id, pc.greater(times[1:], times[:-1])),
+        )
+    ).as_py() in (True, None)
+    positions = None
+    if not is_sorted:
+        sort_idxs = pc.sort_indices(
+            keys, sort_keys=[(id_col, "ascending"), (time_col, "ascending")]
+        )
+        ids = ids.take(sort_idxs)
+        times = times.take(sort_idxs)
+        same_id = pc.equal(ids[1:], ids[:-1])
+        # rows are read in their original order and written to their sorted position
+        positions = np.empty(n_rows, dtype=np.int64)
+        positions[sort_idxs.to_numpy()] = np.arange(n_rows)
+    starts = np.flatnonzero(~same_id.to_numpy(zero_copy_only=False)) + 1
+    indptr = np.concatenate([[0], starts, [n_rows]]).astype(np.int64)
+
+    temporal_cols = pd.Index(value_cols)
+    if "available_mask" not in temporal_cols:
+        temporal_cols = temporal_cols.append(pd.Index(["available_mask"]))
+    temporal = np.empty((n_rows, len(temporal_cols)), dtype=np.float32)
+    offset = 0
+    for batch in batches:
+        rows = (
+            slice(offset, offset + batch.num_rows)
+            if positions is None
+            else positions[offset : offset + batch.num_rows]
+        )
+        for j, col in enumerate(value_cols):
+            values = batch.column(col)
+            if pa.types.is_dictionary(values.type):
+                # dictionaries can change between batches, use their values
+                values = values.cast(values.type.value_type)
+            temporal[rows, j] = values.cast(pa.float32()).to_numpy(zero_copy_only=False)
+        offset += batch.num_rows
+    if offset != n_rows:
+        raise ValueError(f"Read {offset:,} rows for {n_rows:,} ids and times.")
+    if len(value_cols) < len(temporal_cols):
+        temporal[:, -1] = 1.0
+
+    uids = pd.Series(ids.take(indptr[:-1]).to_numpy(zero_copy_only=False), name=id_col)
+    last_dates = pd.Index(
+        times.take(indptr[1:] - 1).to_numpy(zero_copy_only=False), name=time_col
+    )
+    ds = times.to_numpy(zero_copy_only=False)
+
+    if static_df is not None:
+        static_df = ufp.sort(static_df, by=id_col)
+        static_cols = pd.Index([col for col in static_df.columns if col != id_col])
+        static = ufp.to_numpy(static_df[static_cols.tolist()])
+    else:
+        static = None
+        static_cols = None
+
+    sizes = np.diff(indptr)
+    dataset = TimeSeriesDataset(
+        temporal=temporal,
+        temporal_cols=temporal_cols,
+        static=static,
+        static_cols=static_cols,
+        indptr=indptr,
+        max_size=sizes.max(),
+        min_size=sizes.min(),
+        sorted=True,
+        y_idx=0,
+    )
+    return dataset, uids, last_dates, ds
+
+# %% ../nbs/tsdataset.ipynb 14
+def _write_memmap_meta(directory: str, **meta):
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+
+def _reorder_memmap_series(
+    path: str,
+    dtype,
+    width: Optional[int],
+    sizes: np.ndarray,
+    order: np.ndarray,
+    block_rows: int = 2**20,
+) -> None:
+    """Rewrite the rows of the file in `path` with the series in `order`, `block_rows` rows at a time."""
+    starts = np.append(0, sizes.cumsum()[:-1])
+    n_rows = int(sizes.sum())
+    src = np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        shape=(n_rows,) if width is None else (n_rows, width),
+    )
+    # split the series into blocks of about `block_rows` rows
+    bounds = np.searchsorted(
+        sizes[order].cumsum(), np.arange(block_rows, n_rows, block_rows)
+    )
+    with open(f"{path}.tmp", "wb") as f:
+        for block in np.split(order, bounds):
+            src[_concat_ranges(starts[block], sizes[block])].tofile(f)
+    del src
+    os.replace(f"{path}.tmp", path)
+
+
+# numpy dtype of the temporal file for each storage dtype, bfloat16 values are stored as their bits
+_MEMMAP_DTYPES: Dict[str, Tuple[Any, torch.dtype]] = {
+    "float32": (np.float32, torch.float32),
+    "float16": (np.float16, torch.float16),
+    "bfloat16": (np.int16, torch.bfloat16),
+}
+
+
+class MemmapTimeSeriesDataset(TimeSeriesDataset):
+    """MemmapTimeSeriesDataset
+
+    `TimeSeriesDataset` whose `temporal`, `indptr` and `static` arrays are stored in
+    raw binary files inside `directory` and accessed through `np.memmap`, so only the
+    pages touched by each batch are read into memory. Datasets created with
+    `MemmapTimeSeriesDataset.from_chunks` also store the series ids, their last dates and
+    the time of each row, which allows passing them as `df` to `NeuralForecast`.
+
+    **Parameters:**<br>
+    `directory`: str, directory with the files written by `MemmapTimeSeriesDataset.from_chunks`.<br>
+    `mode`: str, mode used to open the temporal and static files with `np.memmap`. The default ('c') is copy-on-write, changes are never written to disk.<br>
+    """
+
+    def __init__(self, directory: str, mode: Literal["r", "c", "r+"] = "c"):
+        with open(os.path.join(directory, "meta.json"), "r") as f:
+            meta = json.load(f)
+        n_rows, n_groups = meta["n_rows"], meta["n_groups"]
+        np_dtype, dtype = _MEMMAP_DTYPES[meta.get("dtype", "float32")]
+        temporal = np.memmap(
+            os.path.join(directory, "temporal.bin"),
+            dtype=np_dtype,
+            mode=mode,
+            shape=(n_rows, len(meta["temporal_cols"])),
+        )
+        indptr = np.memmap(
+            os.path.join(directory, "indptr.bin"),
+            dtype=np.int64,
+            mode="r",
+            shape=(n_groups + 1,),
+        )
+        super().__init__(
+            temporal=torch.from_numpy(temporal).view(dtype),
+            temporal_cols=meta["temporal_cols"],
+            indptr=indptr,
+            max_size=meta["max_size"],
+            min_size=meta["min_size"],
+            y_idx=meta["y_idx"],
+            sorted=meta["sorted"],
+            dtype=dtype,
+        )
+        if meta["static_cols"] is not None:
+            static = np.memmap(
+                os.path.join(directory, "static.bin"),
+                dtype=np.float32,
+                mode=mode,
+                shape=(n_groups, len(meta["static_cols"])),
+            )
+            self.static = torch.from_numpy(static)
+            self.static_cols = pd.Index(meta["static_cols"])
+        self.directory = directory
+        self.mode = mode
+
+        # ids and times are only available for datasets created from dataframes
+        self.uids, self.last_dates, self.ds = None, None, None
+        if meta.get("ds_dtype") is not None:
+            with open(os.path.join(directory, "ids.pkl"), "rb") as f:
+                self.uids, self.last_dates = pickle.load(f)
+            self.ds = np.memmap(
+                os.path.join(directory, "ds.bin"),
+                dtype=np.dtype(meta["ds_dtype"]),
+                mode="r",
+                shape=(n_rows,),
+            )
+
+    def __repr__(self):
+        return f"MemmapTimeSeriesDataset(n_data={self.temporal.shape[0]:,}, n_groups={self.n_groups:,}, directory={self.directory!r})"
+
+    def __getstate__(self):
+        # only the location of the files is sent to other processes
+        return {"directory": self.directory, "mode": self.mode}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def to_memory(self) -> TimeSeriesDataset:
+        """In-memory copy of the dataset, which doesn't depend on the files in `directory`."""
+        return TimeSeriesDataset(
+            temporal=self.temporal.clone(),
+            temporal_cols=self.temporal_cols,
+            indptr=np.array(self.indptr),
+            max_size=self.max_size,
+            min_size=self.min_size,
+            y_idx=self.y_idx,
+            static=None if self.static is None else self.static.clone(),
+            static_cols=self.static_cols,
+            sorted=self.sorted,
+            dtype=self.temporal.dtype,
+        )
+
+    def share_memory(self) -> "MemmapTimeSeriesDataset":
+        # the files are already shared through the page cache, moving them to
+        # shared memory would read the whole dataset
+        return self
+
+    def _allocate(
+        self, indptr, max_size: int, min_size: int
+    ) -> "MemmapTimeSeriesDataset":
+        # derived datasets (e.g. from append or trim_dataset) live in a temporary
+        # directory that is removed once the dataset is garbage collected
+        directory = tempfile.mkdtemp(prefix="neuralforecast_memmap_")
+        n_rows = int(indptr[-1])
+        np.asarray(indptr, dtype=np.int64).tofile(os.path.join(directory, "indptr.bin"))
+        with open(os.path.join(directory, "temporal.bin"), "wb") as f:
+            f.truncate(n_rows * len(self.temporal_cols) * self.temporal.element_size())
+        static_cols = None
+        if self.static is not None:
+            self.static.numpy().tofile(os.path.join(directory, "static.bin"))
+            static_cols = self.static_cols.tolist()
+        _write_memmap_meta(
+            directory,
+            temporal_cols=self.temporal_cols.tolist(),
+            static_cols=static_cols,
+            y_idx=int(self.y_idx),
+            n_rows=n_rows,
+            n_groups=len(indptr) - 1,
+            max_size=int(max_size),
+            min_size=int(min_size),
+            sorted=self.sorted,
+            ds_dtype=None,
+            dtype=str(self.temporal.dtype).replace("torch.", ""),
+        )
+        dataset = MemmapTimeSeriesDataset(directory, mode="r+")
+        weakref.finalize(dataset, shutil.rmtree, directory, ignore_errors=True)
+        return dataset
+
+    @staticmethod
+    def write(
+        dataset: TimeSeriesDataset,
+        directory: str,
+        uids=None,
+        last_dates=None,
+        ds: Optional[np.ndarray] = None,
+    ) -> "MemmapTimeSeriesDataset":
+        """Write the files of a memory-mapped copy of `dataset`, which keeps its storage dtype.
+
+        **Parameters:**<br>
+        `dataset`: TimeSeriesDataset, dataset to write.<br>
+        `directory`: str, local directory where the files are written.<br>
+        `uids`, `last_dates`, `ds`: optional, series ids, their last dates and the time of each row, as returned by `TimeSeriesDataset.from_df`.<br>
+
+        **Returns:**<br>
+        `dataset`: MemmapTimeSeriesDataset, dataset backed by the files in `directory`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        np_dtype, _ = _MEMMAP_DTYPES[str(dataset.temporal.dtype).replace("torch.", "")]
+        temporal = dataset.temporal.contiguous()
+        if temporal.dtype == torch.bfloat16:
+            temporal = temporal.view(torch.int16)
+        temporal.numpy().astype(np_dtype, copy=False).tofile(
+            os.path.join(directory, "temporal.bin")
+        )
+        np.asarray(dataset.indptr, dtype=np.int64).tofile(
+            os.path.join(directory, "indptr.bin")
+        )
+        static_cols = None
+        if dataset.static is not None:
+            dataset.static.numpy().astype(np.float32, copy=False).tofile(
+                os.path.join(directory, "static.bin")
+            )
+            static_cols = list(dataset.static_cols)
+        ds_dtype = None
+        if ds is not None:
+            ds = np.asarray(ds)
+            if ds.dtype == object:
+                raise ValueError(
+                    "The times of the dataset must be timestamps without timezone or integers."
+                )
+            ds.tofile(os.path.join(directory, "ds.bin"))
+            ds_dtype = ds.dtype.str
+            with open(os.path.join(directory, "ids.pkl"), "wb") as f:
+                pickle.dump((uids, last_dates), f)
+        _write_memmap_meta(
+            directory,
+            temporal_cols=dataset.temporal_cols.tolist(),
+            static_cols=static_cols,
+            y_idx=int(dataset.y_idx),
+            n_rows=int(dataset.indptr[-1]),
+            n_groups=int(dataset.n_groups),
+            max_size=int(dataset.max_size),
+            min_size=int(dataset.min_size),
+            sorted=dataset.sorted,
+            ds_dtype=ds_dtype,
+            dtype=str(dataset.temporal.dtype).replace("torch.", ""),
+        )
+        return MemmapTimeSeriesDataset(directory)
+
+    @staticmethod
+    def from_chunks(
+        df: Union[DataFrame, Iterable[DataFrame]],
+        directory: str,
+        static_df: Optional[DataFrame] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+    ) -> "MemmapTimeSeriesDataset":
+        """Write the files of a memory-mapped dataset.
+
+        **Parameters:**<br>
+        `df`: pandas or polars DataFrame, or an iterable of them (e.g. one per file). Each DataFrame must contain complete series, which are written one DataFrame at a time, so only one of them is kept in memory. The series are stored sorted by id, whatever the order of the DataFrames.<br>
+        `directory`: str, local directory where the files are written.<br>
+        `static_df`: pandas or polars DataFrame, optional (default=None), static exogenous variables of all the series.<br>
+        `id_col`: str, column that identifies each serie.<br>
+        `time_col`: str, column that identifies each timestep, its values can be timestamps or integers.<br>
+        `target_col`: str, column that contains the target.<br>
+
+        **Returns:**<br>
+        `dataset`: MemmapTimeSeriesDataset, dataset backed by the files in `directory`.
+        """
+        if isinstance(df, (pd.DataFrame, pl_DataFrame)):
+            df = [df]
+        os.makedirs(directory, exist_ok=True)
+        temporal_cols: Optional[pd.Index] = None
+        ds_dtype: Optional[np.dtype] = None
+        uids_list: List[Series] = []
+        last_dates_list: List[Any] = []
+        sizes_list: List[np.ndarray] = []
+        with open(os.path.join(directory, "temporal.bin"), "wb") as temporal_file, open(
+            os.path.join(directory, "ds.bin"), "wb"
+        ) as ds_file:
+            for chunk in df:
+                dataset, chunk_uids, chunk_last_dates, chunk_ds = (
+                    TimeSeriesDataset.from_df(
+                        df=chunk,
+                        id_col=id_col,
+                        time_col=time_col,
+                        target_col=target_col,
+                    )
+                )
+                if temporal_cols is None:
+                    temporal_cols = dataset.temporal_cols
+                    ds_dtype = chunk_ds.dtype
+                    if ds_dtype == object:
+                        raise ValueError(
+                            f"`{time_col}` must contain timestamps without timezone or integers."
+                        )
+                elif not temporal_cols.equals(dataset.temporal_cols):
+                    raise ValueError(
+                        "All the dataframes in `df` must have the same columns."
+                    )
+                dataset.temporal.numpy().tofile(temporal_file)
+                chunk_ds.astype(ds_dtype, copy=False).tofile(ds_file)
+                uids_list.append(chunk_uids)
+                last_dates_list.append(chunk_last_dates)
+                sizes_list.append(np.diff(dataset.indptr))
+        if (temporal_cols is None) or (ds_dtype is None):
+            raise ValueError("`df` must contain at least one dataframe.")
+        uids: Series
+        if isinstance(uids_list[0], pl_Series):
+            import polars
+
+            uids = polars.concat(uids_list)
+            last_dates = polars.concat(last_dates_list)
+            duplicated = uids.is_duplicated().any()
+        else:
+            uids = pd.concat(uids_list, ignore_index=True)
+            last_dates = last_dates_list[0].append(last_dates_list[1:])
+            duplicated = uids.duplicated().any()
+        if duplicated:
+            raise ValueError(
+                "Each serie must be contained in a single dataframe of `df`."
+            )
+        sizes = np.hstack(sizes_list)
+
+        # `align` and the future exogenous features follow the order of `ufp.process_df`,
+        # which sorts the ids, so series from unsorted dataframes are moved to that order
+        if isinstance(uids, pd.Series):
+            order = uids.sort_values(kind="stable").index.to_numpy()
+        else:
+            order = uids.arg_sort().to_numpy()
+        if np.any(order != np.arange(len(order))):
+            _reorder_memmap_series(
+                os.path.join(directory, "temporal.bin"),
+                np.float32,
+                len(temporal_cols),
+                sizes,
+                order,
+            )
+            _reorder_memmap_series(
+                os.path.join(directory, "ds.bin"), ds_dtype, None, sizes, order
+            )
+            uids = ufp.take_rows(uids, order)
+            last_dates = ufp.take_rows(last_dates, order)
+            if isinstance(uids, pd.Series):
+                uids = uids.reset_index(drop=True)
+            sizes = sizes[order]
+        np.append(0, sizes.cumsum()).astype(np.int64).tofile(
+            os.path.join(directory, "indptr.bin")
+        )
+
+        # Static features, aligned with the order of the series
+        static_cols = None
+        if static_df is not None:
+            static_cols = [col for col in static_df.columns if col != id_col]
+            uids_df = (
+                uids.to_frame(name=id_col)
+                if isinstance(uids, pd.Series)
+                else uids.alias(id_col).to_frame()
+            )
+            static_df = ufp.join(uids_df, static_df, on=id_col, how="left")
+            static = ufp.to_numpy(static_df[static_cols]).astype(np.float32)
+            static.tofile(os.path.join(directory, "static.bin"))
+
+        with open(os.path.join(directory, "ids.pkl"), "wb") as f:
+            pickle.dump((uids, last_dates), f)
+        _write_memmap_meta(
+            directory,
+            temporal_cols=temporal_cols.tolist(),
+            static_cols=static_cols,
+            y_idx=0,
+            n_rows=int(sizes.sum()),
+            n_groups=len(sizes),
+            max_size=int(sizes.max()),
+            min_size=int(sizes.min()),
+            sorted=True,
+            ds_dtype=ds_dtype.str,
+        )
+        return MemmapTimeSeriesDataset(directory)
+
+# %% ../nbs/tsdataset.ipynb 20
 class _FilesDataset:
     def __init__(
         self,
@@ -362,7 +1076,119 @@ class _FilesDataset:
         self.target_col = target_col
         self.min_size = min_size
 
-# %% ../nbs/tsdataset.ipynb 11
+# %% ../nbs/tsdataset.ipynb 21
+class _BatchPaddedDataset(Dataset):
+    """Pads each batch of `dataset` to the size of its longest serie plus `padding`,
+    instead of `dataset.max_size`."""
+
+    def __init__(self, dataset: TimeSeriesDataset, padding: int = 0):
+        self.dataset = dataset
+        self.padding = padding
+
+    def __getitem__(self, idx):
+        return self.dataset[idx]
+
+    def __getitems__(self, idxs):
+        idxs = np.asarray(idxs)
+        max_size = (
+            np.max(self.dataset.indptr[idxs + 1] - self.dataset.indptr[idxs])
+            + self.padding
+        )
+        return self.dataset._getitems(
+            idxs, max_size=int(min(max_size, self.dataset.max_size))
+        )
+
+    def __len__(self):
+        return len(self.dataset)
+
+
+class _SeriesIndexedDataset(Dataset):
+    """Batches of `dataset` with the indices of their series as `series_idx`, sorted so
+    that the series keep the order of the dataset."""
+
+    def __init__(self, dataset: TimeSeriesDataset):
+        self.dataset = dataset
+
+    def __getitem__(self, idx):
+        return self.dataset[idx]
+
+    def __getitems__(self, idxs):
+        idxs = np.sort(idxs)
+        batch = self.dataset.__getitems__(idxs)
+        batch["series_idx"] = torch.as_tensor(idxs)
+        return batch
+
+    def __len__(self):
+        return len(self.dataset)
+
+
+class _LengthBucketBatchSampler(Sampler):
+    """Batches of series with similar sizes.
+
+    Every epoch the series are shuffled and split into buckets of `batches_per_bucket` batches.
+    The series of each bucket are sorted by size before being split into batches, and the order
+    of the batches is shuffled, so that each serie is sampled once per epoch, as with `shuffle=True`.
+
+    Models draw the same number of windows from every batch, so the windows of the batches of
+    short series are drawn more often than those of long series. When the number of training
+    windows of each serie is given as `weights`, the batches of every epoch are instead drawn with
+    replacement in proportion to their number of windows, which draws every window equally often.
+    """
+
+    def __init__(
+        self,
+        sizes: np.ndarray,
+        batch_size: int,
+        drop_last: bool = False,
+        shuffle: bool = True,
+        batches_per_bucket: int = 50,
+        weights: Optional[np.ndarray] = None,
+    ):
+        self.sizes = sizes
+        self.batch_size = batch_size
+        self.drop_last = drop_last
+        self.shuffle = shuffle
+        self.batches_per_bucket = batches_per_bucket
+        self.weights = weights
+
+    def __iter__(self):
+        n_series = len(self.sizes)
+        if self.shuffle:
+            # torch's generator, so that the seeds of the models also control the sampling
+            idxs = torch.randperm(n_series).numpy()
+        else:
+            idxs = np.arange(n_series)
+        bucket_size = self.batch_size * self.batches_per_bucket
+        batches = []
+        for start in range(0, n_series, bucket_size):
+            bucket = idxs[start : start + bucket_size]
+            bucket = bucket[np.argsort(self.sizes[bucket], kind="stable")]
+            batches.extend(
+                bucket[i : i + self.batch_size]
+                for i in range(0, len(bucket), self.batch_size)
+            )
+        if self.drop_last and len(batches[-1]) < self.batch_size:
+            batches.pop()
+        if not self.shuffle:
+            order = range(len(batches))
+        elif self.weights is None:
+            order = torch.randperm(len(batches)).tolist()
+        else:
+            batch_weights = torch.as_tensor(
+                [self.weights[b].sum() for b in batches], dtype=torch.float64
+            )
+            order = torch.multinomial(
+                batch_weights, len(batches), replacement=True
+            ).tolist()
+        for i in order:
+            yield batches[i].tolist()
+
+    def __len__(self):
+        if self.drop_last:
+            return len(self.sizes) // self.batch_size
+        return -(-len(self.sizes) // self.batch_size)
+
+# %% ../nbs/tsdataset.ipynb 22
 class TimeSeriesDataModule(pl.LightningDataModule):
 
     def __init__(
@@ -373,6 +1199,11 @@ class TimeSeriesDataModule(pl.LightningDataModule):
         num_workers=0,
         drop_last=False,
         shuffle_train=True,
+        bucket_by_length=False,
+        bucket_padding=0,
+        bucket_weights=None,
+        return_series_idx=False,
+        **dataloaders_kwargs
     ):
         super().__init__()
         self.dataset = dataset
@@ -381,14 +1212,48 @@ class TimeSeriesDataModule(pl.LightningDataModule):
         self.num_workers = num_workers
         self.drop_last = drop_last
         self.shuffle_train = shuffle_train
+        self.bucket_by_length = bucket_by_length
+        self.bucket_padding = bucket_padding
+        self.bucket_weights = bucket_weights
+        self.return_series_idx = return_series_idx
+        self.dataloaders_kwargs = dataloaders_kwargs
+
+    def _workers_kwargs(self, persistent_workers=False):
+        kwargs = dict(num_workers=self.num_workers)
+        if self.num_workers > 0:
+            # workers receive handles to the shared tensors instead of a copy of the dataset each
+            self.dataset.share_memory()
+            kwargs["persistent_workers"] = persistent_workers
+        return {**kwargs, **self.dataloaders_kwargs}
 
     def train_dataloader(self):
+        if self.bucket_by_length:
+            # Group series of similar size so that each batch is only padded to its
+            # longest serie (plus the context required by the model)
+            batch_sampler = _LengthBucketBatchSampler(
+                sizes=np.diff(self.dataset.indptr),
+                batch_size=self.batch_size,
+                drop_last=self.drop_last,
+                shuffle=self.shuffle_train,
+                weights=self.bucket_weights,
+            )
+            return TimeSeriesLoader(
+                _BatchPaddedDataset(self.dataset, padding=self.bucket_padding),
+                batch_sampler=batch_sampler,
+                **self._workers_kwargs(persistent_workers=True)
+            )
+        # multivariate models that train on subsets of the series need their indices
+        dataset = (
+            _SeriesIndexedDataset(self.dataset)
+            if self.return_series_idx
+            else self.dataset
+        )
         loader = TimeSeriesLoader(
-            self.dataset,
+            dataset,
             batch_size=self.batch_size,
-            num_workers=self.num_workers,
             shuffle=self.shuffle_train,
             drop_last=self.drop_last,
+            **self._workers_kwargs(persistent_workers=True)
         )
         return loader
 
@@ -396,9 +1261,10 @@ class TimeSeriesDataModule(pl.LightningDataModule):
         loader = TimeSeriesLoader(
             self.dataset,
             batch_size=self.valid_batch_size,
-            num_workers=self.num_workers,
             shuffle=False,
             drop_last=self.drop_last,
+            # kept alive between validation checks
+            **self._workers_kwargs(persistent_workers=True)
         )
         return loader
 
@@ -406,12 +1272,12 @@ class TimeSeriesDataModule(pl.LightningDataModule):
         loader = TimeSeriesLoader(
             self.dataset,
             batch_size=self.valid_batch_size,
-            num_workers=self.num_workers,
             shuffle=False,
+            **self._workers_kwargs()
         )
         return loader
 
-# %% ../nbs/tsdataset.ipynb 25
+# %% ../nbs/tsdataset.ipynb 44
 class _DistributedTimeSeriesDataModule(TimeSeriesDataModule):
     def __init__(
         self,
@@ -421,6 +1287,11 @@ class _DistributedTimeSeriesDataModule(TimeSeriesDataModule):
         num_workers=0,
         drop_last=False,
         shuffle_train=True,
+        bucket_by_length=False,
+        bucket_padding=0,
+        bucket_weights=None,
+        return_series_idx=False,
+        **dataloaders_kwargs
     ):
         super(TimeSeriesDataModule, self).__init__()
         self.files_ds = dataset
@@ -429,6 +1300,11 @@ class _DistributedTimeSeriesDataModule(TimeSeriesDataModule):
         self.num_workers = num_workers
         self.drop_last = drop_last
         self.shuffle_train = shuffle_train
+        self.bucket_by_length = bucket_by_length
+        self.bucket_padding = bucket_padding
+        self.bucket_weights = bucket_weights
+        self.return_series_idx = return_series_idx
+        self.dataloaders_kwargs = dataloaders_kwargs
 
     def setup(self, stage):
         import torch.distributed as dist